@@ -0,0 +1,343 @@
+"""
+Throughput and latency suite for the matching engine.
+
+Runs a fixed set of OrderBook / Exchange scenarios, timing every measured
+operation individually, and reports ops/sec with p50 / p99 / p99.9 latency.
+Setup work (seeding books, resting liquidity for the next sweep, ...) is
+not timed. Results can be saved as JSON and compared against a baseline;
+a scenario regresses when its throughput drops, or its p99 rises, by more
+than the threshold. The exit status is 1 if anything regressed.
+
+    python benchmarks/engine_suite.py                     # run and print
+    python benchmarks/engine_suite.py --quick             # fewer iterations
+    python benchmarks/engine_suite.py --only stp          # scenarios matching "stp"
+    python benchmarks/engine_suite.py --save results.json
+    python benchmarks/engine_suite.py --update-baseline   # store as the baseline
+    python benchmarks/engine_suite.py --baseline benchmarks/baseline.json
+
+The engine prints on most operations; stdout is discarded while a scenario
+runs so terminal speed does not skew the numbers.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.user.user import User
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# name -> scenario(n) returning per-operation latencies in nanoseconds
+SCENARIOS: Dict[str, Callable[[int], List[int]]] = {}
+
+
+def scenario(name: str):
+    def register(fn: Callable[[int], List[int]]) -> Callable[[int], List[int]]:
+        SCENARIOS[name] = fn
+        return fn
+
+    return register
+
+
+def timed(op: Callable[[], object]) -> int:
+    start = time.perf_counter_ns()
+    op()
+    return time.perf_counter_ns() - start
+
+
+# Scenarios
+
+
+@scenario("passive_adds")
+def passive_adds(n: int) -> List[int]:
+    ob = OrderBook("A")
+    rng = random.Random(1)
+    latencies = []
+
+    for i in range(n):
+        if i % 2:
+            price = 100 - rng.randint(1, 50) * 0.25
+            latencies.append(timed(lambda: ob.add_order("limit", "buy", 1, price, "u")))
+        else:
+            price = 101 + rng.randint(0, 49) * 0.25
+            latencies.append(
+                timed(lambda: ob.add_order("limit", "sell", 1, price, "u"))
+            )
+
+    return latencies
+
+
+@scenario("cancel_storm")
+def cancel_storm(n: int) -> List[int]:
+    ob = OrderBook("A")
+    rng = random.Random(2)
+    order_ids = [
+        ob.add_order("limit", "buy", 1, 100 - rng.randint(0, 99) * 0.25, "u")
+        for _ in range(n)
+    ]
+    rng.shuffle(order_ids)
+
+    return [timed(lambda: ob.cancel_order(order_id)) for order_id in order_ids]
+
+
+@scenario("market_sweep_10_levels")
+def market_sweep(n: int) -> List[int]:
+    ob = OrderBook("A", enable_stp=False)
+    latencies = []
+
+    for _ in range(n // 10):
+        for level in range(10):
+            ob.add_order("limit", "sell", 2, 100 + level * 0.5, "maker")
+
+        latencies.append(
+            timed(lambda: ob.add_order("market", "buy", 20, None, "taker"))
+        )
+
+    return latencies
+
+
+@scenario("fok_deep_book")
+def fok_deep_book(n: int) -> List[int]:
+    ob = OrderBook("A", enable_stp=False)
+    for level in range(500):
+        for _ in range(4):
+            ob.add_order("limit", "sell", 5, 100 + level * 0.25, "maker")
+
+    latencies = []
+    for i in range(n):
+        if i % 2:
+            # Killed: walks the book, finds too little within the limit
+            latencies.append(
+                timed(lambda: ob.submit_order("fok", "buy", 10_000, 150, "taker"))
+            )
+        else:
+            latencies.append(
+                timed(lambda: ob.submit_order("fok", "buy", 5, 200, "taker"))
+            )
+            ob.add_order("limit", "sell", 5, 100, "maker")  # replenish
+
+    return latencies
+
+
+@scenario("stop_cascade_50")
+def stop_cascade(n: int) -> List[int]:
+    latencies = []
+
+    for _ in range(max(1, n // 50)):
+        ob = OrderBook("A", enable_stp=False)
+        for level in range(51):
+            ob.add_order("limit", "sell", 1, 100 + level * 0.5, "maker")
+        for _ in range(50):
+            ob.add_order("stop-market", "buy", 1, None, "stops", stop_price=100)
+
+        # One trade at 100 fires all 50 stops, each sweeping the next level
+        latencies.append(timed(lambda: ob.add_order("market", "buy", 1, None, "t")))
+
+    return latencies
+
+
+def _crossing_orders(n: int, enable_stp: bool) -> List[int]:
+    ob = OrderBook("A", enable_stp=enable_stp)
+    rng = random.Random(3)
+    latencies = []
+
+    for _ in range(n):
+        ob.add_order("limit", "sell", 1, 100, "maker")
+        taker = "maker" if rng.random() < 0.5 else "taker"
+        latencies.append(timed(lambda: ob.submit_order("limit", "buy", 1, 100, taker)))
+
+    return latencies
+
+
+@scenario("crossing_stp_on")
+def crossing_stp_on(n: int) -> List[int]:
+    return _crossing_orders(n, enable_stp=True)
+
+
+@scenario("crossing_stp_off")
+def crossing_stp_off(n: int) -> List[int]:
+    return _crossing_orders(n, enable_stp=False)
+
+
+def _stp_deep_book(n: int, tick_size: Optional[float]) -> List[int]:
+    # STP walks the opposite side in price order before every crossing order
+    ob = OrderBook("A", tick_size=tick_size)
+    for level in range(500):
+        ob.add_order("limit", "sell", 5, 100 + level * 0.25, "maker")
+
+    latencies = []
+    for _ in range(n):
+        latencies.append(timed(lambda: ob.submit_order("limit", "buy", 1, 100, "t")))
+        ob.add_order("limit", "sell", 1, 100, "maker")  # replenish
+
+    return latencies
+
+
+@scenario("stp_deep_book_dict")
+def stp_deep_book_dict(n: int) -> List[int]:
+    return _stp_deep_book(n, tick_size=None)
+
+
+@scenario("stp_deep_book_ladder")
+def stp_deep_book_ladder(n: int) -> List[int]:
+    return _stp_deep_book(n, tick_size=0.25)
+
+
+def _polling_exchange() -> Exchange:
+    exchange = Exchange()
+    exchange.add_order_book("A", OrderBook("A"))
+    user = User("u", "User", 1e12, position_limit=1_000_000)
+    exchange.register_user(user, permission_level=3)
+
+    rng = random.Random(4)
+    for _ in range(2000):
+        side = rng.choice(["buy", "sell"])
+        offset = rng.randint(1, 40) * 0.25
+        user.place_order(
+            "A", "limit", side, 1, 100 - offset if side == "buy" else 100 + offset
+        )
+
+    return exchange
+
+
+@scenario("poll_l1")
+def poll_l1(n: int) -> List[int]:
+    exchange = _polling_exchange()
+    return [timed(lambda: exchange.get_L1_data("u", "A")) for _ in range(n)]
+
+
+@scenario("poll_l2")
+def poll_l2(n: int) -> List[int]:
+    exchange = _polling_exchange()
+    return [timed(lambda: exchange.get_L2_data("u", "A", 10)) for _ in range(n)]
+
+
+@scenario("poll_l3")
+def poll_l3(n: int) -> List[int]:
+    exchange = _polling_exchange()
+    return [timed(lambda: exchange.get_L3_data("u", "A", 10)) for _ in range(n)]
+
+
+# Reporting
+
+
+def percentile(sorted_ns: List[int], p: float) -> float:
+    index = min(len(sorted_ns) - 1, int(p / 100 * len(sorted_ns)))
+    return sorted_ns[index] / 1e3
+
+
+def summarise(latencies: List[int]) -> dict:
+    ordered = sorted(latencies)
+    total_s = sum(ordered) / 1e9
+
+    return {
+        "ops": len(ordered),
+        "ops_per_sec": len(ordered) / total_s if total_s else 0.0,
+        "p50_us": percentile(ordered, 50),
+        "p99_us": percentile(ordered, 99),
+        "p99_9_us": percentile(ordered, 99.9),
+        "max_us": ordered[-1] / 1e3,
+    }
+
+
+def run(names: List[str], n: int) -> dict:
+    results = {}
+
+    for name in names:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            latencies = SCENARIOS[name](n)
+        results[name] = summarise(latencies)
+
+        r = results[name]
+        print(
+            f"{name:<24} {r['ops_per_sec']:>12,.0f} ops/s"
+            f"  p50 {r['p50_us']:>9.1f} us  p99 {r['p99_us']:>9.1f} us"
+            f"  p99.9 {r['p99_9_us']:>9.1f} us"
+        )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "n": n,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Returns a description of every regression beyond threshold (a fraction)."""
+    regressions = []
+
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {result['ops_per_sec']:,.0f} ops/s "
+                f"vs baseline {base['ops_per_sec']:,.0f}"
+            )
+
+        if result["p99_us"] > base["p99_us"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p99 {result['p99_us']:.1f} us vs baseline {base['p99_us']:.1f}"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=20_000, help="operations per scenario")
+    parser.add_argument("--quick", action="store_true", help="run with -n 2000")
+    parser.add_argument("--only", help="run scenarios whose name contains this")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="allowed slowdown (fraction)"
+    )
+    args = parser.parse_args(argv)
+
+    names = [name for name in SCENARIOS if not args.only or args.only in name]
+    current = run(names, 2000 if args.quick else args.n)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
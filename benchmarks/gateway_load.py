@@ -0,0 +1,103 @@
+"""
+Round-trip latency of the order-entry gateway over loopback.
+
+Starts an OrderGateway on 127.0.0.1, opens several client connections and
+has each keep a window of pipelined limit orders in flight (alternating
+sides around one price so a share of them trade). Latency is measured from
+writing a request to reading its ack, and reported as percentiles.
+
+    python benchmarks/gateway_load.py [connections] [orders per connection] [window]
+"""
+
+from typing import Dict, List
+
+import asyncio
+import sys
+import time
+
+from htf_engine.exchange import Exchange
+from htf_engine.gateway.codec import FrameDecoder, encode
+from htf_engine.gateway.messages import NewOrderRequest, OrderAck
+from htf_engine.gateway.order_gateway import OrderGateway
+from htf_engine.order_book import OrderBook
+from htf_engine.user.user import User
+
+INSTRUMENT = "A"
+
+
+async def run_client(
+    port: int, user_id: str, n_orders: int, window: int
+) -> List[float]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    decoder = FrameDecoder()
+
+    sent_at: Dict[int, float] = {}
+    latencies: List[float] = []
+    slots = asyncio.Semaphore(window)
+
+    async def read_acks() -> None:
+        while len(latencies) < n_orders:
+            data = await reader.read(65536)
+            if not data:
+                raise ConnectionError("Gateway closed the connection")
+
+            now = time.perf_counter()
+            for msg in decoder.feed(data):
+                if isinstance(msg, OrderAck):
+                    latencies.append(now - sent_at.pop(msg.client_order_id))
+                    slots.release()
+
+    acks = asyncio.create_task(read_acks())
+
+    for i in range(n_orders):
+        await slots.acquire()
+        side = "buy" if i % 2 else "sell"
+        price = 100 + (i % 5 - 2) * 0.5
+        sent_at[i] = time.perf_counter()
+        writer.write(
+            encode(NewOrderRequest(i, user_id, INSTRUMENT, "limit", side, 1, price))
+        )
+
+    await acks
+    writer.close()
+    await writer.wait_closed()
+    return latencies
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    index = min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def main(connections: int, n_orders: int, window: int) -> None:
+    exchange = Exchange()
+    exchange.add_order_book(INSTRUMENT, OrderBook(INSTRUMENT, enable_stp=False))
+    for c in range(connections):
+        exchange.register_user(
+            User(f"u{c}", f"User {c}", 1e12, position_limit=10 * n_orders)
+        )
+
+    async with OrderGateway(exchange) as gateway:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                run_client(gateway.port, f"u{c}", n_orders, window)
+                for c in range(connections)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(x for r in results for x in r)
+    total = len(latencies)
+
+    print(f"connections={connections} orders={total} window={window}")
+    print(f"throughput:  {total / elapsed:10.0f} orders/s")
+    for p in (50, 90, 99, 99.9):
+        print(f"p{p:<5}      {percentile(latencies, p) * 1e6:10.1f} us")
+    print(f"max         {latencies[-1] * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    connections, n_orders, window = args + [4, 20_000, 64][len(args) :]
+    asyncio.run(main(connections, n_orders, window))
@@ -0,0 +1,64 @@
+"""
+Per-order cost of the pre-trade risk layer.
+
+Times PreTradeRiskEngine.check with every limit enabled, plus a full
+User.place_order round trip with and without limits, and reports the
+per-order overhead in microseconds.
+
+    python benchmarks/pre_trade_risk.py
+"""
+
+import time
+
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.risk.risk_limits import RiskLimits
+from htf_engine.user.user import User
+
+N = 100_000
+LIMITS = RiskLimits(
+    max_order_notional=1e9,
+    max_open_orders=1_000_000,
+    price_band=0.5,
+    check_buying_power=True,
+)
+
+
+def bench_check() -> float:
+    exchange = Exchange(risk_limits=LIMITS)
+    exchange.add_order_book("A", OrderBook("A"))
+    user = User("u1", "User 1", 1e12, position_limit=N)
+    exchange.register_user(user)
+
+    # Populate the counters so lookups hit real entries
+    for i in range(1000):
+        user.place_order("A", "limit", "buy", 1, 50 + i % 10)
+
+    check = exchange.risk_engine.check
+    start = time.perf_counter()
+    for _ in range(N):
+        check(user, "A", "buy", 1, 55.0, 55.0)
+    return (time.perf_counter() - start) / N * 1e6
+
+
+def bench_place_order(limits: RiskLimits) -> float:
+    exchange = Exchange(risk_limits=limits)
+    exchange.add_order_book("A", OrderBook("A"))
+    user = User("u1", "User 1", 1e12, position_limit=10 * N)
+    exchange.register_user(user)
+
+    start = time.perf_counter()
+    for i in range(N // 10):
+        user.place_order("A", "limit", "buy", 1, 50 + i % 10)
+    return (time.perf_counter() - start) / (N // 10) * 1e6
+
+
+if __name__ == "__main__":
+    check_us = bench_check()
+    without = bench_place_order(RiskLimits())
+    with_limits = bench_place_order(LIMITS)
+
+    print(f"risk check:                {check_us:8.3f} us/order")
+    print(f"place_order, no limits:    {without:8.3f} us/order")
+    print(f"place_order, all limits:   {with_limits:8.3f} us/order")
+    print(f"overhead:                  {with_limits - without:8.3f} us/order")
@@ -0,0 +1,137 @@
+from typing import Any, Callable, List, Optional
+
+import itertools
+
+from htf_engine.errors.exchange_errors.request_rejected_error import (
+    RequestRejectedError,
+)
+from htf_engine.gateway.codec import Message
+from htf_engine.gateway.messages import (
+    CancelOrderRequest,
+    FillReport,
+    ModifyOrderRequest,
+    NewOrderRequest,
+    OrderAck,
+)
+from .gateway_connection import GatewayConnection
+
+
+class AsyncExchangeClient:
+    """
+    asyncio client for one user's order entry through an OrderGateway.
+
+    Keeps a pool of persistent connections and sends each request on the
+    one with the fewest requests in flight. Client order ids are unique
+    across the pool, so acks and fills can be correlated whichever
+    connection carried them. place_order / cancel_order / modify_order
+    mirror User; submit_order returns the raw ack instead of raising.
+    """
+
+    host: str
+    port: int
+    user_id: str
+    connections: List[GatewayConnection]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user_id: str,
+        pool_size: int = 4,
+        fill_handler: Optional[Callable[[FillReport], None]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.user_id = user_id
+        self.connections = [
+            GatewayConnection(host, port, fill_handler) for _ in range(pool_size)
+        ]
+
+        self._client_order_ids = itertools.count(1)
+
+    async def connect(self) -> None:
+        for connection in self.connections:
+            await connection.open()
+
+    async def close(self) -> None:
+        for connection in self.connections:
+            await connection.close()
+
+    async def __aenter__(self) -> "AsyncExchangeClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def next_client_order_id(self) -> int:
+        return next(self._client_order_ids)
+
+    async def submit_order(
+        self,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> OrderAck:
+        return await self._request(
+            NewOrderRequest(
+                self.next_client_order_id(),
+                self.user_id,
+                instrument,
+                order_type,
+                side,
+                qty,
+                price,
+                stop_price,
+            )
+        )
+
+    async def place_order(
+        self,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> str:
+        ack = await self.submit_order(
+            instrument, order_type, side, qty, price, stop_price
+        )
+        return self._accepted(ack)
+
+    async def cancel_order(self, order_id: str, instrument: str) -> bool:
+        ack = await self._request(
+            CancelOrderRequest(
+                self.next_client_order_id(), self.user_id, instrument, order_id
+            )
+        )
+        return ack.status != OrderAck.REJECTED
+
+    async def modify_order(
+        self, instrument_id: str, order_id: str, new_qty: int, new_price: float
+    ) -> str:
+        """Returns the id the order now rests under (new if it was replaced)."""
+        ack = await self._request(
+            ModifyOrderRequest(
+                self.next_client_order_id(),
+                self.user_id,
+                instrument_id,
+                order_id,
+                new_qty,
+                new_price,
+            )
+        )
+        return self._accepted(ack)
+
+    async def _request(self, msg: Message) -> OrderAck:
+        connection = min(self.connections, key=lambda c: c.in_flight)
+        return await connection.request(msg)
+
+    def _accepted(self, ack: OrderAck) -> str:
+        if ack.status == OrderAck.REJECTED or ack.order_id is None:
+            raise RequestRejectedError(ack.client_order_id, ack.reject_code or "")
+        return ack.order_id
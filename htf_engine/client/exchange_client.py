@@ -0,0 +1,115 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+import asyncio
+import threading
+
+from htf_engine.gateway.messages import FillReport, OrderAck
+from .async_exchange_client import AsyncExchangeClient
+
+T = TypeVar("T")
+
+
+class ExchangeClient:
+    """
+    Blocking wrapper around AsyncExchangeClient for non-asyncio callers.
+
+    The connection pool lives on an event loop in a background thread. The
+    blocking methods wait for their ack; the *_async variants return a
+    Future at once, so a synchronous caller can still pipeline many
+    requests. fill_handler runs on the client's loop thread.
+    """
+
+    timeout: Optional[float]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user_id: str,
+        pool_size: int = 4,
+        fill_handler: Optional[Callable[[FillReport], None]] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.timeout = timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="exchange-client", daemon=True
+        )
+        self._thread.start()
+
+        self._client = AsyncExchangeClient(host, port, user_id, pool_size, fill_handler)
+        try:
+            self._run(self._client.connect()).result(timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def user_id(self) -> str:
+        return self._client.user_id
+
+    def submit_order_async(self, *args: Any, **kwargs: Any) -> "Future[OrderAck]":
+        return self._run(self._client.submit_order(*args, **kwargs))
+
+    def place_order_async(self, *args: Any, **kwargs: Any) -> "Future[str]":
+        return self._run(self._client.place_order(*args, **kwargs))
+
+    def submit_order(
+        self,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> OrderAck:
+        return self.submit_order_async(
+            instrument, order_type, side, qty, price, stop_price
+        ).result(self.timeout)
+
+    def place_order(
+        self,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> str:
+        return self.place_order_async(
+            instrument, order_type, side, qty, price, stop_price
+        ).result(self.timeout)
+
+    def cancel_order(self, order_id: str, instrument: str) -> bool:
+        return self._run(self._client.cancel_order(order_id, instrument)).result(
+            self.timeout
+        )
+
+    def modify_order(
+        self, instrument_id: str, order_id: str, new_qty: int, new_price: float
+    ) -> str:
+        return self._run(
+            self._client.modify_order(instrument_id, order_id, new_qty, new_price)
+        ).result(self.timeout)
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+
+        try:
+            self._run(self._client.close()).result(self.timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> "ExchangeClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
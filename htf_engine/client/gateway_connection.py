@@ -0,0 +1,100 @@
+from typing import Callable, Dict, Optional
+
+import asyncio
+
+from htf_engine.gateway.codec import FrameDecoder, Message, encode
+from htf_engine.gateway.messages import FillReport, OrderAck
+
+
+class GatewayConnection:
+    """
+    One persistent, pipelined connection to an OrderGateway.
+
+    Requests are written as soon as they are made; each gets a future that
+    the reader task resolves when the ack with its client order id arrives.
+    Fills are passed to `fill_handler` as they are read.
+    """
+
+    host: str
+    port: int
+    fill_handler: Optional[Callable[[FillReport], None]]
+
+    _pending: Dict[int, "asyncio.Future[OrderAck]"]  # client order id -> ack
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        fill_handler: Optional[Callable[[FillReport], None]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.fill_handler = fill_handler
+
+        self._pending = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def request(self, msg: Message) -> OrderAck:
+        """Sends msg without waiting for earlier requests and awaits its ack."""
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError(f"Not connected to {self.host}:{self.port}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg.client_order_id] = future
+        self._writer.write(encode(msg))
+
+        # Only yields when the socket buffer is over its high-water mark
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+        if self._read_task is not None:
+            await self._read_task
+
+    async def _read_loop(self) -> None:
+        assert self._reader is not None
+        decoder = FrameDecoder()
+        error: Exception = ConnectionError(
+            f"Connection to {self.host}:{self.port} closed"
+        )
+
+        try:
+            while True:
+                data = await self._reader.read(65536)
+                if not data:
+                    break
+
+                for msg in decoder.feed(data):
+                    if isinstance(msg, OrderAck):
+                        future = self._pending.pop(msg.client_order_id, None)
+                        if future is not None and not future.done():
+                            future.set_result(msg)
+
+                    elif isinstance(msg, FillReport) and self.fill_handler is not None:
+                        self.fill_handler(msg)
+
+        except Exception as e:
+            error = e
+
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
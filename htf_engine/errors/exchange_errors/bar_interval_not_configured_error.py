@@ -0,0 +1,14 @@
+from .exchange_error import ExchangeError
+
+
+class BarIntervalNotConfiguredError(ExchangeError):
+    error_code = "BAR_INTERVAL_NOT_CONFIGURED"
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            f"Bar interval of {self.interval}s is not configured for this instrument."
+        )
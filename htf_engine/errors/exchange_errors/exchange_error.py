@@ -32,3 +32,15 @@ class ExchangeError(Exception, ABC):
 
     def __str__(self) -> str:
         return f"[{self.error_code}] {self.message}"
+
+    def __reduce__(self):
+        # Subclass __init__ signatures differ, so rebuild from attributes
+        # instead (lets errors cross process boundaries, e.g. from shards)
+        return (_restore_error, (type(self), self.__dict__))
+
+
+def _restore_error(cls: type[ExchangeError], state: dict) -> ExchangeError:
+    error = cls.__new__(cls)
+    error.__dict__.update(state)
+    Exception.__init__(error, state.get("message"))
+    return error
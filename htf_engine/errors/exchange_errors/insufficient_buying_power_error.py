@@ -0,0 +1,17 @@
+from .rejected_order_error import RejectedOrderError
+
+
+class InsufficientBuyingPowerError(RejectedOrderError):
+    error_code = "INSUFFICIENT_BUYING_POWER"
+
+    def __init__(self, user_id: str, required: float, available: float):
+        self.user_id = user_id
+        self.required = required
+        self.available = available
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"User {self.user_id} needs {self.required} of buying power but only {self.available} is available."
+        )
@@ -0,0 +1,12 @@
+from .exchange_error import ExchangeError
+
+
+class InvalidLeverageError(ExchangeError):
+    error_code = "INVALID_LEVERAGE"
+
+    def __init__(self, leverage: float):
+        self.leverage = leverage
+        super().__init__()
+
+    def default_message(self) -> str:
+        return f"Leverage must be at least 1, got {self.leverage}."
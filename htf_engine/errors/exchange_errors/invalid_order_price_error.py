@@ -0,0 +1,22 @@
+from typing import Optional
+
+from .invalid_order_error import InvalidOrderError
+
+
+class InvalidOrderPriceError(InvalidOrderError):
+    error_code = "INVALID_ORDER_PRICE"
+
+    def __init__(
+        self, order_type: str, price: Optional[float], stop_price: Optional[float]
+    ):
+        self.order_type = order_type
+        self.price = price
+        self.stop_price = stop_price
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"Prices do not fit a {self.order_type} order "
+            + f"(price={self.price}, stop_price={self.stop_price})."
+        )
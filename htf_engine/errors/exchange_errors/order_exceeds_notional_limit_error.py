@@ -0,0 +1,17 @@
+from .rejected_order_error import RejectedOrderError
+
+
+class OrderExceedsNotionalLimitError(RejectedOrderError):
+    error_code = "ORDER_EXCEEDS_NOTIONAL_LIMIT"
+
+    def __init__(self, inst: str, notional: float, limit: float):
+        self.inst = inst
+        self.notional = notional
+        self.limit = limit
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"Order notional {self.notional} in {self.inst} exceeds the limit of {self.limit}."
+        )
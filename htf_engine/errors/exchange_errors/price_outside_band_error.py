@@ -0,0 +1,18 @@
+from .rejected_order_error import RejectedOrderError
+
+
+class PriceOutsideBandError(RejectedOrderError):
+    error_code = "PRICE_OUTSIDE_BAND"
+
+    def __init__(self, inst: str, price: float, lower: float, upper: float):
+        self.inst = inst
+        self.price = price
+        self.lower = lower
+        self.upper = upper
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"Price {self.price} for {self.inst} is outside the band [{self.lower}, {self.upper}]."
+        )
@@ -0,0 +1,16 @@
+from .rejected_order_error import RejectedOrderError
+
+
+class RateLimitExceededError(RejectedOrderError):
+    error_code = "RATE_LIMIT_EXCEEDED"
+
+    def __init__(self, user_id: str, message_type: str):
+        self.user_id = user_id
+        self.message_type = message_type
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"User {self.user_id} exceeded the {self.message_type} rate limit."
+        )
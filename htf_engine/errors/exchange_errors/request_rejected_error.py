@@ -0,0 +1,17 @@
+from .exchange_error import ExchangeError
+
+
+class RequestRejectedError(ExchangeError):
+    """Raised client-side when the gateway rejects a request."""
+
+    error_code = "REQUEST_REJECTED"
+
+    def __init__(self, client_order_id: int, reject_code: str):
+        self.client_order_id = client_order_id
+        self.reject_code = (
+            reject_code  # the engine's error code, e.g. "RATE_LIMIT_EXCEEDED"
+        )
+        super().__init__()
+
+    def default_message(self) -> str:
+        return f"Request {self.client_order_id} was rejected: {self.reject_code}."
@@ -0,0 +1,8 @@
+from .exchange_error import ExchangeError
+
+
+class SequencerClosedError(ExchangeError):
+    error_code = "SEQUENCER_CLOSED"
+
+    def default_message(self) -> str:
+        return "Sequencer is closed and no longer accepts commands."
@@ -0,0 +1,12 @@
+from .exchange_error import ExchangeError
+
+
+class SequencerFullError(ExchangeError):
+    error_code = "SEQUENCER_FULL"
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        super().__init__()
+
+    def default_message(self) -> str:
+        return f"Command queue is full ({self.capacity} pending commands)."
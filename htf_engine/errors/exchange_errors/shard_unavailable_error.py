@@ -0,0 +1,12 @@
+from .exchange_error import ExchangeError
+
+
+class ShardUnavailableError(ExchangeError):
+    error_code = "SHARD_UNAVAILABLE"
+
+    def __init__(self, shard_id: int):
+        self.shard_id = shard_id
+        super().__init__()
+
+    def default_message(self) -> str:
+        return f"Shard {self.shard_id} is no longer connected."
@@ -0,0 +1,16 @@
+from .rejected_order_error import RejectedOrderError
+
+
+class TooManyOpenOrdersError(RejectedOrderError):
+    error_code = "TOO_MANY_OPEN_ORDERS"
+
+    def __init__(self, user_id: str, limit: int):
+        self.user_id = user_id
+        self.limit = limit
+        super().__init__()
+
+    def default_message(self) -> str:
+        return (
+            self.header_string()
+            + f"User {self.user_id} already has the maximum of {self.limit} open orders."
+        )
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class BookChangedEvent(Event):
+    """Resting quantity at a price level has changed."""
+
+    event_type: ClassVar[EventType] = EventType.BOOK_CHANGED
+
+    side: str
+    price: float
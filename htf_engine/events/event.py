@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class Event:
+    event_type: ClassVar[EventType]
+
+    instrument: str
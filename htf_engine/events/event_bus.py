@@ -0,0 +1,38 @@
+from typing import Any, Callable, Dict, List
+
+from .event import Event
+from .event_type import EventType
+
+
+EventHandler = Callable[[Any], None]
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe dispatcher with one handler list per event type.
+
+    Publishers should check `has_subscribers` before building an event, so an
+    event type nobody listens to costs a single dict lookup.
+    """
+
+    _handlers: Dict[EventType, List[EventHandler]]
+
+    def __init__(self):
+        self._handlers = {event_type: [] for event_type in EventType}
+
+    def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
+        self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: EventType, handler: EventHandler) -> bool:
+        try:
+            self._handlers[event_type].remove(handler)
+            return True
+        except ValueError:
+            return False
+
+    def has_subscribers(self, event_type: EventType) -> bool:
+        return bool(self._handlers[event_type])
+
+    def publish(self, event: Event) -> None:
+        for handler in self._handlers[event.event_type]:
+            handler(event)
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class EventType(Enum):
+    TRADE = "trade"
+    ORDER_ACCEPTED = "order_accepted"
+    ORDER_REJECTED = "order_rejected"
+    ORDER_CANCELLED = "order_cancelled"
+    STOP_TRIGGERED = "stop_triggered"
+    BOOK_CHANGED = "book_changed"
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from htf_engine.orders.order import Order
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class OrderAcceptedEvent(Event):
+    """Published once an order has been validated and is about to be matched."""
+
+    event_type: ClassVar[EventType] = EventType.ORDER_ACCEPTED
+
+    order: Order
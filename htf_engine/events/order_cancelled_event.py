@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from htf_engine.orders.order import Order
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class OrderCancelledEvent(Event):
+    event_type: ClassVar[EventType] = EventType.ORDER_CANCELLED
+
+    REASON_USER: ClassVar[str] = "user"  # explicit cancel request
+    REASON_REPLACED: ClassVar[str] = "replaced"  # cancelled as part of a modify
+    REASON_UNFILLED: ClassVar[str] = "unfilled"  # IOC / market remainder
+
+    order: Order
+    qty: int  # quantity removed from the book
+    reason: str
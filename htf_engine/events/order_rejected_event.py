@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from htf_engine.orders.order import Order
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class OrderRejectedEvent(Event):
+    event_type: ClassVar[EventType] = EventType.ORDER_REJECTED
+
+    order: Order
+    reason: str  # error code of the rejection, e.g. "POST_ONLY_VIOLATION"
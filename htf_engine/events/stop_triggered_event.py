@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from htf_engine.orders.stop_order import StopOrder
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class StopTriggeredEvent(Event):
+    event_type: ClassVar[EventType] = EventType.STOP_TRIGGERED
+
+    order: StopOrder
+    child_order_id: str  # order the stop was released as
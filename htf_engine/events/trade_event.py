@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from htf_engine.trades.trade import Trade
+from .event import Event
+from .event_type import EventType
+
+
+@dataclass(frozen=True)
+class TradeEvent(Event):
+    event_type: ClassVar[EventType] = EventType.TRADE
+
+    trade: Trade
+    buy_remaining: int  # quantity left on the buy order after this fill
+    sell_remaining: int  # quantity left on the sell order after this fill
@@ -1,14 +1,47 @@
-from typing import Any, Optional
-
+from datetime import datetime
+from time import perf_counter_ns
+from typing import Any, Mapping, Optional
+
+from .errors.exchange_errors.bar_interval_not_configured_error import (
+    BarIntervalNotConfiguredError,
+)
+from .errors.exchange_errors.exchange_error import ExchangeError
 from .errors.exchange_errors.instrument_not_found_error import InstrumentNotFoundError
+from .errors.exchange_errors.order_not_found_error import OrderNotFoundError
 from .errors.exchange_errors.permission_denied_error import PermissionDeniedError
 from .errors.exchange_errors.position_not_found_error import PositionNotFoundError
+from .errors.exchange_errors.rate_limit_exceeded_error import RateLimitExceededError
+from .errors.exchange_errors.rejected_order_error import RejectedOrderError
+from .errors.exchange_errors.self_trade_prevention_error import (
+    SelfTradePreventionError,
+)
 from .errors.exchange_errors.user_not_found_error import UserNotFoundError
 
+from .events.event_type import EventType
+from .events.order_cancelled_event import OrderCancelledEvent
+from .events.order_rejected_event import OrderRejectedEvent
+from .events.stop_triggered_event import StopTriggeredEvent
+from .events.trade_event import TradeEvent
+from .market_data.market_data_publisher import MarketDataPublisher
+from .market_data.top_of_book_board import TopOfBookBoard
+from .metrics.engine_stats import EngineStats
+from .metrics.latency_recorder import LatencyRecorder
+from .metrics.stats_dumper import StatsDumper
 from .order_book import OrderBook
+from .orders.execution_report import ExecutionReport
+from .orders.order_status_table import OrderStatusTable
+from .risk.liquidation_engine import LiquidationEngine
+from .risk.mark_to_market import MarkToMarket
+from .risk.pre_trade_risk_engine import PreTradeRiskEngine
+from .risk.rate_limit import RateLimit
+from .risk.rate_limiter import RateLimiter
+from .risk.risk_limits import RiskLimits
+from .settlement.settlement_queue import SettlementQueue
+from .user.account_table import AccountTable
 from .user.user import User
 from .orders.order import Order
 from .orders.stop_order import StopOrder
+from .trades.fill_index import FillIndex
 from .trades.trade import Trade
 
 
@@ -17,36 +50,135 @@ class Exchange:
     order_books: dict[str, OrderBook]
     fee: float
     balance: float
-
-    def __init__(self, fee: float = 0):
+    settlement_queue: Optional[SettlementQueue]
+    mark_to_market: MarkToMarket
+    risk_engine: PreTradeRiskEngine
+    liquidation_engine: LiquidationEngine
+    rate_limiter: RateLimiter
+    order_status: OrderStatusTable
+    fill_index: FillIndex
+    _liquidating: bool
+    account_table: Optional[AccountTable]
+    top_of_book_board: Optional[TopOfBookBoard]
+    market_data_publisher: Optional[MarketDataPublisher]
+    latency: LatencyRecorder
+    engine_stats: EngineStats
+    stats_dumper: Optional[StatsDumper]
+    _pending_fills: Optional[list[Trade]]
+
+    def __init__(
+        self,
+        fee: float = 0,
+        async_settlement: bool = False,
+        account_table: bool = False,
+        risk_limits: Optional[RiskLimits] = None,
+        rate_limits: Optional[dict[str, RateLimit]] = None,
+        max_terminal_orders: int = 100_000,
+        terminal_order_ttl: Optional[float] = None,
+    ):
         self.users = {}  # user_id -> User
         self.order_books = {}  # instrument -> OrderBook
         self.fee = fee
         self.balance = 0
 
+        # When enabled, fills are applied to accounts by a worker thread instead
+        # of inside the matching loop. Outstanding quantities stay reserved until
+        # the fill is settled, so pre-trade quota checks remain correct.
+        self.settlement_queue = (
+            SettlementQueue(self._settle_trades) if async_settlement else None
+        )
+
+        self.mark_to_market = MarkToMarket()
+        self.risk_engine = PreTradeRiskEngine(risk_limits)
+
+        # Per-user token buckets for "place", "modify" and "cancel", checked
+        # before any book work so one noisy client cannot starve the engine
+        self.rate_limiter = RateLimiter(rate_limits)
+
+        # Live and recently finished orders; terminal ones are evicted by
+        # count and (optionally) age
+        self.order_status = OrderStatusTable(max_terminal_orders, terminal_order_ttl)
+        self.fill_index = FillIndex()
+
+        # Leveraged positions whose liquidation price the mark crosses are
+        # closed out with market orders once the triggering order is done
+        self.liquidation_engine = LiquidationEngine()
+        self._liquidating = False
+
+        # Optional array-backed account store (needs numpy) used for
+        # exchange-wide reports; users keep their dict-like API through views.
+        self.account_table = AccountTable() if account_table else None
+
+        # Optional shared-memory L1 board for readers in other processes,
+        # see enable_top_of_book_board()
+        self.top_of_book_board = None
+
+        # Optional L1/L2 delta and trade stream for the UI, see
+        # enable_market_data_stream()
+        self.market_data_publisher = None
+
+        # Latency histograms for matching, settlement and market data calls,
+        # shared with every book; see enable_latency_metrics()
+        self.latency = LatencyRecorder()
+
+        # Trade / reject / cancel counters behind stats(), optionally dumped
+        # to a file periodically, see start_stats_dump()
+        self.engine_stats = EngineStats()
+        self.stats_dumper = None
+
+        # Fills produced by the inbound order currently being processed. They are
+        # settled together once the order (and any stops it triggers) is done.
+        self._pending_fills = None
+
     def register_user(self, user: User, permission_level=1) -> bool:
         if user.user_id in self.users:
             print(f"User {user.user_id} is already registered in exchange!")
             return False
 
         self.users[user.user_id] = user
+        if self.settlement_queue is not None:
+            user.account_lock = self.settlement_queue.lock
+        if self.account_table is not None:
+            self.account_table.attach(user)
         user.register(permission_level)
         user.place_order_callback = self.place_order
         user.cancel_order_callback = self.cancel_order
         user.modify_order_callback = self.modify_order
+        user.pre_trade_check_callback = self.pre_trade_check
+        user.submit_order_callback = self.submit_order
         return True
 
     def add_order_book(self, instrument: str, ob: OrderBook) -> None:
         self.order_books[instrument] = ob
-        ob.on_trade_callback = lambda trade: self.process_trade(trade, ob.instrument)
-        ob.cleanup_discarded_order_callback = (
-            lambda order: self.cleanup_discarded_order(order, ob.instrument)
-        )
-        ob.record_stop_trigger_callback = (
-            lambda user_id, instrument, order: self.record_stops_triggers(
-                user_id, instrument, order
-            )
-        )
+        ob.latency = self.latency
+        if self.account_table is not None:
+            self.account_table.add_instrument(instrument)
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+        ob.event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_rejected)
+        ob.event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_cancelled)
+        ob.event_bus.subscribe(EventType.STOP_TRIGGERED, self._on_stop_triggered)
+        self.risk_engine.attach(ob)
+        self.order_status.attach(ob)
+        self.fill_index.attach(ob)
+        self.engine_stats.attach(ob)
+        if self.top_of_book_board is not None:
+            self.top_of_book_board.attach(ob)
+        if self.market_data_publisher is not None:
+            self.market_data_publisher.attach(ob)
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        self.process_trade(event.trade, event.instrument)
+
+    def _on_order_rejected(self, event: OrderRejectedEvent) -> None:
+        self.cleanup_discarded_order(event.order, event.instrument)
+
+    def _on_order_cancelled(self, event: OrderCancelledEvent) -> None:
+        # User cancels and modifies adjust outstanding quantities themselves
+        if event.reason == OrderCancelledEvent.REASON_UNFILLED:
+            self.cleanup_discarded_order(event.order, event.instrument)
+
+    def _on_stop_triggered(self, event: StopTriggeredEvent) -> None:
+        self.record_stops_triggers(event.order.user_id, event.instrument, event.order)
 
     def place_order(
         self,
@@ -61,20 +193,170 @@ class Exchange:
         if user_id not in self.users:
             raise UserNotFoundError(user_id)
 
+        # Forced liquidations are never throttled
+        if not self._liquidating and not self.rate_limiter.allow(user_id, "place"):
+            self._release_reservation(user_id, instrument, side, qty)
+            self.engine_stats.record_reject(
+                instrument, RateLimitExceededError.error_code
+            )
+            raise RateLimitExceededError(user_id, "place")
+
         if instrument not in self.order_books:
+            self._release_reservation(user_id, instrument, side, qty)
             raise InstrumentNotFoundError(instrument)
 
         ob = self.order_books[instrument]
-        order_id = ob.add_order(
-            order_type=order_type,
-            side=side,
-            qty=qty,
-            price=price,
-            user_id=user_id,
-            stop_price=stop_price,
-        )
+        opened_batch = self._begin_fill_batch()
+        try:
+            order_id = ob.add_order(
+                order_type=order_type,
+                side=side,
+                qty=qty,
+                price=price,
+                user_id=user_id,
+                stop_price=stop_price,
+            )
+        except OrderBook.MALFORMED_ORDER_ERRORS:
+            # Refused before the book saw it, so no reject event released it
+            self._release_reservation(user_id, instrument, side, qty)
+            raise
+        finally:
+            if opened_batch:
+                self._end_fill_batch(instrument)
+                self._publish_market_data()
+
+        if opened_batch:
+            self.process_liquidations()
+
         return order_id
 
+    def submit_order(
+        self,
+        user_id: str,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> ExecutionReport:
+        """
+        Non-raising variant of place_order: throttled, unknown-instrument and
+        refused orders come back as rejected ExecutionReports, and fills are
+        included in the report.
+        """
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if not self._liquidating and not self.rate_limiter.allow(user_id, "place"):
+            self._release_reservation(user_id, instrument, side, qty)
+            self.engine_stats.record_reject(
+                instrument, RateLimitExceededError.error_code
+            )
+            return ExecutionReport.rejected(
+                None, qty, RateLimitExceededError.error_code
+            )
+
+        if instrument not in self.order_books:
+            self._release_reservation(user_id, instrument, side, qty)
+            return ExecutionReport.rejected(
+                None, qty, InstrumentNotFoundError.error_code
+            )
+
+        ob = self.order_books[instrument]
+        opened_batch = self._begin_fill_batch()
+        try:
+            report = ob.submit_order(
+                order_type=order_type,
+                side=side,
+                qty=qty,
+                price=price,
+                user_id=user_id,
+                stop_price=stop_price,
+            )
+        finally:
+            if opened_batch:
+                self._end_fill_batch(instrument)
+                self._publish_market_data()
+
+        # Orders refused by the book were already released through its events
+        if report.order_id is None:
+            self._release_reservation(user_id, instrument, side, qty)
+
+        if opened_batch:
+            self.process_liquidations()
+
+        return report
+
+    def _release_reservation(
+        self, user_id: str, instrument: str, side: str, qty: int
+    ) -> None:
+        """Gives back what the user reserved for an order that never reached the book."""
+        user = self.users[user_id]
+        if side == "buy":
+            user.reduce_outstanding_buys(instrument, qty)
+        else:
+            user.reduce_outstanding_sells(instrument, qty)
+
+    def pre_trade_check(
+        self,
+        user_id: str,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        replacing: Optional[str] = None,
+    ) -> None:
+        """
+        Raises a RejectedOrderError if the order breaches the risk limits.
+        `replacing` is the id of the order a modify replaces.
+        """
+        ob = self.order_books.get(instrument)
+        if ob is None:
+            return
+
+        try:
+            self.risk_engine.check(
+                self.users[user_id],
+                instrument,
+                side,
+                qty,
+                price,
+                ob.last_price,
+                is_stop=order_type.startswith("stop"),
+                replacing=replacing,
+            )
+        except RejectedOrderError as e:
+            self.engine_stats.record_reject(instrument, e.error_code)
+            raise
+
+    def set_risk_limits(
+        self,
+        limits: RiskLimits,
+        user_id: Optional[str] = None,
+        inst: Optional[str] = None,
+    ) -> None:
+        """Sets the exchange default, or an override for a user, instrument or both."""
+        if user_id is not None and user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        self.risk_engine.set_limits(limits, user_id, inst)
+
+    def set_position_limit(
+        self, user_id: str, limit: int, inst: Optional[str] = None
+    ) -> None:
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        self.users[user_id].set_position_limit(limit, inst)
+
     def record_stops_triggers(self, user_id: str, instrument: str, order: StopOrder):
         user = self.users[user_id]
         user.log_stops_trigger(order, instrument)
@@ -90,6 +372,12 @@ class Exchange:
         if user_id not in self.users:
             raise UserNotFoundError(user_id)
 
+        if not self.rate_limiter.allow(user_id, "modify"):
+            self.engine_stats.record_reject(
+                instrument, RateLimitExceededError.error_code
+            )
+            raise RateLimitExceededError(user_id, "modify")
+
         if instrument not in self.order_books:
             raise InstrumentNotFoundError(instrument)
 
@@ -100,7 +388,32 @@ class Exchange:
 
         prev_order = ob.order_map[order_id]
         qty_change = new_qty - prev_order.qty
-        new_order_id = ob.modify_order(order_id, new_qty, new_price)
+
+        # The modified order must pass the same limits as a new one would
+        self.pre_trade_check(
+            user_id,
+            instrument,
+            prev_order.order_type,
+            prev_order.side,
+            new_qty,
+            new_price,
+            replacing=order_id,
+        )
+
+        opened_batch = self._begin_fill_batch()
+        try:
+            new_order_id = ob.modify_order(order_id, new_qty, new_price)
+        finally:
+            if opened_batch:
+                self._end_fill_batch(instrument)
+                self._publish_market_data()
+
+        if opened_batch:
+            self.process_liquidations()
+
+        if new_order_id == order_id:
+            self.risk_engine.resize_order(order_id, new_qty)
+            self.order_status.resize_order(order_id, new_qty)
 
         # Update outstanding
         if prev_order.side == "buy":
@@ -123,12 +436,18 @@ class Exchange:
         if user_id not in self.users:
             raise UserNotFoundError(user_id)
 
+        if not self.rate_limiter.allow(user_id, "cancel"):
+            self.engine_stats.record_reject(
+                instrument, RateLimitExceededError.error_code
+            )
+            raise RateLimitExceededError(user_id, "cancel")
+
         if instrument not in self.order_books:
             raise InstrumentNotFoundError(instrument)
 
         ob = self.order_books[instrument]
 
-        if order_id not in ob.order_map:
+        if order_id not in ob.order_map or order_id in ob.cancelled_orders:
             print("Order not found in order book!")
             return False
 
@@ -141,18 +460,90 @@ class Exchange:
             self.users[user_id].reduce_outstanding_sells(instrument, order.qty)
 
         # Cancel in order book
-        return ob.cancel_order(order_id)
+        cancelled = ob.cancel_order(order_id)
+        self._publish_market_data()
+        return cancelled
 
     def process_trade(self, trade: Trade, instrument: str) -> None:
         """Called by order book whenever a trade occurs"""
-        buy_user = self.users.get(trade.buy_user_id)
-        sell_user = self.users.get(trade.sell_user_id)
-        if buy_user:
-            buy_user.update_positions_and_cash_balance(trade, instrument, self.fee)
-            self._earn_fee()
-        if sell_user:
-            sell_user.update_positions_and_cash_balance(trade, instrument, self.fee)
-            self._earn_fee()
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            if self._pending_fills is not None:
+                self._pending_fills.append(trade)
+            else:
+                self._dispatch_settlement([trade], instrument)
+        finally:
+            if start:
+                latency.record("process_trade", instrument, perf_counter_ns() - start)
+
+    def _begin_fill_batch(self) -> bool:
+        """Starts collecting fills; returns False if a batch is already open."""
+        if self._pending_fills is not None:
+            return False
+
+        self._pending_fills = []
+        return True
+
+    def _end_fill_batch(self, instrument: str) -> None:
+        fills, self._pending_fills = self._pending_fills, None
+
+        if fills:
+            self._dispatch_settlement(fills, instrument)
+
+    def _dispatch_settlement(self, trades: list[Trade], instrument: str) -> None:
+        if self.settlement_queue is not None:
+            self.settlement_queue.submit(trades, instrument)
+        else:
+            self._settle_trades(trades, instrument)
+
+    def _settle_trades(self, trades: list[Trade], instrument: str) -> None:
+        """
+        Settles fills in one instrument: each user gets one account update
+        covering all of their fills (in trade order), and the exchange
+        accrues every fee in one go.
+        """
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            fills_by_user: dict[str, list[tuple[str, float, int]]] = {}
+
+            for trade in trades:
+                fills_by_user.setdefault(trade.buy_user_id, []).append(
+                    ("buy", trade.price, trade.qty)
+                )
+                fills_by_user.setdefault(trade.sell_user_id, []).append(
+                    ("sell", trade.price, trade.qty)
+                )
+
+            # Revalue existing holders at the new price before positions move
+            self.mark_to_market.update_mark(instrument, trades[-1].price)
+
+            n_fees = 0
+            for user_id, fills in fills_by_user.items():
+                user = self.users.get(user_id)
+                if user:
+                    user.settle_fills(instrument, fills, self.fee)
+                    n_fees += len(fills)
+
+                    qty = user.positions.get(instrument, 0)
+                    avg = user.average_cost.get(instrument, 0.0)
+                    self.mark_to_market.update_position(user_id, instrument, qty, avg)
+                    self.liquidation_engine.update_position(
+                        user_id, instrument, qty, avg
+                    )
+
+            # Only now is the buyers' cash debited, so stop counting it twice
+            self.risk_engine.settle_trades(trades)
+
+            # Positions are indexed at their new liquidation prices before the
+            # mark moves, so the move pops exactly the accounts it crosses
+            self.liquidation_engine.update_mark(instrument, trades[-1].price)
+
+            self._earn_fee(n_fees)
+        finally:
+            if start:
+                latency.record("settle_trades", instrument, perf_counter_ns() - start)
 
     def cleanup_discarded_order(self, order: Order, instrument: str) -> None:
         user_id = order.user_id
@@ -167,8 +558,228 @@ class Exchange:
         else:
             user.reduce_outstanding_sells(instrument, order.qty)
 
-    def _earn_fee(self) -> None:
-        self.balance += self.fee
+    def process_liquidations(self) -> None:
+        """
+        Closes out every position the liquidation engine has flagged with a
+        market order. Runs after each inbound order; with async settlement,
+        call it after flush_settlement() to act on the latest fills.
+        """
+        if self._liquidating:
+            return
+
+        self._liquidating = True
+        try:
+            triggered = self.liquidation_engine.triggered
+
+            # Only drain what is queued now: a close-out that cannot fully fill
+            # re-triggers and is retried on the next call rather than looping
+            for _ in range(len(triggered)):
+                user_id, instrument = triggered.popleft()
+                user = self.users[user_id]
+
+                qty = user.positions.get(instrument, 0)
+                if qty == 0:
+                    continue
+
+                print(f"Liquidating {qty}x {instrument} for user {user_id}")
+
+                # A close-out never raises into the caller whose order moved
+                # the mark; a failed one is re-queued for the next call
+                if not self._close_out(user, instrument, qty):
+                    # A partial fill may already have re-triggered the account
+                    if (user_id, instrument) not in triggered:
+                        triggered.append((user_id, instrument))
+        finally:
+            self._liquidating = False
+
+    def _close_out(self, user: User, instrument: str, qty: int) -> bool:
+        """
+        Sends a market order flattening the position. False unless the
+        position was closed in full (refused, or cancelled for lack of
+        liquidity with nothing or only part filled).
+        """
+        side = "sell" if qty > 0 else "buy"
+
+        for attempt in range(2):
+            if side == "sell":
+                user.increase_outstanding_sells(instrument, qty)
+            else:
+                user.increase_outstanding_buys(instrument, -qty)
+
+            try:
+                # Rejected reports have already released the reservation
+                report = self.submit_order(
+                    user.user_id, instrument, "market", side, abs(qty)
+                )
+            except ExchangeError as e:
+                self._release_reservation(user.user_id, instrument, side, abs(qty))
+                print(f"Liquidation of {user.user_id} on {instrument} failed: {e}")
+                return False
+
+            if not report.is_rejected:
+                if report.filled_qty == abs(qty):
+                    return True
+
+                print(
+                    f"Liquidation of {user.user_id} on {instrument} filled "
+                    f"{report.filled_qty} of {abs(qty)}"
+                )
+                return user.positions.get(instrument, 0) == 0
+
+            print(
+                f"Liquidation of {user.user_id} on {instrument} rejected: "
+                f"{report.reject_code}"
+            )
+
+            # The account's own resting orders would be crossed: pull them
+            # and try once more
+            if attempt or report.reject_code != SelfTradePreventionError.error_code:
+                return False
+            self._cancel_resting_orders(user.user_id, instrument, opposite_side=side)
+
+        return False
+
+    def _cancel_resting_orders(
+        self, user_id: str, instrument: str, opposite_side: str
+    ) -> None:
+        """Cancels a user's priced orders that an order on opposite_side would hit."""
+        ob = self.order_books[instrument]
+        user = self.users[user_id]
+
+        resting = [
+            order
+            for order in ob.order_map.values()
+            if order.user_id == user_id
+            and order.side != opposite_side
+            and not order.is_stop()
+            and order.order_id not in ob.cancelled_orders
+        ]
+        for order in resting:
+            if order.side == "buy":
+                user.reduce_outstanding_buys(instrument, order.qty)
+            else:
+                user.reduce_outstanding_sells(instrument, order.qty)
+            ob.cancel_order(order.order_id)
+
+    def set_rate_limit(
+        self,
+        message_type: str,
+        limit: Optional[RateLimit],
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Sets the default, or one user's, rate limit for a message type."""
+        if user_id is not None and user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        self.rate_limiter.set_limit(message_type, limit, user_id)
+
+    def get_rate_limit_counters(self) -> dict:
+        """
+        Returns:
+        {
+            "accepted": {message_type: int},
+            "rejected": {message_type: int},
+            "rejected_by_user": {user_id: int}
+        }
+        """
+        return self.rate_limiter.get_counters()
+
+    def set_leverage(
+        self, user_id: str, leverage: float, inst: Optional[str] = None
+    ) -> None:
+        """Sets a user's leverage for one instrument, or their default if inst is None."""
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        self.liquidation_engine.set_leverage(user_id, leverage, inst)
+
+        # Re-index the positions the new leverage applies to
+        user = self.users[user_id]
+        for position_inst, qty in list(user.positions.items()):
+            if inst is None or position_inst == inst:
+                self.liquidation_engine.update_position(
+                    user_id, position_inst, qty, user.average_cost[position_inst]
+                )
+
+        self.process_liquidations()
+
+    def enable_top_of_book_board(
+        self, name: Optional[str] = None, capacity: int = 256
+    ) -> str:
+        """
+        Starts publishing every book's L1 quote to a shared memory segment and
+        returns its name, which TopOfBookReader attaches to from any local
+        process. The board is unlinked by close().
+        """
+        if self.top_of_book_board is None:
+            self.top_of_book_board = TopOfBookBoard(name, capacity)
+            for ob in self.order_books.values():
+                self.top_of_book_board.attach(ob)
+
+        return self.top_of_book_board.name
+
+    def enable_market_data_stream(
+        self, max_pending: int = 10_000
+    ) -> MarketDataPublisher:
+        """
+        Starts publishing book deltas and trades after every inbound order.
+        Serve the returned publisher with SSEServer, or subscribe to it directly.
+        """
+        if self.market_data_publisher is None:
+            self.market_data_publisher = MarketDataPublisher(max_pending)
+            for ob in self.order_books.values():
+                self.market_data_publisher.attach(ob)
+
+        return self.market_data_publisher
+
+    def _publish_market_data(self) -> None:
+        if self.top_of_book_board is not None:
+            self.top_of_book_board.flush()
+        if self.market_data_publisher is not None:
+            self.market_data_publisher.flush()
+
+    def enable_latency_metrics(self, enabled: bool = True) -> None:
+        """Turns hot-path latency recording on or off; recorded data is kept."""
+        self.latency.enabled = enabled
+
+    def reset_latency_metrics(self) -> None:
+        self.latency.reset()
+
+    def start_stats_dump(self, path: str, interval: float = 1.0) -> StatsDumper:
+        """
+        Appends stats() to `path` as a JSON line every `interval` seconds
+        until close() (or the returned dumper's stop()).
+        """
+        if self.stats_dumper is not None:
+            self.stats_dumper.stop()
+
+        self.stats_dumper = StatsDumper(self.stats, path, interval)
+        self.stats_dumper.start()
+        return self.stats_dumper
+
+    def _earn_fee(self, n_fees: int = 1) -> None:
+        self.balance += self.fee * n_fees
+
+    def flush_settlement(self) -> None:
+        """Blocks until every fill matched so far has been applied to accounts."""
+        if self.settlement_queue is not None:
+            self.settlement_queue.flush()
+
+    def close(self) -> None:
+        if self.stats_dumper is not None:
+            self.stats_dumper.stop()
+            self.stats_dumper = None
+
+        if self.settlement_queue is not None:
+            self.settlement_queue.flush()
+            self.settlement_queue.close()
+
+        if self.top_of_book_board is not None:
+            self.top_of_book_board.unlink()
+            self.top_of_book_board = None
 
     def change_fee(self, new_fee: float) -> None:
         self.fee = new_fee
@@ -228,13 +839,7 @@ class Exchange:
         if user_id not in self.users:
             raise UserNotFoundError(user_id)
 
-        user = self.users[user_id]
-        user_unrealised_pnl = 0.0
-
-        for inst in user.positions:
-            user_unrealised_pnl += self.get_user_unrealised_pnl_for_inst(user_id, inst)
-
-        return user_unrealised_pnl
+        return self.mark_to_market.get_unrealised_pnl(user_id)
 
     def get_user_exposure_for_inst(self, user_id: str, inst: str) -> float:
         if user_id not in self.users:
@@ -262,13 +867,265 @@ class Exchange:
         if user_id not in self.users:
             raise UserNotFoundError(user_id)
 
-        user = self.users[user_id]
-        user_exposure = 0.0
+        return self.mark_to_market.get_exposure(user_id)
+
+    def get_all_unrealised_pnl(self) -> Mapping[str, float]:
+        """Live read-only view of user_id -> unrealised PnL for accounts with positions."""
+        return self.mark_to_market.all_unrealised_pnl()
+
+    def get_all_exposures(self) -> Mapping[str, float]:
+        """Live read-only view of user_id -> exposure for accounts with positions."""
+        return self.mark_to_market.all_exposures()
+
+    def get_top_exposures(
+        self, n: int = 10, inst: Optional[str] = None
+    ) -> list[tuple[str, float]]:
+        """
+        The n accounts with the largest gross exposure, largest first. With
+        inst, exposure in that instrument only, read in O(n); otherwise
+        total exposure, O(N log n) in the number of accounts with positions.
+        """
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        return self.mark_to_market.top_exposures(n, inst)
+
+    def get_holders(self, inst: str) -> Mapping[str, tuple[int, float]]:
+        """Users holding inst, as user_id -> (quantity, average cost)."""
+        if inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        return self.mark_to_market.get_holders(inst)
+
+    def get_end_of_day_statements(self) -> list[dict[str, Any]]:
+        """
+        Marks every account to the last traded prices.
+
+        Returns:
+        [
+            {
+                "user_id": str,
+                "cash_balance": float,
+                "realised_pnl": float,
+                "unrealised_pnl": float,
+                "exposure": float,
+                "equity": float,
+                "positions": {instrument: {"quantity": int, "average_cost": float}}
+            },
+            ...
+        ]
+        """
+        self.flush_settlement()
+
+        marks = {
+            inst: ob.last_price
+            for inst, ob in self.order_books.items()
+            if ob.last_price is not None
+        }
+
+        if self.account_table is not None:
+            return self.account_table.end_of_day_statements(marks, self.users)
+
+        statements = []
+        for user_id, user in self.users.items():
+            positions = user.get_positions()
+            unrealised = 0.0
+            exposure = 0.0
+            for inst, pos in positions.items():
+                if inst in marks:
+                    unrealised += pos["quantity"] * (marks[inst] - pos["average_cost"])
+                    exposure += abs(pos["quantity"]) * marks[inst]
+
+            statements.append(
+                {
+                    "user_id": user_id,
+                    "cash_balance": user.cash_balance,
+                    "realised_pnl": user.realised_pnl,
+                    "unrealised_pnl": unrealised,
+                    "exposure": exposure,
+                    "equity": user.cash_balance + unrealised,
+                    "positions": positions,
+                }
+            )
+
+        return statements
+
+    def get_latency_metrics(
+        self, operation: Optional[str] = None, inst: Optional[str] = None
+    ) -> dict[str, dict[str, dict]]:
+        """
+        Latency histograms recorded while metrics were enabled, optionally
+        for one operation and / or instrument. Operations: add_order,
+        execute_match, check_stop_orders, process_trade, settle_trades,
+        get_L1_data, get_L2_data, get_L3_data.
+
+        JSON format ("*" merges all instruments of the operation):
+        {
+            operation: {
+                instrument | "*": {
+                    "count": int,
+                    "mean_us": float | None,
+                    "min_us": float | None,
+                    "p50_us": float | None,
+                    "p90_us": float | None,
+                    "p99_us": float | None,
+                    "p99_9_us": float | None,
+                    "max_us": float | None
+                }
+            }
+        }
+        """
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        return self.latency.snapshot(operation, inst)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Engine health counters, cheap enough to poll while the engine is
+        under load: nothing here scans orders or price levels. Safe to call
+        from another thread, e.g. the one start_stats_dump() starts.
+
+        JSON format:
+        {
+            "timestamp": str,                       # ISO 8601
+            "books": {
+                instrument: {
+                    "resting_bids": int,
+                    "resting_asks": int,
+                    "bid_heap_size": int,
+                    "ask_heap_size": int,
+                    "stale_heap_entries": int,      # heap entries left by
+                                                    # cancelled / filled orders
+                    "cancelled_orders": int,
+                    "compactions": int,
+                    "bid_levels": int,
+                    "ask_levels": int,
+                    "stop_orders": int,
+                    "order_map_size": int,
+                    "trades": int,
+                    "volume": int,
+                    "trades_per_second": float,
+                    "rejects": {reason: int},
+                    "cancels": {reason: int}
+                }
+            },
+            "users": int,
+            "pending_settlement_batches": int,
+            "rejects": {reason: int}                # across all instruments
+        }
+        """
+        # May run on a StatsDumper thread: copy the book map before iterating
+        books = {
+            inst: self.engine_stats.book_stats(ob)
+            for inst, ob in list(self.order_books.items())
+        }
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "books": books,
+            "users": len(self.users),
+            "pending_settlement_batches": (
+                self.settlement_queue.pending()
+                if self.settlement_queue is not None
+                else 0
+            ),
+            "rejects": self.engine_stats.total_rejects(),
+        }
+
+    def get_order_status(self, user_id: str, order_id: str) -> dict[str, Any]:
+        """
+        Status of one of the user's live or recently finished orders.
+
+        Returns:
+        {
+            "order_id": str,
+            "instrument": str,
+            "order_type": str,
+            "side": str,
+            "state": str,
+            "original_qty": int,
+            "filled_qty": int,
+            "leaves_qty": int,
+            "avg_price": float | None,
+            "reason": str | None,
+            "child_order_id": str | None,   # order a triggered stop became
+            "last_update": float
+        }
+        """
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        status = self.order_status.get(order_id)
+
+        # Other users' orders are reported as missing
+        if status is None or status.user_id != user_id:
+            raise OrderNotFoundError(order_id)
+
+        return status.to_dict()
+
+    def get_user_fills(
+        self,
+        user_id: str,
+        inst: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        The user's fills with start <= timestamp < end, oldest first.
+
+        Returns:
+        [
+            {
+                "timestamp": str,
+                "instrument": str,
+                "side": str,
+                "price": float,
+                "qty": int,
+                "order_id": str,
+                "liquidity": "maker" | "taker"
+            },
+            ...
+        ]
+        """
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst is not None and inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
 
-        for inst in user.positions:
-            user_exposure += self.get_user_exposure_for_inst(user_id, inst)
+        fills = []
+        for trade, instrument in self.fill_index.query(
+            user_id, inst, start, end, limit, offset
+        ):
+            side = "buy" if trade.buy_user_id == user_id else "sell"
+            fills.append(
+                {
+                    "timestamp": trade.timestamp.isoformat(),
+                    "instrument": instrument,
+                    "side": side,
+                    "price": trade.price,
+                    "qty": trade.qty,
+                    "order_id": trade.buy_order_id
+                    if side == "buy"
+                    else trade.sell_order_id,
+                    "liquidity": "taker" if trade.aggressor == side else "maker",
+                }
+            )
+
+        return fills
 
-        return user_exposure
+    def get_liquidation_price(self, user_id: str, inst: str) -> Optional[float]:
+        """Price at which the user's position in inst is liquidated, if leveraged."""
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
+
+        return self.liquidation_engine.get_liquidation_price(user_id, inst)
 
     def get_user_remaining_quota_for_inst(
         self, user_id: str, inst: str
@@ -315,46 +1172,52 @@ class Exchange:
 
         By default, all users are entitled to Level 1 market data.
         """
-        if user_id not in self.users:
-            raise UserNotFoundError(user_id)
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            if user_id not in self.users:
+                raise UserNotFoundError(user_id)
 
-        if inst not in self.order_books:
-            raise InstrumentNotFoundError(inst)
+            if inst not in self.order_books:
+                raise InstrumentNotFoundError(inst)
 
-        ob = self.order_books[inst]
+            ob = self.order_books[inst]
 
-        best_bid = ob.best_bid()
-        best_ask = ob.best_ask()
+            best_bid = ob.best_bid()
+            best_ask = ob.best_ask()
 
-        best_bid_qty = (
-            sum(
-                o.qty
-                for o in ob.bids[best_bid]
-                if o.order_id not in ob.cancelled_orders
+            best_bid_qty = (
+                sum(
+                    o.qty
+                    for o in ob.bids[best_bid]
+                    if o.order_id not in ob.cancelled_orders
+                )
+                if best_bid is not None
+                else 0
             )
-            if best_bid is not None
-            else 0
-        )
-        best_ask_qty = (
-            sum(
-                o.qty
-                for o in ob.asks[best_ask]
-                if o.order_id not in ob.cancelled_orders
+            best_ask_qty = (
+                sum(
+                    o.qty
+                    for o in ob.asks[best_ask]
+                    if o.order_id not in ob.cancelled_orders
+                )
+                if best_ask is not None
+                else 0
             )
-            if best_ask is not None
-            else 0
-        )
 
-        return {
-            "instrument": inst,
-            "best_bid": best_bid,
-            "best_bid_qty": best_bid_qty,
-            "best_ask": best_ask,
-            "best_ask_qty": best_ask_qty,
-            "last_price": ob.last_price,
-            "last_qty": ob.last_quantity,
-            "timestamp": ob.last_time if ob.last_time else None,
-        }
+            return {
+                "instrument": inst,
+                "best_bid": best_bid,
+                "best_bid_qty": best_bid_qty,
+                "best_ask": best_ask,
+                "best_ask_qty": best_ask_qty,
+                "last_price": ob.last_price,
+                "last_qty": ob.last_quantity,
+                "timestamp": ob.last_time if ob.last_time else None,
+            }
+        finally:
+            if start:
+                latency.record("get_L1_data", inst, perf_counter_ns() - start)
 
     def get_L2_data(self, user_id: str, inst: str, depth: int = 5) -> dict[str, Any]:
         """
@@ -376,39 +1239,47 @@ class Exchange:
             ]
         }
         """
-        if user_id not in self.users:
-            raise UserNotFoundError(user_id)
-
-        user = self.users[user_id]
-        user_permission_level = user.get_permission_level()
-
-        if user_permission_level < 2:
-            raise PermissionDeniedError(
-                user_id=user_id, required_level=2, actual_level=user_permission_level
-            )
-
-        if inst not in self.order_books:
-            raise InstrumentNotFoundError(inst)
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            if user_id not in self.users:
+                raise UserNotFoundError(user_id)
+
+            user = self.users[user_id]
+            user_permission_level = user.get_permission_level()
+
+            if user_permission_level < 2:
+                raise PermissionDeniedError(
+                    user_id=user_id,
+                    required_level=2,
+                    actual_level=user_permission_level,
+                )
 
-        ob = self.order_books[inst]
+            if inst not in self.order_books:
+                raise InstrumentNotFoundError(inst)
 
-        def serialize_side(side_dict, reverse=False):
-            levels = []
-            for price in sorted(side_dict.keys(), reverse=reverse)[:depth]:
-                total_qty = sum(
-                    o.qty
-                    for o in ob.bids[price]
-                    if o.order_id not in ob.cancelled_orders
-                )
-                if total_qty > 0:
-                    levels.append({"price": price, "quantity": total_qty})
-            return levels
+            ob = self.order_books[inst]
 
-        return {
-            "instrument": inst,
-            "bids": serialize_side(ob.bids, reverse=True),
-            "asks": serialize_side(ob.asks, reverse=False),
-        }
+            def serialize_side(side_dict, reverse=False):
+                levels = []
+                for price in sorted(side_dict.keys(), reverse=reverse)[:depth]:
+                    total_qty = sum(
+                        o.qty
+                        for o in ob.bids[price]
+                        if o.order_id not in ob.cancelled_orders
+                    )
+                    if total_qty > 0:
+                        levels.append({"price": price, "quantity": total_qty})
+                return levels
+
+            return {
+                "instrument": inst,
+                "bids": serialize_side(ob.bids, reverse=True),
+                "asks": serialize_side(ob.asks, reverse=False),
+            }
+        finally:
+            if start:
+                latency.record("get_L2_data", inst, perf_counter_ns() - start)
 
     def get_L3_data(self, user_id: str, inst: str, depth: int = 5) -> dict[str, Any]:
         """
@@ -454,47 +1325,102 @@ class Exchange:
             ]
         }
         """
-        if user_id not in self.users:
-            raise UserNotFoundError(user_id)
-
-        user = self.users[user_id]
-        user_permission_level = user.get_permission_level()
-
-        if user_permission_level < 3:
-            raise PermissionDeniedError(
-                user_id=user_id, required_level=3, actual_level=user_permission_level
-            )
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            if user_id not in self.users:
+                raise UserNotFoundError(user_id)
+
+            user = self.users[user_id]
+            user_permission_level = user.get_permission_level()
+
+            if user_permission_level < 3:
+                raise PermissionDeniedError(
+                    user_id=user_id,
+                    required_level=3,
+                    actual_level=user_permission_level,
+                )
 
-        if inst not in self.order_books:
-            raise InstrumentNotFoundError(inst)
+            if inst not in self.order_books:
+                raise InstrumentNotFoundError(inst)
+
+            ob = self.order_books[inst]
+
+            def serialize_side(side_dict, reverse=False):
+                levels = []
+                for price in sorted(side_dict.keys(), reverse=reverse)[:depth]:
+                    orders = []
+
+                    for o in side_dict[price]:
+                        if o.order_id in ob.cancelled_orders:
+                            continue
+                        orders.append(
+                            {
+                                "order_id": o.order_id,
+                                "qty": o.qty,
+                                "user_id": o.user_id,
+                                "order_type": o.__class__.__name__,
+                                "timestamp": o.timestamp,
+                            }
+                        )
+
+                    if orders:
+                        levels.append({"price": price, "orders": orders})
+
+                return levels
+
+            return {
+                "instrument": inst,
+                "bids": serialize_side(ob.bids, reverse=True),
+                "asks": serialize_side(ob.asks, reverse=False),
+            }
+        finally:
+            if start:
+                latency.record("get_L3_data", inst, perf_counter_ns() - start)
 
-        ob = self.order_books[inst]
+    def get_bars(
+        self, user_id: str, inst: str, interval: int = 60, limit: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        OHLCV / VWAP bars for an instrument, maintained incrementally by the
+        order book's bar aggregator (the trade log is never scanned).
 
-        def serialize_side(side_dict, reverse=False):
-            levels = []
-            for price in sorted(side_dict.keys(), reverse=reverse)[:depth]:
-                orders = []
+        JSON format:
+        {
+            "instrument": str,
+            "interval": int,
+            "bars": [
+                {
+                    "start": str,
+                    "interval": int,
+                    "open": float,
+                    "high": float,
+                    "low": float,
+                    "close": float,
+                    "volume": int,
+                    "turnover": float,
+                    "vwap": float | None,
+                    "trade_count": int
+                },
+                ...
+            ]
+        }
 
-                for o in side_dict[price]:
-                    if o.order_id in ob.cancelled_orders:
-                        continue
-                    orders.append(
-                        {
-                            "order_id": o.order_id,
-                            "qty": o.qty,
-                            "user_id": o.user_id,
-                            "order_type": o.__class__.__name__,
-                            "timestamp": o.timestamp,
-                        }
-                    )
+        Bars are ordered oldest first; the last bar may still be in progress.
+        By default, all users are entitled to bar data.
+        """
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
 
-                if orders:
-                    levels.append({"price": price, "orders": orders})
+        if inst not in self.order_books:
+            raise InstrumentNotFoundError(inst)
 
-            return levels
+        aggregator = self.order_books[inst].bar_aggregator
+        if aggregator is None:
+            raise BarIntervalNotConfiguredError(interval)
 
         return {
             "instrument": inst,
-            "bids": serialize_side(ob.bids, reverse=True),
-            "asks": serialize_side(ob.asks, reverse=False),
+            "interval": interval,
+            "bars": [bar.to_dict() for bar in aggregator.get_bars(interval, limit)],
         }
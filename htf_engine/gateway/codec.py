@@ -0,0 +1,212 @@
+"""
+Binary wire format of the order-entry gateway.
+
+Every message is a frame: a little-endian u32 body length followed by the
+body. A body starts with a u8 message type and a u64 client order id, then
+the message's fixed-width fields, then its strings, each a u8 length
+followed by UTF-8 bytes. Missing prices are sent as NaN and missing strings
+as empty ones.
+"""
+
+from typing import List, Optional, Tuple, Union
+
+import math
+import struct
+
+from .messages import (
+    CancelOrderRequest,
+    FillReport,
+    ModifyOrderRequest,
+    NewOrderRequest,
+    OrderAck,
+)
+
+Message = Union[
+    NewOrderRequest, CancelOrderRequest, ModifyOrderRequest, OrderAck, FillReport
+]
+
+NEW_ORDER = 1
+CANCEL_ORDER = 2
+MODIFY_ORDER = 3
+ACK = 4
+FILL = 5
+
+ORDER_TYPES = (
+    "limit",
+    "market",
+    "ioc",
+    "fok",
+    "post-only",
+    "stop-limit",
+    "stop-market",
+)
+SIDES = ("buy", "sell")
+ACK_STATUSES = (
+    "filled",
+    "partially_filled",
+    "resting",
+    "pending",
+    "cancelled",
+    "rejected",
+    "modified",
+)
+
+FRAME_HEADER = struct.Struct("<I")
+MAX_FRAME = 1 << 16
+
+_NEW_ORDER = struct.Struct("<BQBBIdd")
+_CANCEL_ORDER = struct.Struct("<BQ")
+_MODIFY_ORDER = struct.Struct("<BQId")
+_ACK = struct.Struct("<BQBII")
+_FILL = struct.Struct("<BQdII")
+
+_ORDER_TYPE_CODES = {t: i for i, t in enumerate(ORDER_TYPES)}
+_SIDE_CODES = {s: i for i, s in enumerate(SIDES)}
+_ACK_STATUS_CODES = {s: i for i, s in enumerate(ACK_STATUSES)}
+
+
+def encode(msg: Message) -> bytes:
+    """Returns the complete frame (length prefix included) for msg."""
+    if isinstance(msg, NewOrderRequest):
+        body = _NEW_ORDER.pack(
+            NEW_ORDER,
+            msg.client_order_id,
+            _ORDER_TYPE_CODES[msg.order_type],
+            _SIDE_CODES[msg.side],
+            msg.qty,
+            _opt_price(msg.price),
+            _opt_price(msg.stop_price),
+        ) + _strings(msg.user_id, msg.instrument)
+
+    elif isinstance(msg, CancelOrderRequest):
+        body = _CANCEL_ORDER.pack(CANCEL_ORDER, msg.client_order_id) + _strings(
+            msg.user_id, msg.instrument, msg.order_id
+        )
+
+    elif isinstance(msg, ModifyOrderRequest):
+        body = _MODIFY_ORDER.pack(
+            MODIFY_ORDER, msg.client_order_id, msg.qty, msg.price
+        ) + _strings(msg.user_id, msg.instrument, msg.order_id)
+
+    elif isinstance(msg, OrderAck):
+        body = _ACK.pack(
+            ACK,
+            msg.client_order_id,
+            _ACK_STATUS_CODES[msg.status],
+            msg.filled_qty,
+            msg.remaining_qty,
+        ) + _strings(msg.order_id or "", msg.reject_code or "")
+
+    else:
+        body = _FILL.pack(
+            FILL, msg.client_order_id, msg.price, msg.qty, msg.remaining_qty
+        ) + _strings(msg.order_id)
+
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def decode(body: bytes) -> Message:
+    """Parses one frame body (without its length prefix)."""
+    msg_type = body[0]
+
+    if msg_type == NEW_ORDER:
+        _, cid, order_type, side, qty, price, stop_price = _NEW_ORDER.unpack_from(body)
+        (user_id, instrument), _ = _read_strings(body, _NEW_ORDER.size, 2)
+        return NewOrderRequest(
+            cid,
+            user_id,
+            instrument,
+            ORDER_TYPES[order_type],
+            SIDES[side],
+            qty,
+            _from_price(price),
+            _from_price(stop_price),
+        )
+
+    if msg_type == CANCEL_ORDER:
+        _, cid = _CANCEL_ORDER.unpack_from(body)
+        (user_id, instrument, order_id), _ = _read_strings(body, _CANCEL_ORDER.size, 3)
+        return CancelOrderRequest(cid, user_id, instrument, order_id)
+
+    if msg_type == MODIFY_ORDER:
+        _, cid, qty, price = _MODIFY_ORDER.unpack_from(body)
+        (user_id, instrument, order_id), _ = _read_strings(body, _MODIFY_ORDER.size, 3)
+        return ModifyOrderRequest(cid, user_id, instrument, order_id, qty, price)
+
+    if msg_type == ACK:
+        _, cid, status, filled_qty, remaining_qty = _ACK.unpack_from(body)
+        (order_id, reject_code), _ = _read_strings(body, _ACK.size, 2)
+        return OrderAck(
+            cid,
+            ACK_STATUSES[status],
+            order_id or None,
+            filled_qty,
+            remaining_qty,
+            reject_code or None,
+        )
+
+    if msg_type == FILL:
+        _, cid, price, qty, remaining_qty = _FILL.unpack_from(body)
+        (order_id,), _ = _read_strings(body, _FILL.size, 1)
+        return FillReport(cid, order_id, price, qty, remaining_qty)
+
+    raise ValueError(f"Unknown message type {msg_type}")
+
+
+class FrameDecoder:
+    """Reassembles frames from a byte stream that may split or coalesce them."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Message]:
+        """Buffers data and returns every message it completes, in order."""
+        buffer = self._buffer
+        buffer += data
+
+        messages = []
+        start = 0
+        header_size = FRAME_HEADER.size
+
+        while len(buffer) - start >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, start)
+            if length > MAX_FRAME:
+                raise ValueError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+
+            end = start + header_size + length
+            if len(buffer) < end:
+                break
+
+            messages.append(decode(bytes(buffer[start + header_size : end])))
+            start = end
+
+        del buffer[:start]
+        return messages
+
+
+def _opt_price(price: Optional[float]) -> float:
+    return math.nan if price is None else price
+
+
+def _from_price(price: float) -> Optional[float]:
+    return None if math.isnan(price) else price
+
+
+def _strings(*values: str) -> bytes:
+    out = bytearray()
+    for value in values:
+        raw = value.encode()
+        if len(raw) > 255:
+            raise ValueError(f"String field longer than 255 bytes: {value[:32]!r}...")
+        out.append(len(raw))
+        out += raw
+    return bytes(out)
+
+
+def _read_strings(body: bytes, offset: int, n: int) -> Tuple[List[str], int]:
+    values = []
+    for _ in range(n):
+        length = body[offset]
+        values.append(body[offset + 1 : offset + 1 + length].decode())
+        offset += 1 + length
+    return values, offset
@@ -0,0 +1,90 @@
+from typing import TYPE_CHECKING, List, Optional
+
+import asyncio
+
+from .codec import FrameDecoder, Message
+
+if TYPE_CHECKING:
+    from .order_gateway import OrderGateway
+
+
+class GatewaySession(asyncio.Protocol):
+    """
+    One client connection to an OrderGateway.
+
+    Requests are pipelined: every frame completed by a read is decoded and
+    handed to the engine as a single batch, without waiting for earlier
+    replies. While the engine queue is full, the session stops reading from
+    the socket (so TCP pushes back on the client) and retries the batch.
+    """
+
+    RETRY_DELAY = 0.0005  # seconds between attempts to enqueue a held batch
+
+    gateway: "OrderGateway"
+    transport: Optional[asyncio.Transport]
+
+    def __init__(self, gateway: "OrderGateway"):
+        self.gateway = gateway
+        self.transport = None
+        self.decoder = FrameDecoder()
+
+        self._backlog: List[Message] = []
+        self._retry: Optional[asyncio.TimerHandle] = None
+        self._paused = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.Transport)
+        self.transport = transport
+        self.gateway.sessions.add(self)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+        self.gateway.sessions.discard(self)
+
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+
+    def data_received(self, data: bytes) -> None:
+        try:
+            messages = self.decoder.feed(data)
+        except Exception as e:
+            print(f"Closing gateway connection on malformed frame: {e!r}")
+            self.close()
+            return
+
+        if not messages:
+            return
+
+        self._backlog.extend(messages)
+
+        # A held batch keeps its place; new requests queue up behind it
+        if self._retry is None:
+            self._submit()
+
+    def write(self, data: bytes) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(data)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    def _submit(self) -> None:
+        self._retry = None
+        if not self._backlog or self.transport is None:
+            return
+
+        if self.gateway.enqueue(self, self._backlog):
+            self._backlog = []
+            if self._paused:
+                self._paused = False
+                self.transport.resume_reading()
+            return
+
+        if not self._paused:
+            self._paused = True
+            self.transport.pause_reading()
+
+        loop = asyncio.get_running_loop()
+        self._retry = loop.call_later(self.RETRY_DELAY, self._submit)
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+from htf_engine.orders.execution_report import ExecutionReport
+
+
+@dataclass(frozen=True)
+class NewOrderRequest:
+    client_order_id: int
+    user_id: str
+    instrument: str
+    order_type: str
+    side: str
+    qty: int
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CancelOrderRequest:
+    client_order_id: int
+    user_id: str
+    instrument: str
+    order_id: str
+
+
+@dataclass(frozen=True)
+class ModifyOrderRequest:
+    client_order_id: int
+    user_id: str
+    instrument: str
+    order_id: str
+    qty: int
+    price: float
+
+
+@dataclass(frozen=True)
+class OrderAck:
+    """Reply to one request, correlated by the client's order id."""
+
+    REJECTED: ClassVar[str] = ExecutionReport.REJECTED
+    MODIFIED: ClassVar[str] = "modified"
+
+    client_order_id: int
+    status: str  # an ExecutionReport status, or "modified"
+    order_id: Optional[str] = None
+    filled_qty: int = 0
+    remaining_qty: int = 0
+    reject_code: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FillReport:
+    """One fill against an order entered through the gateway."""
+
+    client_order_id: int
+    order_id: str
+    price: float
+    qty: int
+    remaining_qty: int
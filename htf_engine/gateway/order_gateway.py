@@ -0,0 +1,323 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+import asyncio
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
+from htf_engine.errors.exchange_errors.order_not_found_error import (
+    OrderNotFoundError,
+)
+from htf_engine.errors.exchange_errors.sequencer_full_error import SequencerFullError
+from htf_engine.errors.exchange_errors.user_not_found_error import UserNotFoundError
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.events.order_rejected_event import OrderRejectedEvent
+from htf_engine.events.stop_triggered_event import StopTriggeredEvent
+from htf_engine.events.trade_event import TradeEvent
+from htf_engine.orders.execution_report import ExecutionReport
+from htf_engine.sequencer.sequencer import Sequencer
+from .codec import Message, encode
+from .gateway_session import GatewaySession
+from .messages import (
+    CancelOrderRequest,
+    FillReport,
+    ModifyOrderRequest,
+    NewOrderRequest,
+    OrderAck,
+)
+
+if TYPE_CHECKING:
+    from htf_engine.exchange import Exchange
+    from htf_engine.order_book import OrderBook
+
+
+class OrderGateway:
+    """
+    asyncio TCP order-entry gateway in front of an Exchange.
+
+    Sessions decode requests on the event loop and pass them to the engine
+    in batches through a Sequencer, so all book and account state is still
+    only touched by the engine thread. Replies (acks, plus fills for orders
+    entered here) are encoded on the engine thread and written back by the
+    event loop, one write per session per batch.
+
+    Books added to the exchange after the gateway was created must be
+    attached with attach() for their fills to be reported.
+    """
+
+    INTERNAL_ERROR = "INTERNAL_ERROR"
+
+    exchange: "Exchange"
+    sequencer: Sequencer
+    host: str
+    port: int
+    sessions: Set[GatewaySession]
+
+    # Engine-thread state
+    _orders: Dict[str, Tuple[GatewaySession, int]]  # order_id -> (session, client id)
+    _outbound: Dict[GatewaySession, List[bytes]]
+
+    def __init__(
+        self,
+        exchange: "Exchange",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        sequencer: Optional[Sequencer] = None,
+    ):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.sessions = set()
+
+        self._owns_sequencer = sequencer is None
+        self.sequencer = sequencer if sequencer is not None else Sequencer(exchange)
+
+        self._orders = {}
+        self._outbound = {}
+        self._in_batch = False
+
+        self._server: Optional[asyncio.Server] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        for ob in exchange.order_books.values():
+            self.attach(ob)
+
+    def attach(self, ob: "OrderBook") -> None:
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+        ob.event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_done)
+        ob.event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_done)
+        ob.event_bus.subscribe(EventType.STOP_TRIGGERED, self._on_stop_triggered)
+
+    async def start(self) -> None:
+        """Starts listening; with port=0 the chosen port is stored in self.port."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await self._loop.create_server(
+            lambda: GatewaySession(self), self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        for session in list(self.sessions):
+            session.close()
+
+        if self._owns_sequencer:
+            # Joins the engine thread, so keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.sequencer.close)
+
+    async def __aenter__(self) -> "OrderGateway":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def enqueue(self, session: GatewaySession, messages: List[Message]) -> bool:
+        """Queues a batch for the engine; returns False if the engine queue is full."""
+        try:
+            self.sequencer.submit(self._process_batch, session, messages, block=False)
+        except SequencerFullError:
+            return False
+
+        return True
+
+    # Engine thread
+
+    def _process_batch(self, session: GatewaySession, messages: List[Message]) -> None:
+        self._in_batch = True
+        try:
+            for msg in messages:
+                self._handle(session, msg)
+        finally:
+            self._in_batch = False
+            self._flush()
+
+    def _handle(self, session: GatewaySession, msg: Message) -> None:
+        try:
+            if isinstance(msg, NewOrderRequest):
+                self._new_order(session, msg)
+            elif isinstance(msg, CancelOrderRequest):
+                self._cancel_order(session, msg)
+            elif isinstance(msg, ModifyOrderRequest):
+                self._modify_order(session, msg)
+            else:
+                raise ValueError(f"Unexpected inbound message {msg!r}")
+
+        except ExchangeError as e:
+            self._reject(session, msg, e.error_code)
+
+        except Exception as e:
+            print(f"Gateway request {msg!r} failed: {e!r}")
+            self._reject(session, msg, self.INTERNAL_ERROR)
+
+    def _new_order(self, session: GatewaySession, msg: NewOrderRequest) -> None:
+        user = self.exchange.users.get(msg.user_id)
+        if user is None:
+            raise UserNotFoundError(msg.user_id)
+
+        report = user.submit_order(
+            msg.instrument,
+            msg.order_type,
+            msg.side,
+            msg.qty,
+            msg.price,
+            msg.stop_price,
+        )
+
+        if report.order_id is not None and report.status in (
+            ExecutionReport.RESTING,
+            ExecutionReport.PARTIALLY_FILLED,
+            ExecutionReport.PENDING,
+        ):
+            self._orders[report.order_id] = (session, msg.client_order_id)
+
+        self._send(
+            session,
+            OrderAck(
+                msg.client_order_id,
+                report.status,
+                report.order_id,
+                report.filled_qty,
+                report.remaining_qty,
+                report.reject_code,
+            ),
+        )
+
+        # The aggressor's own fills are not in _orders yet; report them here
+        if report.order_id is not None:
+            remaining = msg.qty
+            for trade in report.fills:
+                remaining -= trade.qty
+                self._send(
+                    session,
+                    FillReport(
+                        msg.client_order_id,
+                        report.order_id,
+                        trade.price,
+                        trade.qty,
+                        remaining,
+                    ),
+                )
+
+    def _cancel_order(self, session: GatewaySession, msg: CancelOrderRequest) -> None:
+        self._check_owner(msg.user_id, msg.instrument, msg.order_id)
+
+        if not self.exchange.cancel_order(msg.user_id, msg.instrument, msg.order_id):
+            raise OrderNotFoundError(msg.order_id)
+
+        self._send(
+            session,
+            OrderAck(msg.client_order_id, ExecutionReport.CANCELLED, msg.order_id),
+        )
+
+    def _modify_order(self, session: GatewaySession, msg: ModifyOrderRequest) -> None:
+        self._check_owner(msg.user_id, msg.instrument, msg.order_id)
+
+        new_order_id = self.exchange.modify_order(
+            msg.user_id, msg.instrument, msg.order_id, msg.qty, msg.price
+        )
+        if new_order_id == "False":
+            raise OrderNotFoundError(msg.order_id)
+
+        ob = self.exchange.order_books[msg.instrument]
+        order = ob.order_map.get(new_order_id)
+        remaining = (
+            order.qty
+            if order is not None and new_order_id not in ob.cancelled_orders
+            else 0
+        )
+
+        # A replacement is a new order; its fills go out under this request's id
+        if new_order_id != msg.order_id and remaining > 0:
+            self._orders[new_order_id] = (session, msg.client_order_id)
+
+        self._send(
+            session,
+            OrderAck(
+                msg.client_order_id,
+                OrderAck.MODIFIED,
+                new_order_id,
+                msg.qty - remaining,
+                remaining,
+            ),
+        )
+
+    def _check_owner(self, user_id: str, instrument: str, order_id: str) -> None:
+        if user_id not in self.exchange.users:
+            raise UserNotFoundError(user_id)
+
+        ob = self.exchange.order_books.get(instrument)
+        order = ob.order_map.get(order_id) if ob is not None else None
+        if order is not None and order.user_id != user_id:
+            raise OrderNotFoundError(order_id)
+
+    def _reject(self, session: GatewaySession, msg: Message, reject_code: str) -> None:
+        qty = getattr(msg, "qty", 0)
+        self._send(
+            session,
+            OrderAck(
+                msg.client_order_id,
+                ExecutionReport.REJECTED,
+                getattr(msg, "order_id", None),
+                0,
+                qty,
+                reject_code,
+            ),
+        )
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        trade = event.trade
+
+        for order_id, remaining in (
+            (trade.buy_order_id, event.buy_remaining),
+            (trade.sell_order_id, event.sell_remaining),
+        ):
+            owner = self._orders.get(order_id)
+            if owner is None:
+                continue
+
+            session, client_order_id = owner
+            if remaining == 0:
+                del self._orders[order_id]
+
+            self._send(
+                session,
+                FillReport(
+                    client_order_id, order_id, trade.price, trade.qty, remaining
+                ),
+            )
+
+        # Fills caused by commands from outside the gateway go out straight away
+        if not self._in_batch:
+            self._flush()
+
+    def _on_order_done(
+        self, event: Union[OrderCancelledEvent, OrderRejectedEvent]
+    ) -> None:
+        self._orders.pop(event.order.order_id, None)
+
+    def _on_stop_triggered(self, event: StopTriggeredEvent) -> None:
+        # Fills of the released order go to whoever entered the stop
+        owner = self._orders.pop(event.order.order_id, None)
+        if owner is not None:
+            self._orders[event.child_order_id] = owner
+
+    def _send(self, session: GatewaySession, msg: Message) -> None:
+        self._outbound.setdefault(session, []).append(encode(msg))
+
+    def _flush(self) -> None:
+        if not self._outbound or self._loop is None:
+            self._outbound.clear()
+            return
+
+        outbound, self._outbound = self._outbound, {}
+        self._loop.call_soon_threadsafe(self._deliver, outbound)
+
+    # Event loop
+
+    def _deliver(self, outbound: Dict[GatewaySession, List[bytes]]) -> None:
+        for session, frames in outbound.items():
+            session.write(b"".join(frames))
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass
+class Bar:
+    start: datetime
+    interval: int  # seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int = 0
+    turnover: float = 0.0
+    trade_count: int = 0
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.turnover / self.volume if self.volume else None
+
+    def update(self, price: float, qty: int) -> None:
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+
+        self.close = price
+        self.volume += qty
+        self.turnover += price * qty
+        self.trade_count += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "start": self.start.isoformat().replace("+00:00", "Z"),
+            "interval": self.interval,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "turnover": self.turnover,
+            "vwap": self.vwap,
+            "trade_count": self.trade_count,
+        }
+
+    def __str__(self) -> str:
+        ts = self.start.isoformat().replace("+00:00", "Z")
+
+        return (
+            f"{ts} | {self.interval}s | O={self.open} H={self.high} L={self.low} C={self.close} "
+            f"| V={self.volume} VWAP={self.vwap} | {self.trade_count} trades"
+        )
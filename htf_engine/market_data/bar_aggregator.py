@@ -0,0 +1,107 @@
+from collections import deque
+from dataclasses import replace
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Deque, Dict, Iterable, Optional
+
+from htf_engine.errors.exchange_errors.bar_interval_not_configured_error import (
+    BarIntervalNotConfiguredError,
+)
+from htf_engine.trades.trade import Trade
+from .bar import Bar
+
+
+class BarAggregator:
+    """
+    Maintains rolling OHLCV / VWAP bars for a set of intervals (in seconds).
+
+    Each trade touches only the current bar of every interval, so updates are
+    O(1) per trade per interval. Completed bars are kept in a bounded deque.
+    """
+
+    DEFAULT_INTERVALS = (60,)
+
+    intervals: tuple[int, ...]
+    max_bars: int
+    _current: Dict[int, Optional[Bar]]
+    _bar_end: Dict[int, float]  # interval -> epoch seconds at which current bar closes
+    _completed: Dict[int, Deque[Bar]]
+
+    def __init__(
+        self, intervals: Iterable[int] = DEFAULT_INTERVALS, max_bars: int = 1000
+    ):
+        self.intervals = tuple(sorted(set(intervals)))
+        self.max_bars = max_bars
+
+        self._current = {interval: None for interval in self.intervals}
+        self._bar_end = {interval: 0.0 for interval in self.intervals}
+        self._completed = {
+            interval: deque(maxlen=max_bars) for interval in self.intervals
+        }
+
+    def on_trade(self, trade: Trade) -> None:
+        self.record(trade.price, trade.qty, trade.timestamp)
+
+    def record(self, price: float, qty: int, timestamp: datetime) -> None:
+        epoch = timestamp.timestamp()
+
+        for interval in self.intervals:
+            bar = self._current[interval]
+
+            if bar is not None and epoch < self._bar_end[interval]:
+                bar.update(price, qty)
+                continue
+
+            # Roll over: the previous bar (if any) is complete
+            if bar is not None:
+                self._completed[interval].append(bar)
+
+            bar_start = int(epoch // interval) * interval
+            self._bar_end[interval] = bar_start + interval
+            self._current[interval] = Bar(
+                start=datetime.fromtimestamp(bar_start, tz=timezone.utc),
+                interval=interval,
+                open=price,
+                high=price,
+                low=price,
+                close=price,
+                volume=qty,
+                turnover=price * qty,
+                trade_count=1,
+            )
+
+    def get_current_bar(self, interval: int) -> Optional[Bar]:
+        """Returns a copy of the bar currently being built, if any."""
+        self._check_interval(interval)
+
+        bar = self._current[interval]
+        return replace(bar) if bar is not None else None
+
+    def get_bars(self, interval: int, limit: Optional[int] = None) -> tuple[Bar, ...]:
+        """
+        Returns the most recent bars for an interval, oldest first.
+        The in-progress bar (if any) is included as the last element.
+        """
+        self._check_interval(interval)
+
+        completed = self._completed[interval]
+        current = self.get_current_bar(interval)
+
+        if limit is None:
+            bars = list(completed)
+        else:
+            if limit <= 0:
+                return ()
+
+            n_completed = limit - 1 if current is not None else limit
+            bars = list(islice(reversed(completed), n_completed))
+            bars.reverse()
+
+        if current is not None:
+            bars.append(current)
+
+        return tuple(bars)
+
+    def _check_interval(self, interval: int) -> None:
+        if interval not in self._current:
+            raise BarIntervalNotConfiguredError(interval)
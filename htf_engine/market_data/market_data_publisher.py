@@ -0,0 +1,196 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Set, Tuple
+
+import json
+import threading
+
+from htf_engine.events.book_changed_event import BookChangedEvent
+from htf_engine.events.event_type import EventType
+from htf_engine.events.trade_event import TradeEvent
+from .stream_subscription import StreamSubscription
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+
+
+class MarketDataPublisher:
+    """
+    Streams L1/L2 deltas and trades to any number of subscribers.
+
+    Book events only record which levels changed; flush() (called by the
+    exchange once each inbound order is done) builds one update per changed
+    instrument, serialises it once as a server-sent event and puts the same
+    bytes on every matching subscriber's queue. The publisher keeps its own
+    aggregated copy of every book's levels, so new subscribers get a
+    consistent snapshot without touching the books from another thread.
+
+    Messages (SSE `data:` JSON, numbered per instrument by `seq`):
+        event: snapshot  {instrument, seq, bids, asks, best_bid, best_ask,
+                          last_price, last_qty}
+        event: update    {instrument, seq, bids, asks, best_bid, best_ask,
+                          trades: [{price, qty, aggressor, timestamp}]}
+    where bids / asks are [price, qty] pairs, and an update's qty of 0
+    removes the level.
+    """
+
+    max_pending: int
+    subscribers: Set[StreamSubscription]
+
+    _books: Dict[str, "OrderBook"]
+    _levels: Dict[str, Dict[str, Dict[float, int]]]  # inst -> side -> price -> qty
+    _seq: Dict[str, int]
+    _dirty: Dict[str, Set[Tuple[str, float]]]  # inst -> {(side, price)}
+    _trades: Dict[str, List[dict]]
+    _last: Dict[str, Tuple[Optional[float], Optional[int]]]  # last price, qty
+
+    def __init__(self, max_pending: int = 10_000):
+        self.max_pending = max_pending
+        self.subscribers = set()
+
+        self._books = {}
+        self._levels = {}
+        self._seq = {}
+        self._dirty = {}
+        self._trades = {}
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def attach(self, ob: "OrderBook") -> None:
+        instrument = ob.instrument
+        self._books[instrument] = ob
+        self._seq[instrument] = 0
+        self._last[instrument] = (ob.last_price, ob.last_quantity)
+
+        levels: Dict[str, Dict[float, int]] = {"buy": {}, "sell": {}}
+        for side, book_side in (("buy", ob.bids), ("sell", ob.asks)):
+            for price in list(book_side):
+                qty = self._level_qty(ob, book_side, price)
+                if qty:
+                    levels[side][price] = qty
+        self._levels[instrument] = levels
+
+        ob.event_bus.subscribe(EventType.BOOK_CHANGED, self._on_book_changed)
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+
+    def subscribe(self, instrument: Optional[str] = None) -> StreamSubscription:
+        """Subscribes to one instrument (or all), starting with a snapshot of each."""
+        subscription = StreamSubscription(self, instrument, self.max_pending)
+
+        with self._lock:
+            instruments = self._books if instrument is None else [instrument]
+            for inst in instruments:
+                if inst in self._books:
+                    subscription.put(self._snapshot_message(inst))
+
+            self.subscribers.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: StreamSubscription) -> None:
+        with self._lock:
+            self.subscribers.discard(subscription)
+
+    def flush(self) -> None:
+        """Publishes one update per instrument that changed since the last flush."""
+        if not self._dirty and not self._trades:
+            return
+
+        with self._lock:
+            for instrument in self._dirty.keys() | self._trades.keys():
+                message = self._update_message(instrument)
+                if message is not None:
+                    self._fan_out(instrument, message)
+
+            self._dirty.clear()
+            self._trades.clear()
+
+    def _on_book_changed(self, event: BookChangedEvent) -> None:
+        self._dirty.setdefault(event.instrument, set()).add((event.side, event.price))
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        trade = event.trade
+        self._trades.setdefault(event.instrument, []).append(
+            {
+                "price": trade.price,
+                "qty": trade.qty,
+                "aggressor": trade.aggressor,
+                "timestamp": trade.timestamp.isoformat(),
+            }
+        )
+
+    def _update_message(self, instrument: str) -> Optional[bytes]:
+        ob = self._books[instrument]
+        levels = self._levels[instrument]
+        changes: Dict[str, List[List[Any]]] = {"buy": [], "sell": []}
+
+        for side, price in sorted(self._dirty.get(instrument, ())):
+            book_side = ob.bids if side == "buy" else ob.asks
+            qty = self._level_qty(ob, book_side, price)
+
+            if levels[side].get(price, 0) == qty:
+                continue
+
+            if qty:
+                levels[side][price] = qty
+            else:
+                levels[side].pop(price, None)
+            changes[side].append([price, qty])
+
+        trades = self._trades.get(instrument, [])
+        if not trades and not changes["buy"] and not changes["sell"]:
+            return None
+
+        if trades:
+            self._last[instrument] = (trades[-1]["price"], trades[-1]["qty"])
+
+        self._seq[instrument] += 1
+        return self._encode(
+            "update",
+            {
+                "instrument": instrument,
+                "seq": self._seq[instrument],
+                "bids": changes["buy"],
+                "asks": changes["sell"],
+                "best_bid": ob.best_bid(),
+                "best_ask": ob.best_ask(),
+                "trades": trades,
+            },
+        )
+
+    def _snapshot_message(self, instrument: str) -> bytes:
+        levels = self._levels[instrument]
+        last_price, last_qty = self._last[instrument]
+        bids = sorted(levels["buy"].items(), reverse=True)
+        asks = sorted(levels["sell"].items())
+
+        return self._encode(
+            "snapshot",
+            {
+                "instrument": instrument,
+                "seq": self._seq[instrument],
+                "bids": [list(level) for level in bids],
+                "asks": [list(level) for level in asks],
+                "best_bid": bids[0][0] if bids else None,
+                "best_ask": asks[0][0] if asks else None,
+                "last_price": last_price,
+                "last_qty": last_qty,
+            },
+        )
+
+    def _fan_out(self, instrument: str, message: bytes) -> None:
+        dropped = [
+            s
+            for s in self.subscribers
+            if s.instrument in (None, instrument) and not s.put(message)
+        ]
+
+        for subscription in dropped:
+            print(f"Dropping market data subscriber on {instrument}: too far behind")
+            self.subscribers.discard(subscription)
+
+    def _level_qty(self, ob: "OrderBook", side: Mapping, price: float) -> int:
+        cancelled = ob.cancelled_orders
+        return sum(o.qty for o in side.get(price, ()) if o.order_id not in cancelled)
+
+    @staticmethod
+    def _encode(event: str, data: dict) -> bytes:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
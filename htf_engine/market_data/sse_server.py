@@ -0,0 +1,101 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+import threading
+
+from .market_data_publisher import MarketDataPublisher
+
+
+class SSEServer:
+    """
+    Minimal stdlib HTTP server streaming a MarketDataPublisher to browsers.
+
+        GET /stream                  every instrument
+        GET /stream?instrument=AAPL  one instrument
+
+    Each connection is a server-sent event stream (use EventSource in the
+    browser) served by its own thread, which only copies already-encoded
+    messages from its subscription to the socket.
+    """
+
+    HEARTBEAT = 15.0  # seconds of silence before a keep-alive comment
+
+    publisher: MarketDataPublisher
+
+    def __init__(
+        self,
+        publisher: MarketDataPublisher,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.publisher = publisher
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="sse-server", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "SSEServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                if url.path != "/stream":
+                    self.send_error(404)
+                    return
+
+                instrument = parse_qs(url.query).get("instrument", [None])[0]
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+
+                subscription = server.publisher.subscribe(instrument)
+                try:
+                    while not server._stopped.is_set():
+                        message = subscription.get(timeout=server.HEARTBEAT)
+
+                        if message is None:
+                            if subscription.closed:
+                                break
+                            message = b": keep-alive\n\n"
+
+                        self.wfile.write(message)
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    subscription.close()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
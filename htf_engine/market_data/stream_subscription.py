@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING, Optional
+
+import queue
+
+if TYPE_CHECKING:
+    from .market_data_publisher import MarketDataPublisher
+
+
+class StreamSubscription:
+    """
+    One consumer's queue of encoded market data messages.
+
+    The queue is bounded: a consumer that falls `max_pending` messages
+    behind is dropped (closed) rather than slowing the publisher down, and
+    is expected to resubscribe, which starts it again from a fresh snapshot.
+    """
+
+    instrument: Optional[str]  # None for every instrument
+    closed: bool
+
+    def __init__(
+        self,
+        publisher: "MarketDataPublisher",
+        instrument: Optional[str],
+        max_pending: int,
+    ):
+        self.publisher = publisher
+        self.instrument = instrument
+        self.closed = False
+
+        self._queue: "queue.Queue[bytes]" = queue.Queue(max_pending)
+
+    def put(self, message: bytes) -> bool:
+        """Queues message; returns False (and closes) if the consumer is too far behind."""
+        if self.closed:
+            return False
+
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            self.closed = True
+            return False
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next message, or None if none arrives within timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self.closed = True
+        self.publisher.unsubscribe(self)
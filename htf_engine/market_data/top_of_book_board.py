@@ -0,0 +1,149 @@
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, ClassVar, Dict, Mapping, Optional, Set, Union, cast
+
+import math
+import struct
+import time
+
+from htf_engine.events.book_changed_event import BookChangedEvent
+from htf_engine.events.event_type import EventType
+from htf_engine.events.trade_event import TradeEvent
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+
+
+class TopOfBookBoard:
+    """
+    Publishes each book's L1 quote into a shared memory segment.
+
+    The segment is a header followed by one fixed-size slot per instrument.
+    Every slot starts with a seqlock version: the engine makes it odd, writes
+    the quote, then makes it even again. Readers in other processes (see
+    TopOfBookReader) retry until they see the same even version before and
+    after copying the slot, so they never observe a torn quote and never
+    call into the engine.
+
+    Book events only mark a book dirty; the owner calls flush() once the
+    inbound order is done, so a sweep through several levels is published
+    as a single write of the final quote.
+    """
+
+    MAGIC = b"HTFTOB01"
+    HEADER = struct.Struct("<8sII")  # magic, capacity, slots in use
+    # version, instrument, bid, bid qty, ask, ask qty, last, last qty, updated at
+    SLOT = struct.Struct("<Q32sdqdqdqd")
+
+    # Boards created by this process, whose segments its resource tracker owns
+    local_names: ClassVar[Set[str]] = set()
+
+    shm: shared_memory.SharedMemory
+    capacity: int
+    slots: Dict[str, int]  # instrument -> slot index
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 256):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=self.HEADER.size + capacity * self.SLOT.size,
+        )
+        self.name = self.shm.name
+        self.buf = cast(memoryview, self.shm.buf)
+        self.local_names.add(self.name)
+        self.slots = {}
+        self._versions: list[int] = [0] * capacity
+        self._books: Dict[str, "OrderBook"] = {}
+        self._dirty: Set[str] = set()
+
+        self.HEADER.pack_into(self.buf, 0, self.MAGIC, capacity, 0)
+
+    def attach(self, ob: "OrderBook") -> None:
+        """Gives the book a slot and keeps it updated from the book's events."""
+        if ob.instrument in self.slots:
+            return
+
+        if len(self.slots) >= self.capacity:
+            raise ValueError(f"Top-of-book board is full ({self.capacity} slots)")
+
+        self.slots[ob.instrument] = len(self.slots)
+        self._books[ob.instrument] = ob
+        self.publish(ob)
+
+        # Publish the slot count only once the slot holds a valid quote
+        self.HEADER.pack_into(self.buf, 0, self.MAGIC, self.capacity, len(self.slots))
+
+        ob.event_bus.subscribe(EventType.BOOK_CHANGED, self._on_book_event)
+        ob.event_bus.subscribe(EventType.TRADE, self._on_book_event)
+
+    def publish(self, ob: "OrderBook") -> None:
+        """Writes the book's current L1 into its slot."""
+        best_bid = ob.best_bid()
+        best_ask = ob.best_ask()
+
+        self._write(
+            ob.instrument,
+            best_bid,
+            self._level_qty(ob, ob.bids, best_bid),
+            best_ask,
+            self._level_qty(ob, ob.asks, best_ask),
+            ob.last_price,
+            ob.last_quantity or 0,
+        )
+
+    def flush(self) -> None:
+        """Publishes every book that changed since the last flush."""
+        while self._dirty:
+            self.publish(self._books[self._dirty.pop()])
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+        self.local_names.discard(self.name)
+
+    def _on_book_event(self, event: Union[BookChangedEvent, TradeEvent]) -> None:
+        self._dirty.add(event.instrument)
+
+    def _level_qty(self, ob: "OrderBook", side: Mapping, price: Optional[float]) -> int:
+        if price is None:
+            return 0
+
+        cancelled = ob.cancelled_orders
+        return sum(o.qty for o in side[price] if o.order_id not in cancelled)
+
+    def _write(
+        self,
+        instrument: str,
+        bid: Optional[float],
+        bid_qty: int,
+        ask: Optional[float],
+        ask_qty: int,
+        last: Optional[float],
+        last_qty: int,
+    ) -> None:
+        slot = self.slots[instrument]
+        offset = self.HEADER.size + slot * self.SLOT.size
+        buf = self.buf
+        version = self._versions[slot]
+
+        # Odd version: write in progress
+        struct.pack_into("<Q", buf, offset, version + 1)
+        self.SLOT.pack_into(
+            buf,
+            offset,
+            version + 1,
+            instrument.encode()[:32],
+            math.nan if bid is None else bid,
+            bid_qty,
+            math.nan if ask is None else ask,
+            ask_qty,
+            math.nan if last is None else last,
+            last_qty,
+            time.time(),
+        )
+        struct.pack_into("<Q", buf, offset, version + 2)
+
+        self._versions[slot] = version + 2
@@ -0,0 +1,102 @@
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, cast
+
+import math
+
+from .top_of_book_board import TopOfBookBoard
+
+
+class TopOfBookReader:
+    """
+    Read-only view of a TopOfBookBoard from any local process.
+
+    Reads retry until they copy a slot whose seqlock version is even and
+    unchanged across the copy.
+    """
+
+    def __init__(self, name: str):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.buf = cast(memoryview, self.shm.buf)
+
+        # Only the creating process may unlink the segment; otherwise this
+        # process' resource tracker would destroy the board when it exits
+        if name not in TopOfBookBoard.local_names:
+            resource_tracker.unregister(self.shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+        magic, self.capacity, _ = TopOfBookBoard.HEADER.unpack_from(self.buf, 0)
+        if magic != TopOfBookBoard.MAGIC:
+            raise ValueError(
+                f"Shared memory segment {name!r} is not a top-of-book board"
+            )
+
+        self._slots: Dict[str, int] = {}
+
+    def instruments(self) -> List[str]:
+        self._refresh_slots()
+        return list(self._slots)
+
+    def read(self, instrument: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+        {
+            "instrument": str,
+            "best_bid": float | None,
+            "best_bid_qty": int,
+            "best_ask": float | None,
+            "best_ask_qty": int,
+            "last_price": float | None,
+            "last_qty": int,
+            "updated_at": float,
+            "version": int
+        }
+        or None if the instrument is not on the board.
+        """
+        slot = self._slots.get(instrument)
+        if slot is None:
+            self._refresh_slots()
+            slot = self._slots.get(instrument)
+            if slot is None:
+                return None
+
+        return self._read_slot(slot)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        self._refresh_slots()
+        return {inst: self._read_slot(slot) for inst, slot in self._slots.items()}
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def _refresh_slots(self) -> None:
+        _, _, n_used = TopOfBookBoard.HEADER.unpack_from(self.buf, 0)
+
+        for slot in range(len(self._slots), n_used):
+            quote = self._read_slot(slot)
+            self._slots[quote["instrument"]] = slot
+
+    def _read_slot(self, slot: int) -> Dict[str, Any]:
+        offset = TopOfBookBoard.HEADER.size + slot * TopOfBookBoard.SLOT.size
+        buf = self.buf
+
+        while True:
+            fields = TopOfBookBoard.SLOT.unpack_from(buf, offset)
+            version = fields[0]
+
+            if version % 2 == 0 and version == int.from_bytes(
+                buf[offset : offset + 8], "little"
+            ):
+                break
+
+        _, name, bid, bid_qty, ask, ask_qty, last, last_qty, updated_at = fields
+
+        return {
+            "instrument": name.rstrip(b"\0").decode(),
+            "best_bid": None if math.isnan(bid) else bid,
+            "best_bid_qty": bid_qty,
+            "best_ask": None if math.isnan(ask) else ask,
+            "best_ask_qty": ask_qty,
+            "last_price": None if math.isnan(last) else last,
+            "last_qty": last_qty,
+            "updated_at": updated_at,
+            "version": version,
+        }
@@ -1,5 +1,5 @@
 from .matcher import Matcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from htf_engine.errors.exchange_errors.fok_insufficient_liquidity_error import (
     FOKInsufficientLiquidityError,
@@ -19,25 +19,31 @@ class FOKOrderMatcher(Matcher):
     def matcher_type(self) -> str:
         return "fok"
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
         if not isinstance(order, FOKOrder):
             raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
         # Simulate available quantity first
         book = order_book.asks if order.is_buy_order() else order_book.bids
-        price_cmp = (
-            lambda p: p <= order.price if order.is_buy_order() else p >= order.price
+        price_cmp = lambda p: (
+            p <= order.price if order.is_buy_order() else p >= order.price
         )
 
-        available_qty = sum(
-            sum(o.qty for o in orders)
-            for price, orders in book.items()
-            if price_cmp(price)
-        )
+        # Walk out from the touch, stopping once the order could be filled
+        available_qty = 0
+        for price in order_book.level_prices(book, order.is_sell_order()):
+            if not price_cmp(price) or available_qty >= order.qty:
+                break
+            available_qty += sum(o.qty for o in book[price])
 
         # Kill the order as there is insufficient liquidity for immediate execution
         if available_qty < order.qty:
-            order_book.cleanup_discarded_order(order)
-            raise FOKInsufficientLiquidityError()
+            return self._reject(
+                order_book, order, raise_on_reject, FOKInsufficientLiquidityError
+            )
 
-        self._execute_match(order_book, order, price_cmp=price_cmp)
+        return self._execute_match(
+            order_book, order, price_cmp=price_cmp, raise_on_reject=raise_on_reject
+        )
@@ -1,5 +1,5 @@
 from .matcher import Matcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from htf_engine.errors.exchange_errors.matcher_type_mismatch_error import (
     MatcherTypeMismatchError,
@@ -16,15 +16,18 @@ class IOCOrderMatcher(Matcher):
     def matcher_type(self) -> str:
         return "ioc"
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
         if not isinstance(order, IOCOrder):
             raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
-        self._execute_match(
+        return self._execute_match(
             order_book,
             order,
             price_cmp=lambda p: p <= order.price
             if order.is_buy_order()
             else p >= order.price,
+            raise_on_reject=raise_on_reject,
             place_leftover_fn=lambda ob, o: ob.cleanup_discarded_order(o),
         )
@@ -1,6 +1,5 @@
-import heapq
 from .matcher import Matcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from htf_engine.errors.exchange_errors.matcher_type_mismatch_error import (
     MatcherTypeMismatchError,
@@ -17,7 +16,9 @@ class LimitOrderMatcher(Matcher):
     def matcher_type(self) -> str:
         return "limit"
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
         if not isinstance(order, LimitOrder):
             raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
@@ -25,25 +26,14 @@ class LimitOrderMatcher(Matcher):
             if not isinstance(order, LimitOrder):
                 raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
-            if order.is_buy_order():
-                order_book.bids[order.price].append(order)
-                heapq.heappush(
-                    order_book.best_bids,
-                    (-order.price, order.timestamp, order.order_id),
-                )
-            else:
-                order_book.asks[order.price].append(order)
-                heapq.heappush(
-                    order_book.best_asks, (order.price, order.timestamp, order.order_id)
-                )
-
-            order_book.order_map[order.order_id] = order
-
-        self._execute_match(
+            order_book.rest_order(order)
+
+        return self._execute_match(
             order_book,
             order,
             price_cmp=lambda p: p <= order.price
             if order.is_buy_order()
             else p >= order.price,
+            raise_on_reject=raise_on_reject,
             place_leftover_fn=leftover,
         )
@@ -1,6 +1,8 @@
 import heapq
-from typing import Callable, Optional, TYPE_CHECKING
+from time import perf_counter_ns
+from typing import Any, Callable, Optional, Type, TYPE_CHECKING
 
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
 from htf_engine.orders.order import Order
 from htf_engine.errors.exchange_errors.self_trade_prevention_error import (
     SelfTradePreventionError,
@@ -17,87 +19,138 @@ class Matcher:
     def matcher_type(self) -> str:
         raise NotImplementedError("Subclasses must define `matcher_type`")
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
+        """
+        Matches order against the book. A refused order is discarded and either
+        raised as its error or, with raise_on_reject=False, reported by
+        returning the error code (None means the order was accepted).
+        """
         raise NotImplementedError
 
+    def _reject(
+        self,
+        order_book: "OrderBook",
+        order: Order,
+        raise_on_reject: bool,
+        error_type: Type[ExchangeError],
+        *args: Any,
+        **kwargs: Any,
+    ) -> str:
+        # error_code is a class attribute on concrete errors
+        code: str = error_type.error_code  # type: ignore[assignment]
+        order_book.reject_order(order, code)
+
+        # The error is only built when it is raised
+        if raise_on_reject:
+            raise error_type(*args, **kwargs)
+
+        return code
+
     def _execute_match(
         self,
         order_book: "OrderBook",
         order: Order,
         price_cmp: Callable[[float], bool] = lambda best_price: True,
         place_leftover_fn: Optional[Callable[["OrderBook", Order], None]] = None,
-    ) -> None:
+        raise_on_reject: bool = True,
+    ) -> Optional[str]:
         """
         Core matching loop:
         - price_cmp: function to decide if a resting price can be traded
         - place_leftover_fn: function to handle leftover order if qty > 0
         """
-        if self._would_self_trade(order_book, order, price_cmp):
-            print(f"STP triggered: cancelling order {order.order_id}")
-            order_book.cleanup_discarded_order(order)
-            raise SelfTradePreventionError(order.order_id, order.user_id)
-
-        if order.is_buy_order():
-            best_prices_heap = order_book.best_asks
-            book = order_book.asks
-        else:
-            best_prices_heap = order_book.best_bids
-            book = order_book.bids
-
-        while order.qty > 0:
-            order_book.clean_orders(best_prices_heap, book)
-
-            if not best_prices_heap:
-                break
-
-            best_price = (
-                best_prices_heap[0][0]
-                if order.is_buy_order()
-                else -best_prices_heap[0][0]
-            )
-
-            if not price_cmp(best_price):
-                break
-
-            resting_order = book[best_price][0]
-            traded_qty = min(order.qty, resting_order.qty)
-            order.qty -= traded_qty
-            resting_order.qty -= traded_qty
-
-            trade_price = getattr(resting_order, "price")
+        latency = order_book.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        order_book.matching_depth += 1
+        try:
+            if self._would_self_trade(order_book, order, price_cmp):
+                print(f"STP triggered: cancelling order {order.order_id}")
+                return self._reject(
+                    order_book,
+                    order,
+                    raise_on_reject,
+                    SelfTradePreventionError,
+                    order.order_id,
+                    order.user_id,
+                )
 
             if order.is_buy_order():
-                order_book.record_trade(
-                    price=best_price,
-                    qty=traded_qty,
-                    buy_order=order,
-                    sell_order=resting_order,
-                    aggressor="buy",
-                )
+                best_prices_heap = order_book.best_asks
+                book = order_book.asks
             else:
-                order_book.record_trade(
-                    price=best_price,
-                    qty=traded_qty,
-                    buy_order=resting_order,
-                    sell_order=order,
-                    aggressor="sell",
-                )
-
-            print(f"TRADE {traded_qty} @ {trade_price}")
+                best_prices_heap = order_book.best_bids
+                book = order_book.bids
 
-            if resting_order.qty == 0:
-                book[best_price].popleft()
-                del order_book.order_map[resting_order.order_id]
-                heapq.heappop(best_prices_heap)
+            while order.qty > 0:
+                order_book.clean_orders(best_prices_heap, book)
 
-                if not book[best_price]:
-                    del book[best_price]
+                if not best_prices_heap:
+                    break
 
-            # Since a trade has been executed, last price has (potentially) moved, so we need to check stop orders
-            order_book.check_stop_orders()
+                best_price = (
+                    best_prices_heap[0][0]
+                    if order.is_buy_order()
+                    else -best_prices_heap[0][0]
+                )
 
-        if order.qty > 0 and place_leftover_fn:
-            place_leftover_fn(order_book, order)
+                if not price_cmp(best_price):
+                    break
+
+                resting_order = book[best_price][0]
+                traded_qty = min(order.qty, resting_order.qty)
+                order.qty -= traded_qty
+                resting_order.qty -= traded_qty
+
+                trade_price = getattr(resting_order, "price")
+
+                if order.is_buy_order():
+                    order_book.record_trade(
+                        price=best_price,
+                        qty=traded_qty,
+                        buy_order=order,
+                        sell_order=resting_order,
+                        aggressor="buy",
+                    )
+                else:
+                    order_book.record_trade(
+                        price=best_price,
+                        qty=traded_qty,
+                        buy_order=resting_order,
+                        sell_order=order,
+                        aggressor="sell",
+                    )
+
+                print(f"TRADE {traded_qty} @ {trade_price}")
+                order_book.publish_book_changed(resting_order.side, best_price)
+
+                if resting_order.qty == 0:
+                    book[best_price].popleft()
+                    del order_book.order_map[resting_order.order_id]
+                    order_book.resting_orders[resting_order.side] -= 1
+                    heapq.heappop(best_prices_heap)
+
+                    if not book[best_price]:
+                        del book[best_price]
+
+                # Since a trade has been executed, last price has (potentially) moved, so we need to check stop orders
+                order_book.check_stop_orders()
+
+            if order.qty > 0 and place_leftover_fn:
+                place_leftover_fn(order_book, order)
+
+            return None
+        finally:
+            # Compaction deferred by cancels made during the match
+            order_book.matching_depth -= 1
+            if not order_book.matching_depth:
+                order_book.maybe_compact()
+
+            if start:
+                latency.record(
+                    "execute_match", order_book.instrument, perf_counter_ns() - start
+                )
 
     def _would_self_trade(self, order_book, incoming_order, price_cmp) -> bool:
         if not order_book.enable_stp:
@@ -108,13 +161,13 @@ class Matcher:
                 return False
 
             book = order_book.asks
-            prices = sorted(book.keys())
+            prices = order_book.level_prices(book, descending=False)
         else:
             if not order_book.best_bids:
                 return False
 
             book = order_book.bids
-            prices = sorted(book.keys(), reverse=True)
+            prices = order_book.level_prices(book, descending=True)
 
         remaining = incoming_order.qty
 
@@ -123,6 +176,10 @@ class Matcher:
                 break
 
             for resting in book[price]:
+                # Cancelled orders are only tombstoned; matching skips them too
+                if resting.order_id in order_book.cancelled_orders:
+                    continue
+
                 if resting.user_id == incoming_order.user_id:
                     return True  # STP violation
 
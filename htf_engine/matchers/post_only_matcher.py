@@ -1,6 +1,5 @@
-import heapq
 from .matcher import Matcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from htf_engine.errors.exchange_errors.matcher_type_mismatch_error import (
     MatcherTypeMismatchError,
@@ -20,7 +19,9 @@ class PostOnlyOrderMatcher(Matcher):
     def matcher_type(self) -> str:
         return "post-only"
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
         if not isinstance(order, PostOnlyOrder):
             raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
@@ -29,36 +30,27 @@ class PostOnlyOrderMatcher(Matcher):
             if order_book.best_asks:
                 best_ask = order_book.best_asks[0][0]
                 if order.price >= best_ask:
-                    order_book.cleanup_discarded_order(order)
-                    raise PostOnlyViolationError()
+                    return self._reject(
+                        order_book, order, raise_on_reject, PostOnlyViolationError
+                    )
         else:
             if order_book.best_bids:
                 best_bid = -order_book.best_bids[0][0]
                 if order.price <= best_bid:
-                    order_book.cleanup_discarded_order(order)
-                    raise PostOnlyViolationError()
+                    return self._reject(
+                        order_book, order, raise_on_reject, PostOnlyViolationError
+                    )
 
         def leftover(order_book: "OrderBook", order: Order):
             if not isinstance(order, PostOnlyOrder):
                 raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
-            if order.is_buy_order():
-                order_book.bids[order.price].append(order)
-                heapq.heappush(
-                    order_book.best_bids,
-                    (-order.price, order.timestamp, order.order_id),
-                )
-            else:
-                order_book.asks[order.price].append(order)
-                heapq.heappush(
-                    order_book.best_asks, (order.price, order.timestamp, order.order_id)
-                )
+            order_book.rest_order(order)
 
-            order_book.order_map[order.order_id] = order
-
-        self._execute_match(
+        return self._execute_match(
             order_book,
             order,
             price_cmp=lambda p: False,  # The loop shouldn't run. (We can use the price_cmp function from limitorder, but it will eval to False anyway)
+            raise_on_reject=raise_on_reject,
             place_leftover_fn=leftover,
         )
@@ -1,6 +1,6 @@
 import heapq
 from .matcher import Matcher
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from htf_engine.errors.exchange_errors.invalid_stop_price_error import (
     InvalidStopPriceError,
@@ -20,7 +20,9 @@ class StopOrderMatcher(Matcher):
     def matcher_type(self) -> str:
         return "stop"
 
-    def match(self, order_book: "OrderBook", order: Order) -> None:
+    def match(
+        self, order_book: "OrderBook", order: Order, raise_on_reject: bool = True
+    ) -> Optional[str]:
         if not isinstance(order, StopOrder):
             raise MatcherTypeMismatchError(order.order_type, self.matcher_type)
 
@@ -33,7 +35,13 @@ class StopOrderMatcher(Matcher):
                     (-order.stop_price, order.timestamp, order.order_id),
                 )
             else:
-                raise InvalidStopPriceError(is_buy_order=True)
+                return self._reject(
+                    order_book,
+                    order,
+                    raise_on_reject,
+                    InvalidStopPriceError,
+                    is_buy_order=True,
+                )
 
         elif order.is_sell_order():
             if not order_book.last_price or order.stop_price < order_book.last_price:
@@ -44,6 +52,13 @@ class StopOrderMatcher(Matcher):
                     (order.stop_price, order.timestamp, order.order_id),
                 )
             else:
-                raise InvalidStopPriceError(is_buy_order=False)
+                return self._reject(
+                    order_book,
+                    order,
+                    raise_on_reject,
+                    InvalidStopPriceError,
+                    is_buy_order=False,
+                )
 
         order_book.order_map[order.order_id] = order
+        return None
@@ -0,0 +1,168 @@
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List
+
+import threading
+import time
+
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.events.order_rejected_event import OrderRejectedEvent
+from htf_engine.events.trade_event import TradeEvent
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+
+
+class EngineStats:
+    """
+    Internal counters for each book, for diagnosing slowdowns.
+
+    Trade, reject and cancel counts are kept up to date from book events
+    (plus rejects the exchange makes before an order reaches its book);
+    structural sizes are read from container lengths and the book's
+    resting-order counters. A snapshot never scans orders or levels.
+
+    Counters are written by whichever thread runs the engine and read by
+    stats readers (e.g. StatsDumper's thread), so both sides hold `_lock`.
+    Readers only copy: old trade buckets are expired by the writer.
+    """
+
+    window: float  # seconds over which trades per second is averaged
+    trades: Dict[str, int]
+    volume: Dict[str, int]
+    rejects: Dict[str, Dict[str, int]]  # instrument -> reason -> count
+    cancels: Dict[str, Dict[str, int]]  # instrument -> reason -> count
+
+    # instrument -> [second, trades in that second], oldest first
+    _trade_buckets: Dict[str, Deque[List[int]]]
+
+    def __init__(self, window: float = 10.0, clock: Callable[[], float] = time.time):
+        self.window = window
+        self.clock = clock
+
+        self.trades = {}
+        self.volume = {}
+        self.rejects = {}
+        self.cancels = {}
+        self._trade_buckets = {}
+        self._lock = threading.Lock()
+
+    def attach(self, ob: "OrderBook") -> None:
+        inst = ob.instrument
+        with self._lock:
+            self.trades.setdefault(inst, 0)
+            self.volume.setdefault(inst, 0)
+            self.rejects.setdefault(inst, {})
+            self.cancels.setdefault(inst, {})
+            self._trade_buckets.setdefault(inst, deque())
+
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+        ob.event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_rejected)
+        ob.event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_cancelled)
+
+    def record_reject(self, instrument: str, reason: str) -> None:
+        with self._lock:
+            rejects = self.rejects.setdefault(instrument, {})
+            rejects[reason] = rejects.get(reason, 0) + 1
+
+    def trades_per_second(self, instrument: str) -> float:
+        with self._lock:
+            return self._trades_per_second(instrument)
+
+    def total_rejects(self) -> Dict[str, int]:
+        """Reject counts by reason, summed across instruments."""
+        totals: Dict[str, int] = {}
+        with self._lock:
+            for by_reason in self.rejects.values():
+                for reason, n in by_reason.items():
+                    totals[reason] = totals.get(reason, 0) + n
+
+        return totals
+
+    def book_stats(self, ob: "OrderBook") -> dict:
+        """
+        Returns:
+        {
+            "resting_bids": int,            # live priced orders per side
+            "resting_asks": int,
+            "bid_heap_size": int,           # includes cancelled, not yet popped
+            "ask_heap_size": int,
+            "stale_heap_entries": int,
+            "cancelled_orders": int,        # cancelled, awaiting cleanup
+            "compactions": int,             # tombstone sweeps so far
+            "bid_levels": int,              # price keys, incl. levels whose
+            "ask_levels": int,              # orders are all cancelled
+            "stop_orders": int,
+            "order_map_size": int,
+            "trades": int,
+            "volume": int,
+            "trades_per_second": float,     # averaged over `window`
+            "rejects": {reason: int},
+            "cancels": {reason: int}
+        }
+        """
+        inst = ob.instrument
+        resting_bids = ob.resting_orders["buy"]
+        resting_asks = ob.resting_orders["sell"]
+        bid_heap = len(ob.best_bids)
+        ask_heap = len(ob.best_asks)
+
+        with self._lock:
+            counters = {
+                "trades": self.trades.get(inst, 0),
+                "volume": self.volume.get(inst, 0),
+                "trades_per_second": self._trades_per_second(inst),
+                "rejects": dict(self.rejects.get(inst, {})),
+                "cancels": dict(self.cancels.get(inst, {})),
+            }
+
+        return {
+            "resting_bids": resting_bids,
+            "resting_asks": resting_asks,
+            "bid_heap_size": bid_heap,
+            "ask_heap_size": ask_heap,
+            "stale_heap_entries": bid_heap + ask_heap - resting_bids - resting_asks,
+            "cancelled_orders": len(ob.cancelled_orders),
+            "compactions": ob.compactions,
+            "bid_levels": len(ob.bids),
+            "ask_levels": len(ob.asks),
+            "stop_orders": len(ob.stop_bids_price) + len(ob.stop_asks_price),
+            "order_map_size": len(ob.order_map),
+            **counters,
+        }
+
+    def _trades_per_second(self, instrument: str) -> float:
+        buckets = self._trade_buckets.get(instrument)
+        if not buckets:
+            return 0.0
+
+        # Buckets older than the window may linger until the next trade
+        start = int(self.clock()) - self.window
+        return sum(n for second, n in buckets if second > start) / self.window
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        inst = event.instrument
+        second = int(self.clock())
+
+        with self._lock:
+            self.trades[inst] += 1
+            self.volume[inst] += event.trade.qty
+
+            buckets = self._trade_buckets[inst]
+            if buckets and buckets[-1][0] == second:
+                buckets[-1][1] += 1
+            else:
+                buckets.append([second, 1])
+                self._expire(buckets, second)
+
+    def _on_order_rejected(self, event: OrderRejectedEvent) -> None:
+        self.record_reject(event.instrument, event.reason)
+
+    def _on_order_cancelled(self, event: OrderCancelledEvent) -> None:
+        with self._lock:
+            cancels = self.cancels[event.instrument]
+            cancels[event.reason] = cancels.get(event.reason, 0) + 1
+
+    def _expire(self, buckets: Deque[List[int]], now: int) -> None:
+        while buckets and buckets[0][0] <= now - self.window:
+            buckets.popleft()
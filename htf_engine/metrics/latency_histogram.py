@@ -0,0 +1,119 @@
+from typing import List, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR-style) histogram of latencies in nanoseconds.
+
+    Values below 2**SIGNIFICANT_BITS get one bucket each; above that, every
+    power of two is split into 2**(SIGNIFICANT_BITS - 1) equal buckets, so
+    any recorded value is known to within ~3% while the whole range up to
+    2**MAX_BITS ns (~18 minutes) fits in a few hundred counters. Histograms
+    with the same layout merge by adding counts.
+    """
+
+    SIGNIFICANT_BITS = 6
+    MAX_BITS = 40
+
+    _SUB = 1 << SIGNIFICANT_BITS
+    _HALF = _SUB >> 1
+    _N_BUCKETS = _SUB + (MAX_BITS - SIGNIFICANT_BITS) * _HALF
+
+    counts: List[int]
+    count: int
+    total: int
+    min: Optional[int]
+    max: Optional[int]
+
+    def __init__(self) -> None:
+        self.counts = [0] * self._N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: int) -> None:
+        if value < self._SUB:
+            index = max(value, 0)
+        else:
+            shift = value.bit_length() - self.SIGNIFICANT_BITS
+            index = self._SUB + (shift - 1) * self._HALF + (value >> shift) - self._HALF
+            if index >= self._N_BUCKETS:
+                index = self._N_BUCKETS - 1
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> Optional[int]:
+        """Upper bound of the bucket holding the p-th percentile, clamped to max."""
+        if self.count == 0 or self.max is None:
+            return None
+
+        rank = max(1, -(-self.count * p // 100))  # ceil
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def reset(self) -> None:
+        self.__init__()  # type: ignore[misc]
+
+    def to_dict(self) -> dict:
+        """
+        Returns (latencies in microseconds, None while empty):
+        {
+            "count": int,
+            "mean_us": float | None,
+            "min_us": float | None,
+            "p50_us": float | None,
+            "p90_us": float | None,
+            "p99_us": float | None,
+            "p99_9_us": float | None,
+            "max_us": float | None
+        }
+        """
+
+        def us(ns: Optional[float]) -> Optional[float]:
+            return None if ns is None else ns / 1e3
+
+        return {
+            "count": self.count,
+            "mean_us": us(self.mean),
+            "min_us": us(self.min),
+            "p50_us": us(self.percentile(50)),
+            "p90_us": us(self.percentile(90)),
+            "p99_us": us(self.percentile(99)),
+            "p99_9_us": us(self.percentile(99.9)),
+            "max_us": us(self.max),
+        }
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self._SUB:
+            return index
+
+        shift = (index - self._SUB) // self._HALF + 1
+        mantissa = (index - self._SUB) % self._HALF + self._HALF
+        return ((mantissa + 1) << shift) - 1
@@ -0,0 +1,69 @@
+from typing import Dict, Optional, Tuple
+
+from .latency_histogram import LatencyHistogram
+
+
+class LatencyRecorder:
+    """
+    Latency histograms per (operation, instrument), switchable at runtime.
+
+    Instrumented code reads `enabled` once on entry and only takes a
+    timestamp when it is set, so a disabled recorder costs one attribute
+    check per call:
+
+        start = perf_counter_ns() if recorder.enabled else 0
+        try:
+            ...
+        finally:
+            if start:
+                recorder.record("op", instrument, perf_counter_ns() - start)
+
+    Timings are inclusive: a stop triggered inside a match is also counted
+    in that match's time.
+    """
+
+    enabled: bool
+    histograms: Dict[Tuple[str, str], LatencyHistogram]
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms = {}
+
+    def record(self, operation: str, instrument: str, elapsed_ns: int) -> None:
+        key = (operation, instrument)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+
+    def get(self, operation: str, instrument: Optional[str] = None) -> LatencyHistogram:
+        """One instrument's histogram, or all instruments merged if instrument is None."""
+        merged = LatencyHistogram()
+        for (op, inst), histogram in self.histograms.items():
+            if op == operation and (instrument is None or inst == instrument):
+                merged.merge(histogram)
+        return merged
+
+    def snapshot(
+        self, operation: Optional[str] = None, instrument: Optional[str] = None
+    ) -> Dict[str, Dict[str, dict]]:
+        """
+        Returns operation -> instrument -> LatencyHistogram.to_dict(), with
+        an extra "*" entry per operation merging all of its instruments.
+        """
+        out: Dict[str, Dict[str, dict]] = {}
+
+        for (op, inst), histogram in sorted(self.histograms.items()):
+            if operation is not None and op != operation:
+                continue
+            if instrument is not None and inst != instrument:
+                continue
+            out.setdefault(op, {})[inst] = histogram.to_dict()
+
+        for op in out:
+            out[op]["*"] = self.get(op, instrument).to_dict()
+
+        return out
+
+    def reset(self) -> None:
+        self.histograms.clear()
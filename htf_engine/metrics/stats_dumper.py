@@ -0,0 +1,65 @@
+from typing import Any, Callable, Optional
+
+import json
+import threading
+
+
+class StatsDumper:
+    """
+    Appends a stats snapshot to a file as one JSON line every `interval` seconds.
+
+    Runs on a daemon thread; stop() writes a final snapshot before returning.
+    """
+
+    path: str
+    interval: float
+
+    def __init__(self, stats_fn: Callable[[], dict], path: str, interval: float = 1.0):
+        self.stats_fn = stats_fn
+        self.path = path
+        self.interval = interval
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the dump thread; does nothing if it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stats-dumper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StatsDumper":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def dump(self) -> None:
+        line = json.dumps(self.stats_fn())
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._dump_safely()
+
+        self._dump_safely()
+
+    def _dump_safely(self) -> None:
+        try:
+            self.dump()
+        except Exception as e:
+            # Diagnostics must never take the engine down
+            print(f"Stats dump to {self.path} failed: {e!r}")
@@ -1,13 +1,39 @@
 from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Callable, Dict, Deque, List, Optional, Set, Tuple
+from time import perf_counter_ns
+from typing import (
+    ClassVar,
+    Dict,
+    Deque,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import uuid
 import heapq
 import itertools
 
+from .errors.exchange_errors.exchange_error import ExchangeError
+from .errors.exchange_errors.invalid_order_price_error import InvalidOrderPriceError
+from .errors.exchange_errors.invalid_order_quantity_error import (
+    InvalidOrderQuantityError,
+)
+from .errors.exchange_errors.invalid_order_side_error import InvalidOrderSideError
 from .errors.exchange_errors.invalid_order_type_error import InvalidOrderTypeError
-from .errors.exchange_errors.order_book_not_found_error import OrderBookNotFoundError
+from .events.book_changed_event import BookChangedEvent
+from .events.event_bus import EventBus
+from .events.event_type import EventType
+from .events.order_accepted_event import OrderAcceptedEvent
+from .events.order_cancelled_event import OrderCancelledEvent
+from .events.order_rejected_event import OrderRejectedEvent
+from .events.stop_triggered_event import StopTriggeredEvent
+from .events.trade_event import TradeEvent
+from .market_data.bar_aggregator import BarAggregator
+from .metrics.latency_recorder import LatencyRecorder
 from .matchers.fok_matcher import FOKOrderMatcher
 from .matchers.ioc_matcher import IOCOrderMatcher
 from .matchers.limit_matcher import LimitOrderMatcher
@@ -21,15 +47,27 @@ from .orders.market_order import MarketOrder
 from .orders.stop_limit_order import StopLimitOrder
 from .orders.stop_market_order import StopMarketOrder
 from .orders.stop_order import StopOrder
+from .orders.execution_report import ExecutionReport
 from .orders.order import Order
 from .orders.post_only_order import PostOnlyOrder
-from .trades.trade import Trade
+from .orders.price_ladder import PriceLadder
 from .trades.trade_log import TradeLog
 
 
 class OrderBook:
-    bids: Dict[float, Deque[Order]]
-    asks: Dict[float, Deque[Order]]
+    # Raised for orders that cannot be built at all; these never reach the
+    # book, so no ORDER_REJECTED event is published for them
+    MALFORMED_ORDER_ERRORS: ClassVar[tuple] = (
+        InvalidOrderTypeError,
+        InvalidOrderPriceError,
+        InvalidOrderSideError,
+        InvalidOrderQuantityError,
+    )
+
+    bids: MutableMapping[float, Deque[Order]]
+    asks: MutableMapping[float, Deque[Order]]
+    tick_size: Optional[float]
+    ladders: List[PriceLadder]
     order_map: Dict[str, Order]
     best_bids: List[Tuple[float, str, str]]
     best_asks: List[Tuple[float, str, str]]
@@ -37,6 +75,12 @@ class OrderBook:
     last_quantity: Optional[int]
     last_time: Optional[str]
     cancelled_orders: Set[str]
+    resting_orders: Dict[str, int]  # side -> live priced orders on the book
+    dead_orders: Dict[str, int]  # side -> cancelled orders still in heap / queues
+    compaction_ratio: float
+    compaction_min_dead: int
+    compactions: int  # sweeps that removed something
+    matching_depth: int  # matching loops running (stops nest them)
 
     stop_bids: Dict[float, Deque[StopOrder]]
     stop_asks: Dict[float, Deque[StopOrder]]
@@ -44,15 +88,35 @@ class OrderBook:
     stop_asks_price: List[Tuple[float, str, str]]
 
     trade_log: TradeLog
-    on_trade_callback: Optional[Callable[[Trade], None]]
-    cleanup_discarded_order_callback: Optional[Callable[[Order], None]]
-    record_stop_trigger_callback: Optional[Callable[[str, str, StopOrder], None]]
+    bar_aggregator: Optional[BarAggregator]
+    event_bus: EventBus
+    latency: LatencyRecorder
 
-    def __init__(self, instrument: str, enable_stp: bool = True):
+    def __init__(
+        self,
+        instrument: str,
+        enable_stp: bool = True,
+        bar_intervals: Iterable[int] = BarAggregator.DEFAULT_INTERVALS,
+        compaction_ratio: float = 1.0,
+        compaction_min_dead: int = 1024,
+        tick_size: Optional[float] = None,
+        ladder_window: int = 512,
+    ):
         self.instrument = instrument
 
-        self.bids = defaultdict(deque)
-        self.asks = defaultdict(deque)
+        # With a tick size, levels near the market are kept in tick-indexed
+        # ladders that follow the last trade price; otherwise in plain dicts
+        self.tick_size = tick_size
+        if tick_size is not None:
+            self.ladders = [
+                PriceLadder(tick_size, ladder_window),
+                PriceLadder(tick_size, ladder_window),
+            ]
+            self.bids, self.asks = self.ladders
+        else:
+            self.ladders = []
+            self.bids = defaultdict(deque)
+            self.asks = defaultdict(deque)
         self.order_map = {}
         self.best_bids = []  #  (price , timestamp, uuid)
         self.best_asks = []
@@ -61,6 +125,20 @@ class OrderBook:
         self.last_quantity = None
         self.last_time = None
         self.cancelled_orders = set()
+        self.resting_orders = {"buy": 0, "sell": 0}
+
+        # Cancels only tombstone an order; it leaves the heap and its queue
+        # when it reaches the top. Once a side's dead entries outnumber its
+        # live ones by compaction_ratio (and there are at least
+        # compaction_min_dead of them), the side is rebuilt in one sweep.
+        # Cancels made while a match runs (e.g. by an event subscriber) defer
+        # the sweep until the outermost match ends, since it can delete the
+        # level the matcher is trading.
+        self.dead_orders = {"buy": 0, "sell": 0}
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_dead = compaction_min_dead
+        self.compactions = 0
+        self.matching_depth = 0
 
         self.stop_bids = defaultdict(deque)
         self.stop_asks = defaultdict(deque)
@@ -78,11 +156,14 @@ class OrderBook:
         }
 
         self.trade_log = TradeLog()
-        self.on_trade_callback = None  # Exchange handler!!
-        self.cleanup_discarded_order_callback = None
-        self.record_stop_trigger_callback = None
+        self.bar_aggregator = BarAggregator(bar_intervals) if bar_intervals else None
+        self.event_bus = EventBus()  # Exchange (and any other listener) subscribes here
         self.enable_stp = enable_stp
 
+        # Hot-path latency histograms; off by default, and shared with the
+        # exchange once the book is added to one
+        self.latency = LatencyRecorder()
+
     def add_order(
         self,
         order_type: str,
@@ -92,6 +173,89 @@ class OrderBook:
         user_id: Optional[str] = None,
         stop_price: Optional[float] = None,
     ) -> str:
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            order = self._create_order(
+                order_type, side, qty, price, user_id, stop_price
+            )
+            self._accept(order)
+
+            # Execute matching
+            self.matchers[order_type].match(self, order)
+
+            return order.order_id
+        finally:
+            if start:
+                latency.record("add_order", self.instrument, perf_counter_ns() - start)
+
+    def submit_order(
+        self,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        user_id: Optional[str] = None,
+        stop_price: Optional[float] = None,
+    ) -> ExecutionReport:
+        """
+        Like add_order, but never raises for a refused order: FOK kills,
+        post-only violations, STP and invalid stops (and invalid input) come
+        back as a rejected ExecutionReport carrying the error code, and fills
+        are reported directly.
+        """
+        try:
+            order = self._create_order(
+                order_type, side, qty, price, user_id, stop_price
+            )
+        except ExchangeError as e:
+            return ExecutionReport.rejected(None, qty, e.error_code)
+
+        self._accept(order)
+
+        n_trades = len(self.trade_log)
+        reject_code = self.matchers[order_type].match(
+            self, order, raise_on_reject=False
+        )
+
+        if reject_code is not None:
+            return ExecutionReport.rejected(order.order_id, qty, reject_code)
+
+        order_id = order.order_id
+        fills = tuple(
+            t
+            for t in self.trade_log.trades_since(n_trades)
+            if t.buy_order_id == order_id or t.sell_order_id == order_id
+        )
+        filled_qty = sum(t.qty for t in fills)
+        avg_price = (
+            sum(t.price * t.qty for t in fills) / filled_qty if filled_qty else None
+        )
+
+        if order.is_stop():
+            status = ExecutionReport.PENDING
+        elif filled_qty == qty:
+            status = ExecutionReport.FILLED
+        elif order_id not in self.order_map:
+            status = ExecutionReport.CANCELLED
+        elif filled_qty:
+            status = ExecutionReport.PARTIALLY_FILLED
+        else:
+            status = ExecutionReport.RESTING
+
+        return ExecutionReport(
+            order_id, status, filled_qty, qty - filled_qty, avg_price, fills
+        )
+
+    def _create_order(
+        self,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float],
+        user_id: Optional[str],
+        stop_price: Optional[float],
+    ) -> Order:
         order_count = next(self.order_counter)
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f %Z")
         data_string = (
@@ -103,8 +267,8 @@ class OrderBook:
         if user_id is None:
             user_id = "TESTING: NO_USER_ID"
 
-        # create order object
-        order: Order
+        # create order object; stays None if the prices do not fit the type
+        order: Optional[Order] = None
 
         if order_type == "limit":
             if price is not None:
@@ -134,48 +298,69 @@ class OrderBook:
         else:
             raise InvalidOrderTypeError(order_type)
 
-        # Execute matching
-        self.matchers[order_type].match(self, order)
+        if order is None:
+            raise InvalidOrderPriceError(order_type, price, stop_price)
 
-        return order_uuid
+        return order
 
-    def check_stop_orders(self) -> None:
-        if not self.last_price or not self.record_stop_trigger_callback:
-            return
+    def _accept(self, order: Order) -> None:
+        if self.event_bus.has_subscribers(EventType.ORDER_ACCEPTED):
+            self.event_bus.publish(OrderAcceptedEvent(self.instrument, order))
 
-        while self.stop_bids_price and -self.stop_bids_price[0][0] <= self.last_price:
-            if self.stop_bids_price[0][2] not in self.cancelled_orders:
-                order = self.stop_bids[-self.stop_bids_price[0][0]].pop()
-                self.record_stop_trigger_callback(order.user_id, self.instrument, order)
-                self.add_order(
-                    order_type=order.underlying_order_type,
-                    side=order.side,
-                    qty=order.qty,
-                    price=getattr(order, "price", None),
-                    user_id=order.user_id,
-                )
-            else:
-                self.cancelled_orders.remove(self.stop_bids_price[0][2])
-
-            del self.order_map[self.stop_bids_price[0][2]]
-            heapq.heappop(self.stop_bids_price)
-
-        while self.stop_asks_price and self.stop_asks_price[0][0] >= self.last_price:
-            if self.stop_asks_price[0][2] not in self.cancelled_orders:
-                order = self.stop_asks[self.stop_asks_price[0][0]].pop()
-                self.record_stop_trigger_callback(order.user_id, self.instrument, order)
-                self.add_order(
-                    order_type=order.underlying_order_type,
-                    side=order.side,
-                    qty=order.qty,
-                    price=getattr(order, "price", None),
-                    user_id=order.user_id,
+    def check_stop_orders(self) -> None:
+        latency = self.latency
+        start = perf_counter_ns() if latency.enabled else 0
+        try:
+            if not self.last_price:
+                return
+
+            # Heap entries are popped before the triggered order is matched, since
+            # matching it can move the price and re-enter this method
+            while (
+                self.stop_bids_price and -self.stop_bids_price[0][0] <= self.last_price
+            ):
+                neg_stop_price, _, order_id = heapq.heappop(self.stop_bids_price)
+                self._trigger_stop(self.stop_bids, -neg_stop_price, order_id)
+
+            while (
+                self.stop_asks_price and self.stop_asks_price[0][0] >= self.last_price
+            ):
+                stop_price, _, order_id = heapq.heappop(self.stop_asks_price)
+                self._trigger_stop(self.stop_asks, stop_price, order_id)
+        finally:
+            if start:
+                latency.record(
+                    "check_stop_orders", self.instrument, perf_counter_ns() - start
                 )
-            else:
-                self.cancelled_orders.remove(self.stop_asks_price[0][2])
 
-            del self.order_map[self.stop_asks_price[0][2]]
-            heapq.heappop(self.stop_asks_price)
+    def _trigger_stop(
+        self, stop_book: Dict[float, Deque[StopOrder]], stop_price: float, order_id: str
+    ) -> None:
+        level = stop_book[stop_price]
+        order = next(o for o in level if o.order_id == order_id)
+        level.remove(order)
+        if not level:
+            del stop_book[stop_price]
+
+        del self.order_map[order_id]
+
+        if order_id in self.cancelled_orders:
+            self.cancelled_orders.remove(order_id)
+            return
+
+        # The child's id goes out before it can fill, so listeners tracking
+        # the stop can follow it
+        child = self._create_order(
+            order.underlying_order_type,
+            order.side,
+            order.qty,
+            getattr(order, "price", None),
+            order.user_id,
+            None,
+        )
+        self._publish_stop_triggered(order, child.order_id)
+        self._accept(child)
+        self.matchers[child.order_type].match(self, child)
 
     def modify_order(
         self,
@@ -193,7 +378,7 @@ class OrderBook:
 
         # If the modified order is a stop order, always cancel and add new order
         if curr_order.stop:
-            self.cancel_order(curr_order.order_id)
+            self.cancel_order(curr_order.order_id, OrderCancelledEvent.REASON_REPLACED)
             return self.add_order(
                 curr_order.order_type,
                 curr_order.side,
@@ -205,7 +390,7 @@ class OrderBook:
 
         # If during modification, price changes or quantity increases, always cancel and add new order
         if getattr(curr_order, "price", None) != new_price or new_qty > curr_order.qty:
-            self.cancelled_orders.add(order_id)
+            self.cancel_order(order_id, OrderCancelledEvent.REASON_REPLACED)
             return self.add_order(
                 curr_order.order_type,
                 curr_order.side,
@@ -217,6 +402,7 @@ class OrderBook:
         # If price remains unchanged and quantity decreases, just modify the existing order
         if new_qty < curr_order.qty:
             curr_order.qty = new_qty
+            self.publish_book_changed(curr_order.side, new_price)
             print("Quantity updated!")
             return curr_order.order_id
 
@@ -224,9 +410,11 @@ class OrderBook:
         print("No change to order!")
         return order_id
 
-    def clean_orders(self, order_heap: list, queue_dict: dict) -> None:
+    def clean_orders(
+        self, order_heap: list, queue_dict: MutableMapping[float, Deque[Order]]
+    ) -> None:
         while order_heap and order_heap[0][2] in self.cancelled_orders:
-            if queue_dict == self.bids:
+            if queue_dict is self.bids:
                 order_price, timestamp, oid_to_clean = (
                     -order_heap[0][0],
                     order_heap[0][1],
@@ -242,10 +430,76 @@ class OrderBook:
 
             heapq.heappop(order_heap)
             self.cancelled_orders.remove(oid_to_clean)
+            self.dead_orders[removed_order.side] -= 1
             print(
                 f"{removed_order.order_id} removed from queue, {oid_to_clean} removed from heap"
             )
 
+    def compact(self, side: str) -> int:
+        """
+        Drops every cancelled order on one side of the book from its heap,
+        price queues and order_map in a single linear pass, and returns how
+        many were removed. Emptied levels are deleted, so this must not run
+        while a match is in progress (see maybe_compact).
+        """
+        if side == "buy":
+            order_heap, queue_dict = self.best_bids, self.bids
+        else:
+            order_heap, queue_dict = self.best_asks, self.asks
+
+        cancelled = self.cancelled_orders
+        removed: Set[str] = set()
+
+        for price in list(queue_dict):
+            queue = queue_dict[price]
+            live = [o for o in queue if o.order_id not in cancelled]
+
+            if len(live) != len(queue):
+                removed.update(o.order_id for o in queue if o.order_id in cancelled)
+                queue.clear()
+                queue.extend(live)
+
+            if not queue:
+                del queue_dict[price]
+
+        if removed:
+            order_heap[:] = [entry for entry in order_heap if entry[2] not in removed]
+            heapq.heapify(order_heap)
+
+            for order_id in removed:
+                self.order_map.pop(order_id, None)
+            cancelled.difference_update(removed)
+
+            self.dead_orders[side] -= len(removed)
+            self.compactions += 1
+
+        return len(removed)
+
+    def maybe_compact(self, side: Optional[str] = None) -> None:
+        """
+        Compacts a side (or both) whose dead entries have crossed the
+        compaction thresholds, unless a match is running.
+        """
+        if self.matching_depth:
+            return
+
+        for s in (side,) if side is not None else ("buy", "sell"):
+            dead = self.dead_orders[s]
+            if (
+                dead >= self.compaction_min_dead
+                and dead >= self.compaction_ratio * self.resting_orders[s]
+            ):
+                self.compact(s)
+
+    def level_prices(
+        self, side_levels: MutableMapping[float, Deque[Order]], descending: bool
+    ) -> Iterable[float]:
+        """Prices of one side's levels in order; walked lazily on a ladder."""
+        if isinstance(side_levels, PriceLadder):
+            return side_levels.iter_prices(descending)
+
+        return sorted(side_levels, reverse=descending)
+
     def best_bid(self) -> Optional[float]:
         self.clean_orders(self.best_bids, self.bids)
 
@@ -263,9 +517,24 @@ class OrderBook:
             if v.order_id not in self.cancelled_orders
         ]
 
-    def cancel_order(self, order_id: str) -> bool:
-        if order_id in self.order_map:
+    def cancel_order(
+        self, order_id: str, reason: str = OrderCancelledEvent.REASON_USER
+    ) -> bool:
+        if order_id in self.order_map and order_id not in self.cancelled_orders:
             self.cancelled_orders.add(order_id)
+
+            order = self.order_map[order_id]
+            if self.event_bus.has_subscribers(EventType.ORDER_CANCELLED):
+                self.event_bus.publish(
+                    OrderCancelledEvent(self.instrument, order, order.qty, reason)
+                )
+            if not order.is_stop():
+                side = order.side
+                self.resting_orders[side] -= 1
+                self.dead_orders[side] += 1
+                self.publish_book_changed(side, getattr(order, "price"))
+                self.maybe_compact(side)
+
             return True
 
         print("Order not found!!")
@@ -293,8 +562,13 @@ class OrderBook:
         # Should only be done when a trade goes through, since no other event can move the price
         self._update_last_trade_details(trade.price, trade.qty, trade.timestamp)
 
-        if self.on_trade_callback:
-            self.on_trade_callback(trade)  # Notify Exchange
+        if self.bar_aggregator is not None:
+            self.bar_aggregator.on_trade(trade)
+
+        if self.event_bus.has_subscribers(EventType.TRADE):
+            self.event_bus.publish(
+                TradeEvent(self.instrument, trade, buy_order.qty, sell_order.qty)
+            )
 
         return trade
 
@@ -305,11 +579,50 @@ class OrderBook:
         self.last_quantity = quantity
         self.last_time = timestamp
 
+        for ladder in self.ladders:
+            ladder.maybe_recenter(price)
+
+    def rest_order(self, order: Order) -> None:
+        """Places the unfilled remainder of a priced order on its side of the book."""
+        price = getattr(order, "price")
+
+        if order.is_buy_order():
+            self.bids[price].append(order)
+            heapq.heappush(self.best_bids, (-price, order.timestamp, order.order_id))
+        else:
+            self.asks[price].append(order)
+            heapq.heappush(self.best_asks, (price, order.timestamp, order.order_id))
+
+        self.order_map[order.order_id] = order
+        self.resting_orders[order.side] += 1
+        self.publish_book_changed(order.side, price)
+
     def cleanup_discarded_order(self, order: Order) -> None:
-        if self.cleanup_discarded_order_callback is None:
-            raise OrderBookNotFoundError(self.instrument)
+        """Discards the unfilled remainder of an IOC / market order."""
+        if self.event_bus.has_subscribers(EventType.ORDER_CANCELLED):
+            self.event_bus.publish(
+                OrderCancelledEvent(
+                    self.instrument,
+                    order,
+                    order.qty,
+                    OrderCancelledEvent.REASON_UNFILLED,
+                )
+            )
+
+    def reject_order(self, order: Order, reason: str) -> None:
+        """Discards an order that was refused before or during matching."""
+        if self.event_bus.has_subscribers(EventType.ORDER_REJECTED):
+            self.event_bus.publish(OrderRejectedEvent(self.instrument, order, reason))
 
-        self.cleanup_discarded_order_callback(order)
+    def publish_book_changed(self, side: str, price: float) -> None:
+        if self.event_bus.has_subscribers(EventType.BOOK_CHANGED):
+            self.event_bus.publish(BookChangedEvent(self.instrument, side, price))
+
+    def _publish_stop_triggered(self, order: StopOrder, child_order_id: str) -> None:
+        if self.event_bus.has_subscribers(EventType.STOP_TRIGGERED):
+            self.event_bus.publish(
+                StopTriggeredEvent(self.instrument, order, child_order_id)
+            )
 
     def __str__(self):
         bid_levels = sorted(self.bids.items(), key=lambda x: -x[0])
@@ -352,7 +665,7 @@ class OrderBook:
 
         return "\n".join(rows)
 
-    def _snapshot_side(self, side_levels: dict[float, deque[Order]]) -> tuple:
+    def _snapshot_side(self, side_levels: MutableMapping[float, Deque[Order]]) -> tuple:
         """
         Representation of one side (bids or asks).
         Ignores empty price levels.
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+from htf_engine.trades.trade import Trade
+
+
+@dataclass(frozen=True)
+class ExecutionReport:
+    """Outcome of one submitted order, returned instead of raising on rejects."""
+
+    FILLED: ClassVar[str] = "filled"
+    PARTIALLY_FILLED: ClassVar[str] = "partially_filled"  # remainder is resting
+    RESTING: ClassVar[str] = "resting"  # on the book, nothing filled yet
+    PENDING: ClassVar[str] = "pending"  # stop order waiting for its trigger
+    CANCELLED: ClassVar[str] = "cancelled"  # IOC / market remainder discarded
+    REJECTED: ClassVar[str] = "rejected"
+
+    order_id: Optional[str]  # None if the order could not be created
+    status: str
+    filled_qty: int
+    remaining_qty: int
+    avg_price: Optional[float]
+    fills: tuple[Trade, ...]
+    reject_code: Optional[str] = None
+
+    @property
+    def is_rejected(self) -> bool:
+        return self.status == self.REJECTED
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+        {
+            "order_id": str | None,
+            "status": str,
+            "filled_qty": int,
+            "remaining_qty": int,
+            "avg_price": float | None,
+            "fills": [{"price": float, "qty": int, "timestamp": str}],
+            "reject_code": str | None
+        }
+        """
+        return {
+            "order_id": self.order_id,
+            "status": self.status,
+            "filled_qty": self.filled_qty,
+            "remaining_qty": self.remaining_qty,
+            "avg_price": self.avg_price,
+            "fills": [
+                {
+                    "price": t.price,
+                    "qty": t.qty,
+                    "timestamp": t.timestamp.isoformat(),
+                }
+                for t in self.fills
+            ],
+            "reject_code": self.reject_code,
+        }
+
+    @classmethod
+    def rejected(
+        cls, order_id: Optional[str], qty: int, reject_code: str
+    ) -> "ExecutionReport":
+        return cls(order_id, cls.REJECTED, 0, qty, None, (), reject_code)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+
+@dataclass
+class OrderStatus:
+    """Lifecycle record of one order, kept after it leaves the book."""
+
+    NEW: ClassVar[str] = "new"  # resting, or a stop waiting for its trigger
+    PARTIALLY_FILLED: ClassVar[str] = "partially_filled"
+    FILLED: ClassVar[str] = "filled"
+    CANCELLED: ClassVar[str] = "cancelled"
+    REJECTED: ClassVar[str] = "rejected"
+    TRIGGERED: ClassVar[str] = "triggered"  # stop released as a new order
+
+    TERMINAL_STATES: ClassVar[frozenset] = frozenset(
+        {FILLED, CANCELLED, REJECTED, TRIGGERED}
+    )
+
+    order_id: str
+    user_id: str
+    instrument: str
+    order_type: str
+    side: str
+    original_qty: int
+    leaves_qty: int
+    created: float
+    last_update: float
+    state: str = NEW
+    filled_qty: int = 0
+    filled_notional: float = 0.0
+    reason: Optional[str] = None  # cancel reason or reject code
+    child_order_id: Optional[str] = None  # set once a stop is triggered
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        if not self.filled_qty:
+            return None
+        return self.filled_notional / self.filled_qty
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.state in self.TERMINAL_STATES
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+        {
+            "order_id": str,
+            "instrument": str,
+            "order_type": str,
+            "side": str,
+            "state": str,
+            "original_qty": int,
+            "filled_qty": int,
+            "leaves_qty": int,
+            "avg_price": float | None,
+            "reason": str | None,
+            "child_order_id": str | None,   # order a triggered stop became
+            "last_update": float
+        }
+        """
+        return {
+            "order_id": self.order_id,
+            "instrument": self.instrument,
+            "order_type": self.order_type,
+            "side": self.side,
+            "state": self.state,
+            "original_qty": self.original_qty,
+            "filled_qty": self.filled_qty,
+            "leaves_qty": self.leaves_qty,
+            "avg_price": self.avg_price,
+            "reason": self.reason,
+            "child_order_id": self.child_order_id,
+            "last_update": self.last_update,
+        }
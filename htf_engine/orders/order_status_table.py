@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+import time
+
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_accepted_event import OrderAcceptedEvent
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.events.order_rejected_event import OrderRejectedEvent
+from htf_engine.events.stop_triggered_event import StopTriggeredEvent
+from htf_engine.events.trade_event import TradeEvent
+from htf_engine.orders.order_status import OrderStatus
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+
+
+class OrderStatusTable:
+    """
+    order_id -> OrderStatus for live and recently finished orders, fed by
+    order book events.
+
+    Live orders are kept until they finish. Terminal orders move to an LRU
+    that is capped at `max_terminal` entries and, if `terminal_ttl` is set,
+    drops entries that have not been updated for that many seconds. Lookups
+    are O(1).
+    """
+
+    max_terminal: int
+    terminal_ttl: Optional[float]
+    _live: Dict[str, OrderStatus]
+    _terminal: "OrderedDict[str, OrderStatus]"
+
+    def __init__(
+        self,
+        max_terminal: int = 100_000,
+        terminal_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_terminal = max_terminal
+        self.terminal_ttl = terminal_ttl
+        self._clock = clock
+        self._live = {}
+        self._terminal = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._live) + len(self._terminal)
+
+    def get(self, order_id: str) -> Optional[OrderStatus]:
+        status = self._live.get(order_id)
+        if status is not None:
+            return status
+
+        status = self._terminal.get(order_id)
+        if status is None:
+            return None
+
+        if (
+            self.terminal_ttl is not None
+            and self._clock() - status.last_update > self.terminal_ttl
+        ):
+            del self._terminal[order_id]
+            return None
+
+        self._terminal.move_to_end(order_id)
+        return status
+
+    def attach(self, ob: "OrderBook") -> None:
+        ob.event_bus.subscribe(EventType.ORDER_ACCEPTED, self._on_order_accepted)
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+        ob.event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_cancelled)
+        ob.event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_rejected)
+        ob.event_bus.subscribe(EventType.STOP_TRIGGERED, self._on_stop_triggered)
+
+    def resize_order(self, order_id: str, new_qty: int) -> None:
+        """Records an in-place quantity reduction of a live order."""
+        status = self._live.get(order_id)
+        if status is not None:
+            status.leaves_qty = new_qty
+            status.last_update = self._clock()
+
+    def _on_order_accepted(self, event: OrderAcceptedEvent) -> None:
+        order = event.order
+        now = self._clock()
+        self._live[order.order_id] = OrderStatus(
+            order_id=order.order_id,
+            user_id=order.user_id,
+            instrument=event.instrument,
+            order_type=order.order_type,
+            side=order.side,
+            original_qty=order.qty,
+            leaves_qty=order.qty,
+            created=now,
+            last_update=now,
+        )
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        trade = event.trade
+        now = self._clock()
+
+        for order_id, remaining in (
+            (trade.buy_order_id, event.buy_remaining),
+            (trade.sell_order_id, event.sell_remaining),
+        ):
+            status = self._live.get(order_id)
+            if status is None:
+                continue
+
+            status.filled_qty += trade.qty
+            status.filled_notional += trade.qty * trade.price
+            status.leaves_qty = remaining
+            status.last_update = now
+
+            if remaining == 0:
+                self._finish(status, OrderStatus.FILLED, None)
+            else:
+                status.state = OrderStatus.PARTIALLY_FILLED
+
+    def _on_order_cancelled(self, event: OrderCancelledEvent) -> None:
+        status = self._live.get(event.order.order_id)
+        if status is not None:
+            self._finish(status, OrderStatus.CANCELLED, event.reason)
+
+    def _on_order_rejected(self, event: OrderRejectedEvent) -> None:
+        status = self._live.get(event.order.order_id)
+        if status is not None:
+            self._finish(status, OrderStatus.REJECTED, event.reason)
+
+    def _on_stop_triggered(self, event: StopTriggeredEvent) -> None:
+        status = self._live.get(event.order.order_id)
+        if status is not None:
+            status.child_order_id = event.child_order_id
+            self._finish(status, OrderStatus.TRIGGERED, None)
+
+    def _finish(self, status: OrderStatus, state: str, reason: Optional[str]) -> None:
+        now = self._clock()
+        status.state = state
+        status.reason = reason
+        status.last_update = now
+        if state != OrderStatus.FILLED:
+            status.leaves_qty = 0
+
+        del self._live[status.order_id]
+        self._terminal[status.order_id] = status
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        terminal = self._terminal
+
+        while len(terminal) > self.max_terminal:
+            terminal.popitem(last=False)
+
+        # Terminal entries are appended in update order, so expired ones are at
+        # the front (reads can reorder them, which only delays their eviction)
+        if self.terminal_ttl is not None:
+            cutoff = now - self.terminal_ttl
+            while terminal:
+                oldest = next(iter(terminal.values()))
+                if oldest.last_update >= cutoff:
+                    break
+                terminal.popitem(last=False)
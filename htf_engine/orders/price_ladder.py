@@ -0,0 +1,190 @@
+from collections import deque
+from typing import Deque, Dict, Iterator, List, MutableMapping, Optional
+
+import bisect
+import heapq
+
+from htf_engine.orders.order import Order
+
+
+class PriceLadder(MutableMapping[float, Deque[Order]]):
+    """
+    dict-like store of one side's price levels, keyed by price.
+
+    Levels within `window` ticks of the centre live in a preallocated array
+    indexed by tick offset, with a bitmap of occupied slots so levels can be
+    walked in price order without sorting. Levels outside the window (and
+    off-tick prices) are kept in a dict plus a sorted price list. The window
+    is moved with recenter() / maybe_recenter() as the market moves.
+
+    Missing levels read as a new empty deque, which is stored
+    (defaultdict(deque) semantics); `in` and get() do not create levels.
+    """
+
+    tick_size: float
+    window: int
+
+    _base: int  # tick index of slot 0
+    _levels: List[Optional[Deque[Order]]]
+    _prices: List[float]  # exact key of each occupied slot
+    _bitmap: int  # bit i is set while slot i holds a level
+    _n_dense: int
+    _sparse: Dict[float, Deque[Order]]
+    _sparse_prices: List[float]  # sorted keys of _sparse
+
+    def __init__(self, tick_size: float, window: int = 512):
+        if tick_size <= 0:
+            raise ValueError("tick_size must be positive")
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        self.tick_size = tick_size
+        self.window = window
+
+        self._base = 0
+        self._levels = [None] * window
+        self._prices = [0.0] * window
+        self._bitmap = 0
+        self._n_dense = 0
+        self._sparse = {}
+        self._sparse_prices = []
+
+    def __getitem__(self, price: float) -> Deque[Order]:
+        i = round(price / self.tick_size) - self._base
+        if 0 <= i < self.window:
+            level = self._levels[i]
+            if level is not None and self._prices[i] == price:
+                return level
+
+        level = self._sparse.get(price)
+        if level is None:
+            level = deque()
+            self[price] = level
+
+        return level
+
+    def __setitem__(self, price: float, level: Deque[Order]) -> None:
+        tick = round(price / self.tick_size)
+        if not self._bitmap and not 0 <= tick - self._base < self.window:
+            # Nothing to move, so follow the first level into an empty window
+            self._base = tick - self.window // 2
+
+        self._store(price, level)
+
+    def _store(self, price: float, level: Deque[Order]) -> None:
+        i = round(price / self.tick_size) - self._base
+        if 0 <= i < self.window:
+            if self._levels[i] is None:
+                self._levels[i] = level
+                self._prices[i] = price
+                self._bitmap |= 1 << i
+                self._n_dense += 1
+                return
+
+            if self._prices[i] == price:
+                self._levels[i] = level
+                return
+
+        # Off the window, or a different float rounding to an occupied tick
+        if price not in self._sparse:
+            bisect.insort(self._sparse_prices, price)
+        self._sparse[price] = level
+
+    def __delitem__(self, price: float) -> None:
+        i = round(price / self.tick_size) - self._base
+        if 0 <= i < self.window:
+            if self._levels[i] is not None and self._prices[i] == price:
+                self._levels[i] = None
+                self._bitmap &= ~(1 << i)
+                self._n_dense -= 1
+                return
+
+        del self._sparse[price]
+        del self._sparse_prices[bisect.bisect_left(self._sparse_prices, price)]
+
+    def __contains__(self, price: object) -> bool:
+        if not isinstance(price, (int, float)):
+            return False
+
+        i = round(price / self.tick_size) - self._base
+        if 0 <= i < self.window:
+            if self._levels[i] is not None and self._prices[i] == price:
+                return True
+
+        return price in self._sparse
+
+    def get(self, price: float, default=None):  # type: ignore[override]
+        return self[price] if price in self else default
+
+    def __iter__(self) -> Iterator[float]:
+        return self.iter_prices()
+
+    def __len__(self) -> int:
+        return self._n_dense + len(self._sparse)
+
+    def __repr__(self) -> str:
+        return f"PriceLadder({dict(self.items())!r})"
+
+    def iter_prices(self, descending: bool = False) -> Iterator[float]:
+        """Level prices in price order, produced lazily."""
+        dense = self._iter_dense(descending)
+        if not self._sparse_prices:
+            return dense
+
+        sparse = reversed(self._sparse_prices) if descending else self._sparse_prices
+        return heapq.merge(dense, sparse, reverse=descending)
+
+    def maybe_recenter(self, price: float) -> None:
+        """Re-centres the window on price once it drifts a quarter window off centre."""
+        centre = self._base + self.window // 2
+        if abs(round(price / self.tick_size) - centre) > self.window // 4:
+            self.recenter(price)
+
+    def recenter(self, price: float) -> None:
+        """
+        Moves the window to be centred on price: dense levels that fall out of
+        it become sparse and sparse levels that fall into it become dense.
+        """
+        base = round(price / self.tick_size) - self.window // 2
+        if base == self._base:
+            return
+
+        dense = [(self._prices[i], self._levels[i]) for i in self._iter_slots(False)]
+        self._levels = [None] * self.window
+        self._bitmap = 0
+        self._n_dense = 0
+        self._base = base
+
+        for p, level in dense:
+            assert level is not None
+            self._store(p, level)
+
+        # Sparse levels that now fall in the window
+        lo = bisect.bisect_left(self._sparse_prices, (base - 0.5) * self.tick_size)
+        hi = bisect.bisect_right(
+            self._sparse_prices, (base + self.window - 0.5) * self.tick_size
+        )
+        for p in self._sparse_prices[lo:hi]:
+            i = round(p / self.tick_size) - base
+            if 0 <= i < self.window and self._levels[i] is None:
+                level = self._sparse.pop(p)
+                del self._sparse_prices[bisect.bisect_left(self._sparse_prices, p)]
+                self._store(p, level)
+
+    def _iter_slots(self, descending: bool) -> Iterator[int]:
+        bits = self._bitmap
+        if descending:
+            while bits:
+                i = bits.bit_length() - 1
+                yield i
+                bits ^= 1 << i
+        else:
+            while bits:
+                low = bits & -bits
+                yield low.bit_length() - 1
+                bits ^= low
+
+    def _iter_dense(self, descending: bool) -> Iterator[float]:
+        prices = self._prices
+        for i in self._iter_slots(descending):
+            yield prices[i]
@@ -0,0 +1,158 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import heapq
+import itertools
+
+from htf_engine.errors.exchange_errors.invalid_leverage_error import (
+    InvalidLeverageError,
+)
+
+
+class LiquidationEngine:
+    """
+    Price-indexed liquidation triggers for leveraged (isolated margin) positions.
+
+    A position opened at leverage L posts |qty| x avg / L of margin and is
+    liquidated once margin plus unrealised PnL falls to the maintenance
+    margin, i.e. when the mark crosses
+
+        long:  avg x (1 - 1/L) / (1 - maintenance_margin)
+        short: avg x (1 + 1/L) / (1 + maintenance_margin)
+
+    Like the stop book, each instrument keeps a max-heap of long liquidation
+    prices and a min-heap of short ones, so a price move only pops the
+    accounts it crosses. Superseded heap entries are skipped lazily.
+    Crossed (user_id, instrument) pairs are queued on `triggered` for the
+    exchange to close out.
+    """
+
+    maintenance_margin: float
+    marks: Dict[str, float]
+    triggered: Deque[Tuple[str, str]]  # (user_id, instrument) awaiting close-out
+
+    # (user_id, instrument) -> leverage; (user_id, None) is the user's default
+    _leverage: Dict[Tuple[str, Optional[str]], float]
+    # (user_id, instrument) -> (heap entry seq, liquidation price, qty)
+    _active: Dict[Tuple[str, str], Tuple[int, float, int]]
+    _long_heaps: Dict[str, List[Tuple[float, int, str]]]  # (-price, seq, user_id)
+    _short_heaps: Dict[str, List[Tuple[float, int, str]]]  # (price, seq, user_id)
+    _n_active: Dict[str, int]  # instrument -> live entries across both heaps
+
+    def __init__(self, maintenance_margin: float = 0.05):
+        self.maintenance_margin = maintenance_margin
+        self.marks = {}
+        self.triggered = deque()
+
+        self._leverage = {}
+        self._active = {}
+        self._long_heaps = {}
+        self._short_heaps = {}
+        self._n_active = {}
+        self._seq = itertools.count()
+
+    def set_leverage(
+        self, user_id: str, leverage: float, inst: Optional[str] = None
+    ) -> None:
+        if leverage < 1:
+            raise InvalidLeverageError(leverage)
+
+        self._leverage[(user_id, inst)] = leverage
+
+    def get_leverage(self, user_id: str, inst: str) -> Optional[float]:
+        leverage = self._leverage.get((user_id, inst))
+        if leverage is None:
+            leverage = self._leverage.get((user_id, None))
+        return leverage
+
+    def liquidation_price(self, qty: int, avg: float, leverage: float) -> float:
+        mm = self.maintenance_margin
+        if qty > 0:
+            return avg * (1 - 1 / leverage) / (1 - mm)
+        return avg * (1 + 1 / leverage) / (1 + mm)
+
+    def get_liquidation_price(self, user_id: str, inst: str) -> Optional[float]:
+        active = self._active.get((user_id, inst))
+        return active[1] if active is not None else None
+
+    def update_position(self, user_id: str, inst: str, qty: int, avg: float) -> None:
+        """Re-indexes one position after it changes (qty 0 removes it)."""
+        key = (user_id, inst)
+
+        if key in self._active:
+            del self._active[key]
+            self._n_active[inst] -= 1
+
+        if qty == 0 or not self._leverage:
+            return
+
+        leverage = self.get_leverage(user_id, inst)
+        if leverage is None:
+            return
+
+        price = self.liquidation_price(qty, avg, leverage)
+        if price <= 0:
+            return  # fully collateralised long, cannot be liquidated
+
+        seq = next(self._seq)
+        self._active[key] = (seq, price, qty)
+        self._n_active[inst] = self._n_active.get(inst, 0) + 1
+
+        if qty > 0:
+            heapq.heappush(
+                self._long_heaps.setdefault(inst, []), (-price, seq, user_id)
+            )
+        else:
+            heapq.heappush(
+                self._short_heaps.setdefault(inst, []), (price, seq, user_id)
+            )
+
+        self._maybe_compact(inst)
+
+        # The new position may already be under water at the current mark
+        mark = self.marks.get(inst)
+        if mark is not None:
+            self._pop_crossed(inst, mark)
+
+    def update_mark(self, inst: str, price: float) -> None:
+        self.marks[inst] = price
+        if self._n_active.get(inst):
+            self._pop_crossed(inst, price)
+
+    def _pop_crossed(self, inst: str, mark: float) -> None:
+        longs = self._long_heaps.get(inst)
+        while longs and -longs[0][0] >= mark:
+            _, seq, user_id = heapq.heappop(longs)
+            self._trigger(user_id, inst, seq)
+
+        shorts = self._short_heaps.get(inst)
+        while shorts and shorts[0][0] <= mark:
+            _, seq, user_id = heapq.heappop(shorts)
+            self._trigger(user_id, inst, seq)
+
+    def _trigger(self, user_id: str, inst: str, seq: int) -> None:
+        key = (user_id, inst)
+        active = self._active.get(key)
+
+        # Stale entry: the position has changed since this was pushed
+        if active is None or active[0] != seq:
+            return
+
+        del self._active[key]
+        self._n_active[inst] -= 1
+        self.triggered.append(key)
+
+    def _maybe_compact(self, inst: str) -> None:
+        longs = self._long_heaps.get(inst, [])
+        shorts = self._short_heaps.get(inst, [])
+
+        if len(longs) + len(shorts) <= 2 * self._n_active[inst] + 64:
+            return
+
+        def live(entry: Tuple[float, int, str]) -> bool:
+            active = self._active.get((entry[2], inst))
+            return active is not None and active[0] == entry[1]
+
+        for heap in (longs, shorts):
+            heap[:] = [entry for entry in heap if live(entry)]
+            heapq.heapify(heap)
@@ -0,0 +1,138 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import bisect
+import heapq
+
+
+class MarkToMarket:
+    """
+    Incrementally maintained unrealised PnL and exposure for every account.
+
+    `holders` indexes, per instrument, the users with an open position in it,
+    so a price move only revalues that instrument's holders and a position
+    change only touches one (user, instrument) contribution. Per-user totals
+    are then read in O(1).
+
+    Each instrument's holders are also kept sorted by position size. A mark
+    move scales every holder's exposure in that instrument by the same
+    factor, so the order only changes when a position does, and the
+    largest exposures in an instrument are read in O(k).
+    """
+
+    marks: Dict[str, float]  # instrument -> mark price
+    holders: Dict[str, Dict[str, Tuple[int, float]]]  # inst -> user -> (qty, avg)
+    _unrealised_pnl: Dict[str, float]  # user_id -> total unrealised PnL
+    _exposure: Dict[str, float]  # user_id -> total gross exposure
+    _n_positions: Dict[str, int]  # user_id -> number of open positions
+    _by_size: Dict[str, List[Tuple[int, str]]]  # inst -> sorted (-|qty|, user_id)
+
+    def __init__(self):
+        self.marks = {}
+        self.holders = {}
+        self._unrealised_pnl = {}
+        self._exposure = {}
+        self._n_positions = {}
+        self._by_size = {}
+
+    def update_position(self, user_id: str, inst: str, qty: int, avg: float) -> None:
+        holders = self.holders.setdefault(inst, {})
+        by_size = self._by_size.setdefault(inst, [])
+        mark = self.marks.get(inst)
+        old = holders.get(user_id)
+
+        if old is not None:
+            old_qty, old_avg = old
+            if abs(old_qty) != abs(qty):
+                del by_size[bisect.bisect_left(by_size, (-abs(old_qty), user_id))]
+                if qty != 0:
+                    bisect.insort(by_size, (-abs(qty), user_id))
+            if mark is not None:
+                self._unrealised_pnl[user_id] -= old_qty * (mark - old_avg)
+                self._exposure[user_id] -= abs(old_qty) * mark
+
+        if qty == 0:
+            if old is not None:
+                del holders[user_id]
+                self._n_positions[user_id] -= 1
+
+                # Reset flat accounts exactly so rounding error cannot accumulate
+                if self._n_positions[user_id] == 0:
+                    del self._n_positions[user_id]
+                    del self._unrealised_pnl[user_id]
+                    del self._exposure[user_id]
+            return
+
+        if old is None:
+            bisect.insort(by_size, (-abs(qty), user_id))
+            self._n_positions[user_id] = self._n_positions.get(user_id, 0) + 1
+            self._unrealised_pnl.setdefault(user_id, 0.0)
+            self._exposure.setdefault(user_id, 0.0)
+
+        holders[user_id] = (qty, avg)
+        if mark is not None:
+            self._unrealised_pnl[user_id] += qty * (mark - avg)
+            self._exposure[user_id] += abs(qty) * mark
+
+    def update_mark(self, inst: str, price: float) -> None:
+        old_mark = self.marks.get(inst)
+        self.marks[inst] = price
+
+        if old_mark == price:
+            return
+
+        unrealised_pnl = self._unrealised_pnl
+        exposure = self._exposure
+
+        for user_id, (qty, avg) in self.holders.get(inst, {}).items():
+            if old_mark is None:
+                unrealised_pnl[user_id] += qty * (price - avg)
+                exposure[user_id] += abs(qty) * price
+            else:
+                move = price - old_mark
+                unrealised_pnl[user_id] += qty * move
+                exposure[user_id] += abs(qty) * move
+
+    def get_unrealised_pnl(self, user_id: str) -> float:
+        return self._unrealised_pnl.get(user_id, 0.0)
+
+    def get_exposure(self, user_id: str) -> float:
+        return self._exposure.get(user_id, 0.0)
+
+    def get_mark(self, inst: str) -> Optional[float]:
+        return self.marks.get(inst)
+
+    def get_holders(self, inst: str) -> Mapping[str, Tuple[int, float]]:
+        """Read-only view of user_id -> (quantity, average cost) for inst."""
+        return MappingProxyType(self.holders.get(inst, {}))
+
+    def all_unrealised_pnl(self) -> Mapping[str, float]:
+        """Read-only live view of user_id -> unrealised PnL (accounts with positions)."""
+        return MappingProxyType(self._unrealised_pnl)
+
+    def all_exposures(self) -> Mapping[str, float]:
+        """Read-only live view of user_id -> exposure (accounts with positions)."""
+        return MappingProxyType(self._exposure)
+
+    def top_exposures(
+        self, n: int, inst: Optional[str] = None
+    ) -> list[Tuple[str, float]]:
+        """
+        The n accounts with the largest exposure, largest first: in inst,
+        read off its size-sorted holders in O(n), or else in total.
+
+        Totals mix instruments whose marks move independently, so they have
+        no order that survives a mark move; ranking them is one O(N log n)
+        pass over the N accounts with positions.
+        """
+        if inst is None:
+            return heapq.nlargest(n, self._exposure.items(), key=lambda item: item[1])
+
+        mark = self.marks.get(inst)
+        if mark is None:
+            return []
+
+        return [
+            (user_id, -neg_qty * mark)
+            for neg_qty, user_id in self._by_size.get(inst, [])[:n]
+        ]
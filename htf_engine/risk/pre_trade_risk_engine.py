@@ -0,0 +1,265 @@
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+import threading
+
+from htf_engine.errors.exchange_errors.insufficient_buying_power_error import (
+    InsufficientBuyingPowerError,
+)
+from htf_engine.errors.exchange_errors.order_exceeds_notional_limit_error import (
+    OrderExceedsNotionalLimitError,
+)
+from htf_engine.errors.exchange_errors.price_outside_band_error import (
+    PriceOutsideBandError,
+)
+from htf_engine.errors.exchange_errors.too_many_open_orders_error import (
+    TooManyOpenOrdersError,
+)
+from htf_engine.events.event_bus import EventBus
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_accepted_event import OrderAcceptedEvent
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.events.order_rejected_event import OrderRejectedEvent
+from htf_engine.events.stop_triggered_event import StopTriggeredEvent
+from htf_engine.events.trade_event import TradeEvent
+from htf_engine.risk.risk_limits import RiskLimits
+from htf_engine.trades.trade import Trade
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+    from htf_engine.user.user import User
+
+
+class PreTradeRiskEngine:
+    """
+    Constant-time pre-trade checks against configurable RiskLimits.
+
+    Open-order counts and buying power reserved by resting buys are kept as
+    per-user counters, updated from order book events, so `check` never walks
+    a user's orders. Limits are resolved (user, instrument) -> user ->
+    instrument -> default. A max_open_orders from a limit set for an
+    instrument caps the user's open orders in that instrument; from a
+    user-wide or default limit it caps them across all instruments.
+
+    A buy fill stops reserving cash when it trades, but the cash is only
+    debited once the fill settles (later, with async settlement), so until
+    settle_trades() is called its notional is counted as unsettled.
+    """
+
+    default_limits: RiskLimits
+    _limits: Dict[Tuple[Optional[str], Optional[str]], RiskLimits]
+
+    # order_id -> [user_id, unit price reserved (0 for sells/unpriced), qty, inst]
+    _open_orders: Dict[str, list]
+    open_order_count: Dict[str, int]  # user_id -> open orders
+    inst_open_order_count: Dict[Tuple[str, str], int]  # (user_id, inst) -> open
+    reserved_cash: Dict[str, float]  # user_id -> cash reserved by open buys
+    # user_id -> [notional of traded, unsettled buys, number of such fills]
+    _unsettled: Dict[str, list]
+
+    def __init__(self, default_limits: Optional[RiskLimits] = None):
+        self.default_limits = default_limits or RiskLimits()
+        self._limits = {}
+        self._open_orders = {}
+        self.open_order_count = {}
+        self.inst_open_order_count = {}
+        self.reserved_cash = {}
+        self._unsettled = {}
+        # Fills are recorded by the matching thread and settled by the
+        # settlement worker
+        self._unsettled_lock = threading.Lock()
+
+    def set_limits(
+        self,
+        limits: RiskLimits,
+        user_id: Optional[str] = None,
+        instrument: Optional[str] = None,
+    ) -> None:
+        if user_id is None and instrument is None:
+            self.default_limits = limits
+        else:
+            self._limits[(user_id, instrument)] = limits
+
+    def get_limits(self, user_id: str, instrument: str) -> RiskLimits:
+        return self._resolve_limits(user_id, instrument)[0]
+
+    def _resolve_limits(self, user_id: str, instrument: str) -> Tuple[RiskLimits, bool]:
+        """The limits that apply, and whether they were set for the instrument."""
+        if self._limits:
+            for key in ((user_id, instrument), (user_id, None), (None, instrument)):
+                limits = self._limits.get(key)
+                if limits is not None:
+                    return limits, key[1] is not None
+
+        return self.default_limits, False
+
+    def unsettled_cash(self, user_id: str) -> float:
+        """Notional of the user's buy fills that have traded but not settled."""
+        entry = self._unsettled.get(user_id)
+        return entry[0] if entry is not None else 0.0
+
+    def check(
+        self,
+        user: "User",
+        instrument: str,
+        side: str,
+        qty: int,
+        price: Optional[float],
+        last_price: Optional[float],
+        is_stop: bool = False,
+        replacing: Optional[str] = None,
+    ) -> None:
+        """
+        Raises a RejectedOrderError if the order breaches the user's limits.
+
+        `replacing` is the id of an open order the new one replaces (a
+        modify): its open-order slot and reserved cash count as free.
+        """
+        limits, per_instrument = self._resolve_limits(user.user_id, instrument)
+
+        if per_instrument:
+            open_orders = self.inst_open_order_count.get((user.user_id, instrument), 0)
+        else:
+            open_orders = self.open_order_count.get(user.user_id, 0)
+        reserved = self.reserved_cash.get(user.user_id, 0.0)
+        if replacing is not None:
+            entry = self._open_orders.get(replacing)
+            if entry is not None:
+                open_orders -= 1
+                reserved -= entry[1] * entry[2]
+
+        if limits.max_open_orders is not None:
+            if open_orders >= limits.max_open_orders:
+                raise TooManyOpenOrdersError(user.user_id, limits.max_open_orders)
+
+        if (
+            limits.price_band is not None
+            and price is not None
+            and last_price is not None
+            and not is_stop
+        ):
+            lower = last_price * (1 - limits.price_band)
+            upper = last_price * (1 + limits.price_band)
+            if not lower <= price <= upper:
+                raise PriceOutsideBandError(instrument, price, lower, upper)
+
+        ref_price = price if price is not None else last_price
+        if ref_price is None:
+            return
+
+        notional = qty * ref_price
+
+        if (
+            limits.max_order_notional is not None
+            and notional > limits.max_order_notional
+        ):
+            raise OrderExceedsNotionalLimitError(
+                instrument, notional, limits.max_order_notional
+            )
+
+        if limits.check_buying_power and side == "buy":
+            available = user.cash_balance - reserved - self.unsettled_cash(user.user_id)
+            if notional > available:
+                raise InsufficientBuyingPowerError(user.user_id, notional, available)
+
+    def attach(self, ob: "OrderBook") -> None:
+        """Keeps the counters in step with an order book."""
+        self.subscribe(ob.event_bus)
+
+    def subscribe(self, event_bus: EventBus) -> None:
+        """Keeps the counters in step with the book events published on event_bus."""
+        event_bus.subscribe(EventType.ORDER_ACCEPTED, self._on_order_accepted)
+        event_bus.subscribe(EventType.TRADE, self._on_trade)
+        event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_closed)
+        event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_closed)
+        event_bus.subscribe(EventType.STOP_TRIGGERED, self._on_order_closed)
+
+    def resize_order(self, order_id: str, new_qty: int) -> None:
+        """Releases buying power when an order's quantity is reduced in place."""
+        entry = self._open_orders.get(order_id)
+        if entry is None:
+            return
+
+        user_id, unit_price, qty, _ = entry
+        self.reserved_cash[user_id] -= (qty - new_qty) * unit_price
+        entry[2] = new_qty
+
+    def settle_trades(self, trades: Iterable[Trade]) -> None:
+        """Stops counting buy fills as unsettled once they hit the accounts."""
+        with self._unsettled_lock:
+            for trade in trades:
+                entry = self._unsettled.get(trade.buy_user_id)
+                if entry is None:
+                    continue
+
+                entry[0] -= trade.qty * trade.price
+                entry[1] -= 1
+
+                # Reset exactly so rounding error cannot accumulate
+                if entry[1] == 0:
+                    del self._unsettled[trade.buy_user_id]
+
+    def _on_order_accepted(self, event: OrderAcceptedEvent) -> None:
+        order = event.order
+        user_id = order.user_id
+        unit_price = getattr(order, "price", None) if order.is_buy_order() else None
+        unit_price = unit_price or 0.0
+
+        key = (user_id, event.instrument)
+        self._open_orders[order.order_id] = [
+            user_id,
+            unit_price,
+            order.qty,
+            event.instrument,
+        ]
+        self.open_order_count[user_id] = self.open_order_count.get(user_id, 0) + 1
+        self.inst_open_order_count[key] = self.inst_open_order_count.get(key, 0) + 1
+        self.reserved_cash[user_id] = (
+            self.reserved_cash.get(user_id, 0.0) + order.qty * unit_price
+        )
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        trade = event.trade
+
+        with self._unsettled_lock:
+            entry = self._unsettled.setdefault(trade.buy_user_id, [0.0, 0])
+            entry[0] += trade.qty * trade.price
+            entry[1] += 1
+
+        self._fill(trade.buy_order_id, trade.qty, event.buy_remaining)
+        self._fill(trade.sell_order_id, trade.qty, event.sell_remaining)
+
+    def _fill(self, order_id: str, qty: int, remaining: int) -> None:
+        entry = self._open_orders.get(order_id)
+        if entry is None:
+            return
+
+        if remaining == 0:
+            self._close(order_id)
+            return
+
+        self.reserved_cash[entry[0]] -= qty * entry[1]
+        entry[2] -= qty
+
+    def _on_order_closed(
+        self, event: OrderCancelledEvent | OrderRejectedEvent | StopTriggeredEvent
+    ) -> None:
+        self._close(event.order.order_id)
+
+    def _close(self, order_id: str) -> None:
+        entry = self._open_orders.pop(order_id, None)
+        if entry is None:
+            return
+
+        user_id, unit_price, qty, inst = entry
+        self.reserved_cash[user_id] -= qty * unit_price
+        self.open_order_count[user_id] -= 1
+
+        key = (user_id, inst)
+        self.inst_open_order_count[key] -= 1
+        if self.inst_open_order_count[key] == 0:
+            del self.inst_open_order_count[key]
+
+        # Drop idle users so the counters stay proportional to open orders
+        if self.open_order_count[user_id] == 0:
+            del self.open_order_count[user_id]
+            del self.reserved_cash[user_id]
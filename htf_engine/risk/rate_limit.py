@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float  # tokens (messages) refilled per second
+    burst: int  # bucket capacity, i.e. messages allowed back to back
@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Optional, Tuple
+
+import time
+
+from htf_engine.risk.rate_limit import RateLimit
+from htf_engine.risk.token_bucket import TokenBucket
+
+
+class RateLimiter:
+    """
+    Per-user, per-message-type token buckets.
+
+    Message types are "place", "modify" and "cancel". A type with no
+    configured RateLimit is unlimited. Buckets are created lazily on a user's
+    first message of that type, and a check is one dict lookup plus a little
+    arithmetic.
+    """
+
+    MESSAGE_TYPES = ("place", "modify", "cancel")
+
+    _limits: Dict[Tuple[Optional[str], str], RateLimit]  # (user_id|None, type)
+    _buckets: Dict[Tuple[str, str], TokenBucket]  # (user_id, type)
+    accepted: Dict[str, int]  # message type -> messages let through
+    rejected: Dict[str, int]  # message type -> messages throttled
+    rejected_by_user: Dict[str, int]  # user_id -> messages throttled
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._limits = {}
+        self._buckets = {}
+        self._clock = clock
+
+        self.accepted = {message_type: 0 for message_type in self.MESSAGE_TYPES}
+        self.rejected = {message_type: 0 for message_type in self.MESSAGE_TYPES}
+        self.rejected_by_user = {}
+
+        for message_type, limit in (limits or {}).items():
+            self.set_limit(message_type, limit)
+
+    def set_limit(
+        self,
+        message_type: str,
+        limit: Optional[RateLimit],
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Sets (or with None, clears) the default or a per-user limit."""
+        if message_type not in self.MESSAGE_TYPES:
+            raise ValueError(f"Unknown message type {message_type!r}")
+
+        if limit is None:
+            self._limits.pop((user_id, message_type), None)
+        else:
+            self._limits[(user_id, message_type)] = limit
+
+        # Affected buckets are rebuilt with the new limit on their next message
+        for key in [
+            key
+            for key in self._buckets
+            if key[1] == message_type and (user_id is None or key[0] == user_id)
+        ]:
+            del self._buckets[key]
+
+    def allow(self, user_id: str, message_type: str) -> bool:
+        if not self._limits:
+            self.accepted[message_type] += 1
+            return True
+
+        now = self._clock()
+        bucket = self._buckets.get((user_id, message_type))
+
+        if bucket is None:
+            limit = self._limits.get((user_id, message_type)) or self._limits.get(
+                (None, message_type)
+            )
+            if limit is None:
+                self.accepted[message_type] += 1
+                return True
+
+            bucket = TokenBucket(limit.rate, limit.burst, now)
+            self._buckets[(user_id, message_type)] = bucket
+
+        if bucket.try_consume(now):
+            self.accepted[message_type] += 1
+            return True
+
+        self.rejected[message_type] += 1
+        self.rejected_by_user[user_id] = self.rejected_by_user.get(user_id, 0) + 1
+        return False
+
+    def get_counters(self) -> dict:
+        """
+        Returns:
+        {
+            "accepted": {message_type: int},
+            "rejected": {message_type: int},
+            "rejected_by_user": {user_id: int}
+        }
+        """
+        return {
+            "accepted": dict(self.accepted),
+            "rejected": dict(self.rejected),
+            "rejected_by_user": dict(self.rejected_by_user),
+        }
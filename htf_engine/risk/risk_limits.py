@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """
+    Pre-trade limits applied to one user, one instrument or one (user, instrument).
+
+    Every limit is optional; None disables that check. Position limits stay on
+    the User (see User.set_position_limit) since they also drive its quotas.
+    """
+
+    max_order_notional: Optional[float] = None  # qty x price of a single order
+    max_open_orders: Optional[int] = None  # resting + stops; per inst if set for one
+    price_band: Optional[float] = None  # max |price - last| / last, e.g. 0.1
+    check_buying_power: bool = False  # buy notional must fit in free cash
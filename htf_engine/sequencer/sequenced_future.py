@@ -0,0 +1,11 @@
+from concurrent.futures import Future
+
+
+class SequencedFuture(Future):
+    """Future for one sequenced command, tagged with its global sequence number."""
+
+    seq: int
+
+    def __init__(self, seq: int):
+        super().__init__()
+        self.seq = seq
@@ -0,0 +1,182 @@
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Optional, Tuple
+
+import threading
+
+from htf_engine.errors.exchange_errors.sequencer_closed_error import (
+    SequencerClosedError,
+)
+from htf_engine.errors.exchange_errors.sequencer_full_error import SequencerFullError
+from htf_engine.errors.exchange_errors.user_not_found_error import UserNotFoundError
+from .sequenced_future import SequencedFuture
+
+if TYPE_CHECKING:
+    from htf_engine.exchange import Exchange
+
+
+Command = Tuple[SequencedFuture, Callable[..., Any], tuple, dict]
+
+
+class Sequencer:
+    """
+    Single-writer front end for an Exchange.
+
+    Any number of producer threads enqueue commands into a bounded buffer;
+    one engine thread drains them in batches, in the order they were
+    sequenced, and resolves each command's future with its result or error.
+    Everything the commands touch (books, users, risk state) is therefore
+    only ever mutated by the engine thread.
+    """
+
+    exchange: "Exchange"
+    capacity: int
+    max_batch: int
+    last_seq: int  # sequence number of the last command accepted
+
+    _buffer: Deque[Command]
+
+    def __init__(
+        self, exchange: "Exchange", capacity: int = 65536, max_batch: int = 256
+    ):
+        self.exchange = exchange
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.last_seq = 0
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        self._engine = threading.Thread(target=self._run, name="engine", daemon=True)
+        self._engine.start()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> SequencedFuture:
+        """
+        Sequences fn(*args, **kwargs) to run on the engine thread.
+
+        When the buffer is full, waits for room (up to `timeout`) or, with
+        block=False, raises SequencerFullError straight away.
+        """
+        with self._not_full:
+            if self._closed:
+                raise SequencerClosedError()
+
+            if len(self._buffer) >= self.capacity:
+                if not block or not self._not_full.wait_for(
+                    lambda: len(self._buffer) < self.capacity or self._closed,
+                    timeout,
+                ):
+                    raise SequencerFullError(self.capacity)
+
+                if self._closed:
+                    raise SequencerClosedError()
+
+            self.last_seq += 1
+            future = SequencedFuture(self.last_seq)
+            self._buffer.append((future, fn, args, kwargs))
+            self._not_empty.notify()
+
+        return future
+
+    # Order shortcuts go through the User so they get the same position limit,
+    # pre-trade risk checks and outstanding reservations as a direct call.
+    # The user is looked up on the engine thread.
+
+    def place_order(
+        self, user_id: str, instrument: str, *args: Any, **kwargs: Any
+    ) -> SequencedFuture:
+        return self.submit(
+            self._call_user, user_id, "place_order", instrument, *args, **kwargs
+        )
+
+    def submit_order(
+        self, user_id: str, instrument: str, *args: Any, **kwargs: Any
+    ) -> SequencedFuture:
+        return self.submit(
+            self._call_user, user_id, "submit_order", instrument, *args, **kwargs
+        )
+
+    def cancel_order(
+        self, user_id: str, instrument: str, order_id: str
+    ) -> SequencedFuture:
+        return self.submit(
+            self._call_user, user_id, "cancel_order", order_id, instrument
+        )
+
+    def modify_order(
+        self,
+        user_id: str,
+        instrument: str,
+        order_id: str,
+        new_qty: int,
+        new_price: float,
+    ) -> SequencedFuture:
+        return self.submit(
+            self._call_user,
+            user_id,
+            "modify_order",
+            instrument,
+            order_id,
+            new_qty,
+            new_price,
+        )
+
+    def _call_user(self, user_id: str, method: str, *args: Any, **kwargs: Any) -> Any:
+        user = self.exchange.users.get(user_id)
+        if user is None:
+            raise UserNotFoundError(user_id)
+
+        return getattr(user, method)(*args, **kwargs)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def close(self) -> None:
+        """Stops accepting commands, runs everything already queued, then stops."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+
+        self._engine.join()
+
+    def __enter__(self) -> "Sequencer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        buffer = self._buffer
+
+        while True:
+            with self._not_empty:
+                self._not_empty.wait_for(lambda: buffer or self._closed)
+
+                if not buffer:
+                    return  # closed and drained
+
+                batch = [
+                    buffer.popleft() for _ in range(min(len(buffer), self.max_batch))
+                ]
+                self._not_full.notify_all()
+
+            # Commands run outside the lock so producers are never blocked on them
+            for future, fn, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
@@ -0,0 +1,83 @@
+from typing import Callable, List, Optional, Tuple
+
+import itertools
+import queue
+import threading
+
+from htf_engine.trades.trade import Trade
+
+
+class SettlementQueue:
+    """
+    Applies batches of fills to user accounts on a background worker thread.
+
+    Batches are numbered as they are submitted and applied strictly in that
+    order, each at most once (a batch whose sequence number has already been
+    applied is skipped). Account state shared with the matching thread must be
+    accessed while holding `lock`.
+    """
+
+    lock: threading.RLock
+    last_applied_seq: int
+
+    _queue: "queue.Queue[Optional[Tuple[int, List[Trade], str]]]"
+    _error: Optional[BaseException]
+
+    def __init__(self, apply_fn: Callable[[List[Trade], str], None]):
+        self.lock = threading.RLock()
+        self.last_applied_seq = 0
+
+        self._apply_fn = apply_fn
+        self._queue = queue.Queue()
+        self._seq = itertools.count(1)
+        self._error = None
+
+        self._worker = threading.Thread(
+            target=self._run, name="settlement-worker", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, trades: List[Trade], instrument: str) -> int:
+        """Queues a batch of fills for settlement and returns its sequence number."""
+        seq = next(self._seq)
+        self._queue.put((seq, trades, instrument))
+        return seq
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Blocks until every submitted batch has been applied."""
+        self._queue.join()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                seq, trades, instrument = item
+                if seq <= self.last_applied_seq:
+                    continue
+
+                with self.lock:
+                    self.last_applied_seq = seq
+                    self._apply_fn(trades, instrument)
+
+            except Exception as e:
+                # Surface the first failure to whoever flushes next
+                if self._error is None:
+                    self._error = e
+
+            finally:
+                self._queue.task_done()
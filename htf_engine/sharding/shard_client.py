@@ -0,0 +1,116 @@
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.context import BaseContext
+from typing import Callable, Deque, Tuple
+
+import threading
+
+from htf_engine.errors.exchange_errors.shard_unavailable_error import (
+    ShardUnavailableError,
+)
+from .shard_reply import ShardReply
+from .shard_worker import run_shard
+
+
+class ShardClient:
+    """
+    Router-side handle on one shard process.
+
+    Commands are pipelined: `send` writes to the pipe and returns a future
+    straight away. A reader thread takes replies in order, hands each to
+    `on_reply` (which settles it), then resolves the command's future.
+
+    If the pipe breaks (the shard process died) the client is marked dead:
+    every pending future fails with ShardUnavailableError and so does any
+    later `send`.
+    """
+
+    _pending: Deque[Tuple[Future, str]]
+
+    def __init__(
+        self,
+        shard_id: int,
+        ctx: BaseContext,
+        on_reply: Callable[[str, ShardReply], None],
+        enable_stp: bool = True,
+    ):
+        self.shard_id = shard_id
+        self._on_reply = on_reply
+
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(  # type: ignore[attr-defined]
+            target=run_shard,
+            args=(child_conn, enable_stp),
+            name=f"shard-{shard_id}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+        self._pending = deque()
+        self._send_lock = threading.Lock()
+        self._dead = False
+
+        self._reader = threading.Thread(
+            target=self._read, name=f"shard-{shard_id}-reader", daemon=True
+        )
+        self._reader.start()
+
+    def send(self, command: tuple) -> Future:
+        future: Future = Future()
+
+        # Pending order must match pipe order, so both happen under one lock
+        with self._send_lock:
+            if self._dead:
+                raise ShardUnavailableError(self.shard_id)
+
+            self._pending.append((future, command[1]))
+            try:
+                self._conn.send(command)
+            except (EOFError, OSError):
+                self._pending.pop()
+                self._dead = True
+                raise ShardUnavailableError(self.shard_id)
+
+        return future
+
+    def close(self) -> None:
+        with self._send_lock:
+            if not self._dead:
+                try:
+                    self._conn.send(None)
+                except (EOFError, OSError):
+                    self._dead = True
+
+        self.process.join()
+        self._reader.join()
+
+    def _fail_pending(self) -> None:
+        with self._send_lock:
+            self._dead = True
+            pending = list(self._pending)
+            self._pending.clear()
+
+        for future, _ in pending:
+            future.set_exception(ShardUnavailableError(self.shard_id))
+
+    def _read(self) -> None:
+        while True:
+            try:
+                reply = self._conn.recv()
+            except (EOFError, OSError):
+                self._fail_pending()
+                return
+
+            future, instrument = self._pending.popleft()
+
+            try:
+                self._on_reply(instrument, reply)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            if reply.error is not None:
+                future.set_exception(reply.error)
+            else:
+                future.set_result(reply.result)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from htf_engine.events.event import Event
+from htf_engine.orders.stop_order import StopOrder
+from htf_engine.trades.trade import Trade
+
+
+@dataclass
+class ShardReply:
+    """Everything one command did inside a shard, sent back to the router."""
+
+    result: Any = None
+    error: Optional[BaseException] = None
+    trades: List[Trade] = field(default_factory=list)
+    # Reservations to give back: (user_id, side, qty) of unfilled / rejected orders
+    released: List[Tuple[str, str, int]] = field(default_factory=list)
+    stops_triggered: List[StopOrder] = field(default_factory=list)
+    last_price: Optional[float] = None
+    # Order lifecycle events in publish order, replayed into the router's
+    # risk engine
+    events: List[Event] = field(default_factory=list)
@@ -0,0 +1,137 @@
+from multiprocessing.connection import Connection
+from typing import Dict, Optional
+
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_accepted_event import OrderAcceptedEvent
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.events.order_rejected_event import OrderRejectedEvent
+from htf_engine.events.stop_triggered_event import StopTriggeredEvent
+from htf_engine.events.trade_event import TradeEvent
+from htf_engine.order_book import OrderBook
+from .shard_reply import ShardReply
+
+
+class ShardWorker:
+    """
+    Owns the order books of one shard and runs router commands against them.
+
+    Book events raised while a command runs are collected into its reply,
+    so the router can settle fills and release reservations centrally.
+    """
+
+    order_books: Dict[str, OrderBook]
+    _reply: Optional[ShardReply]
+
+    def __init__(self, enable_stp: bool = True):
+        self.enable_stp = enable_stp
+        self.order_books = {}
+        self._reply = None
+
+    def handle(self, command: tuple) -> ShardReply:
+        op, instrument, *args = command
+        reply = self._reply = ShardReply()
+
+        try:
+            if op == "add":
+                self._add_book(instrument)
+                return reply
+
+            ob = self.order_books[instrument]
+
+            if op == "place":
+                reply.result = ob.add_order(*args)
+            elif op == "cancel":
+                reply.result = self._cancel(ob, *args)
+            elif op == "modify":
+                reply.result = self._modify(ob, *args)
+            else:
+                raise ValueError(f"Unknown shard command {op!r}")
+
+        except Exception as e:
+            reply.error = e
+
+        finally:
+            self._reply = None
+
+        if reply.trades:
+            reply.last_price = ob.last_price
+
+        return reply
+
+    def _add_book(self, instrument: str) -> None:
+        ob = OrderBook(instrument, enable_stp=self.enable_stp)
+        ob.event_bus.subscribe(EventType.ORDER_ACCEPTED, self._on_order_accepted)
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+        ob.event_bus.subscribe(EventType.ORDER_CANCELLED, self._on_order_cancelled)
+        ob.event_bus.subscribe(EventType.ORDER_REJECTED, self._on_order_rejected)
+        ob.event_bus.subscribe(EventType.STOP_TRIGGERED, self._on_stop_triggered)
+        self.order_books[instrument] = ob
+
+    def _cancel(self, ob: OrderBook, order_id: str) -> Optional[tuple]:
+        """Returns (side, qty) of the cancelled order, or None if not found."""
+        if order_id not in ob.order_map or order_id in ob.cancelled_orders:
+            return None
+
+        order = ob.order_map[order_id]
+        side, qty = order.side, order.qty
+        ob.cancel_order(order_id)
+        return side, qty
+
+    def _modify(
+        self, ob: OrderBook, order_id: str, new_qty: int, new_price: float
+    ) -> tuple:
+        """Returns (new order id, side, qty before the modify)."""
+        if order_id not in ob.order_map:
+            return "False", None, 0
+
+        prev_order = ob.order_map[order_id]
+        side, prev_qty = prev_order.side, prev_order.qty
+        return ob.modify_order(order_id, new_qty, new_price), side, prev_qty
+
+    def _on_order_accepted(self, event: OrderAcceptedEvent) -> None:
+        if self._reply is not None:
+            self._reply.events.append(event)
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        if self._reply is not None:
+            self._reply.trades.append(event.trade)
+            self._reply.events.append(event)
+
+    def _on_order_cancelled(self, event: OrderCancelledEvent) -> None:
+        if self._reply is None:
+            return
+
+        self._reply.events.append(event)
+
+        # User cancels and modifies are accounted for by the router
+        if event.reason == event.REASON_UNFILLED:
+            order = event.order
+            self._reply.released.append((order.user_id, order.side, order.qty))
+
+    def _on_order_rejected(self, event: OrderRejectedEvent) -> None:
+        if self._reply is not None:
+            order = event.order
+            self._reply.released.append((order.user_id, order.side, order.qty))
+            self._reply.events.append(event)
+
+    def _on_stop_triggered(self, event: StopTriggeredEvent) -> None:
+        if self._reply is not None:
+            self._reply.stops_triggered.append(event.order)
+            self._reply.events.append(event)
+
+
+def run_shard(conn: Connection, enable_stp: bool = True) -> None:
+    """Process entry point: serve commands from the router until told to stop."""
+    worker = ShardWorker(enable_stp)
+
+    while True:
+        try:
+            command = conn.recv()
+        except EOFError:
+            return
+
+        if command is None:
+            conn.close()
+            return
+
+        conn.send(worker.handle(command))
@@ -0,0 +1,327 @@
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+import multiprocessing
+import threading
+
+from htf_engine.errors.exchange_errors.instrument_not_found_error import (
+    InstrumentNotFoundError,
+)
+from htf_engine.errors.exchange_errors.shard_unavailable_error import (
+    ShardUnavailableError,
+)
+from htf_engine.errors.exchange_errors.user_not_found_error import UserNotFoundError
+from htf_engine.events.event_bus import EventBus
+from htf_engine.risk.pre_trade_risk_engine import PreTradeRiskEngine
+from htf_engine.risk.risk_limits import RiskLimits
+from htf_engine.trades.trade import Trade
+from htf_engine.user.user import User
+from .shard_client import ShardClient
+from .shard_reply import ShardReply
+
+
+class ShardedExchange:
+    """
+    Exchange whose order books are partitioned across worker processes.
+
+    Each shard process owns the books of the instruments assigned to it and
+    matches them independently, so instruments on different shards trade in
+    parallel. Users, reservations and settlement stay in this (router)
+    process: a user's order reserves its quantity here under `lock` before
+    being forwarded, and every fill or released order a shard reports is
+    applied here under the same lock, so account state and position limits
+    are consistent across shards.
+
+    Pre-trade risk is centralised the same way: orders are checked against
+    `risk_engine` here before being forwarded, and the book events each
+    reply carries are replayed into it. Counters only move when a reply
+    arrives, so orders still in flight to a shard (see place_order_async)
+    are not yet counted against open-order or buying-power limits.
+
+    The trading API matches Exchange (place/cancel/modify, plus *_async
+    variants returning futures) and users call it through the usual
+    callbacks.
+    """
+
+    users: Dict[str, User]
+    shards: List[ShardClient]
+    shard_of: Dict[str, ShardClient]  # instrument -> owning shard
+    risk_engine: PreTradeRiskEngine
+    last_prices: Dict[str, float]
+    fee: float
+    balance: float
+
+    def __init__(
+        self,
+        n_shards: int = 2,
+        fee: float = 0,
+        enable_stp: bool = True,
+        mp_context: str = "spawn",
+        risk_limits: Optional[RiskLimits] = None,
+    ):
+        self.users = {}
+        self.shard_of = {}
+        self.last_prices = {}
+        self.fee = fee
+        self.balance = 0
+
+        self.lock = threading.RLock()
+
+        # Book events reported by the shards, replayed under `lock`
+        self.event_bus = EventBus()
+        self.risk_engine = PreTradeRiskEngine(risk_limits)
+        self.risk_engine.subscribe(self.event_bus)
+
+        ctx = multiprocessing.get_context(mp_context)
+        self.shards = [
+            ShardClient(i, ctx, self._apply_reply, enable_stp) for i in range(n_shards)
+        ]
+        self._load = [0] * n_shards
+
+    def register_user(self, user: User, permission_level=1) -> bool:
+        if user.user_id in self.users:
+            print(f"User {user.user_id} is already registered in exchange!")
+            return False
+
+        self.users[user.user_id] = user
+        user.account_lock = self.lock
+        user.register(permission_level)
+        user.place_order_callback = self.place_order
+        user.pre_trade_check_callback = self.pre_trade_check
+        user.cancel_order_callback = self.cancel_order
+        user.modify_order_callback = self.modify_order
+        return True
+
+    def add_order_book(self, instrument: str) -> int:
+        """Creates the book on the least-loaded shard and returns that shard's id."""
+        if instrument in self.shard_of:
+            return self.shard_of[instrument].shard_id
+
+        shard_id = self._load.index(min(self._load))
+        self._load[shard_id] += 1
+
+        shard = self.shards[shard_id]
+        self.shard_of[instrument] = shard
+        shard.send(("add", instrument)).result()
+        return shard_id
+
+    # Risk
+
+    def pre_trade_check(
+        self,
+        user_id: str,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+    ) -> None:
+        """Raises a RejectedOrderError if the order breaches the risk limits."""
+        with self.lock:
+            self.risk_engine.check(
+                self.users[user_id],
+                instrument,
+                side,
+                qty,
+                price,
+                self.last_prices.get(instrument),
+                is_stop=order_type.startswith("stop"),
+            )
+
+    def set_risk_limits(
+        self,
+        limits: RiskLimits,
+        user_id: Optional[str] = None,
+        inst: Optional[str] = None,
+    ) -> None:
+        """Sets the exchange default, or an override for a user, instrument or both."""
+        if user_id is not None and user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if inst is not None and inst not in self.shard_of:
+            raise InstrumentNotFoundError(inst)
+
+        with self.lock:
+            self.risk_engine.set_limits(limits, user_id, inst)
+
+    # Trading
+
+    def place_order_async(
+        self,
+        user_id: str,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> Future:
+        self._check(user_id, instrument)
+        command = (
+            "place",
+            instrument,
+            order_type,
+            side,
+            qty,
+            price,
+            user_id,
+            stop_price,
+        )
+
+        try:
+            future = self.shard_of[instrument].send(command)
+        except ShardUnavailableError:
+            with self.lock:
+                self._release(user_id, instrument, side, qty)
+            raise
+
+        # A dead shard never reports the order's release, so do it here
+        def release_if_lost(f: Future) -> None:
+            if isinstance(f.exception(), ShardUnavailableError):
+                with self.lock:
+                    self._release(user_id, instrument, side, qty)
+
+        future.add_done_callback(release_if_lost)
+        return future
+
+    def place_order(self, *args: Any, **kwargs: Any) -> str:
+        return self.place_order_async(*args, **kwargs).result()
+
+    def cancel_order(self, user_id: str, instrument: str, order_id: str) -> bool:
+        self._check(user_id, instrument)
+        cancelled = (
+            self.shard_of[instrument].send(("cancel", instrument, order_id)).result()
+        )
+
+        if cancelled is None:
+            print("Order not found in order book!")
+            return False
+
+        side, qty = cancelled
+        self._release(user_id, instrument, side, qty)
+        return True
+
+    def modify_order(
+        self,
+        user_id: str,
+        instrument: str,
+        order_id: str,
+        new_qty: int,
+        new_price: float,
+    ) -> str:
+        self._check(user_id, instrument)
+        new_order_id, side, prev_qty = (
+            self.shard_of[instrument]
+            .send(("modify", instrument, order_id, new_qty, new_price))
+            .result()
+        )
+
+        if side is None:
+            print("Order not found in order book!")
+            return new_order_id
+
+        if new_order_id == order_id:
+            with self.lock:
+                self.risk_engine.resize_order(order_id, new_qty)
+
+        # Same outstanding adjustment as Exchange.modify_order
+        qty_change = new_qty - prev_qty
+        user = self.users[user_id]
+        if side == "buy":
+            if qty_change > 0:
+                user.increase_outstanding_buys(instrument, qty_change)
+            if qty_change < 0:
+                user.reduce_outstanding_buys(instrument, -qty_change)
+        else:
+            if qty_change > 0:
+                user.increase_outstanding_sells(instrument, qty_change)
+            if qty_change < 0:
+                user.reduce_outstanding_sells(instrument, -qty_change)
+
+        return new_order_id
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self) -> "ShardedExchange":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # Settlement (runs on each shard's reader thread)
+
+    def _apply_reply(self, instrument: str, reply: ShardReply) -> None:
+        with self.lock:
+            for event in reply.events:
+                self.event_bus.publish(event)
+
+            for user_id, side, qty in reply.released:
+                self._release(user_id, instrument, side, qty)
+
+            if reply.trades:
+                self._settle_trades(reply.trades, instrument)
+                self.risk_engine.settle_trades(reply.trades)
+
+            if reply.last_price is not None:
+                self.last_prices[instrument] = reply.last_price
+
+            for order in reply.stops_triggered:
+                user = self.users.get(order.user_id)
+                if user is not None:
+                    user.log_stops_trigger(order, instrument)
+
+    def _settle_trades(self, trades: List[Trade], instrument: str) -> None:
+        fills_by_user: Dict[str, List[tuple]] = {}
+
+        for trade in trades:
+            fills_by_user.setdefault(trade.buy_user_id, []).append(
+                ("buy", trade.price, trade.qty)
+            )
+            fills_by_user.setdefault(trade.sell_user_id, []).append(
+                ("sell", trade.price, trade.qty)
+            )
+
+        for user_id, fills in fills_by_user.items():
+            user = self.users.get(user_id)
+            if user:
+                user.settle_fills(instrument, fills, self.fee)
+                self.balance += self.fee * len(fills)
+
+    def _release(self, user_id: str, instrument: str, side: str, qty: int) -> None:
+        user = self.users.get(user_id)
+        if user is None:
+            return
+
+        if side == "buy":
+            user.reduce_outstanding_buys(instrument, qty)
+        else:
+            user.reduce_outstanding_sells(instrument, qty)
+
+    def _check(self, user_id: str, instrument: str) -> None:
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        if instrument not in self.shard_of:
+            raise InstrumentNotFoundError(instrument)
+
+    # GET Operations
+
+    def get_user_positions(self, user_id: str) -> dict:
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        return self.users[user_id].get_positions()
+
+    def get_user_cash_balance(self, user_id: str) -> float:
+        if user_id not in self.users:
+            raise UserNotFoundError(user_id)
+
+        return self.users[user_id].get_cash_balance()
+
+    def get_last_price(self, inst: str) -> Optional[float]:
+        if inst not in self.shard_of:
+            raise InstrumentNotFoundError(inst)
+
+        return self.last_prices.get(inst)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class OrderCommand:
+    """
+    One message of a generated order flow.
+
+    Order ids are assigned by the engine, so cancels and modifies refer to
+    the order they target by the `seq` of the command that placed it (`ref`).
+    """
+
+    PLACE: ClassVar[str] = "place"
+    CANCEL: ClassVar[str] = "cancel"
+    MODIFY: ClassVar[str] = "modify"
+
+    seq: int
+    timestamp: float  # seconds since the start of the flow
+    action: str
+    user_id: str
+    instrument: str
+    order_type: Optional[str] = None
+    side: Optional[str] = None
+    qty: int = 0
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+    ref: Optional[int] = None
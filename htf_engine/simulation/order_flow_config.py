@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class OrderFlowConfig:
+    """Parameters of a synthetic order flow; the same config and seed give the same flow."""
+
+    seed: int = 0
+    instruments: Tuple[str, ...] = ("AAPL", "MSFT", "NVDA")
+    start_price: float = 100.0
+    tick_size: float = 0.01
+    volatility_ticks: float = 0.5  # std dev of the mid's move per message, in ticks
+    n_users: int = 100
+
+    # Arrivals are Poisson: exponential gaps with this mean rate (msgs / s)
+    arrival_rate: float = 50_000.0
+
+    # Sizes follow a Pareto law: min_size * paretovariate(size_alpha), capped
+    min_size: int = 1
+    size_alpha: float = 1.5
+    max_size: int = 10_000
+
+    # Prices sit a geometric number of ticks from the touch: most orders are
+    # at or next to it, a few are far out
+    touch_ticks_p: float = 0.35
+    half_spread_ticks: int = 1
+
+    cancel_ratio: float = 0.45  # fraction of messages that are cancels
+    modify_ratio: float = 0.05  # fraction of messages that are modifies
+    max_live_orders: int = 100_000  # cancel / modify candidates remembered
+
+    order_type_mix: Dict[str, float] = field(
+        default_factory=lambda: {
+            "limit": 0.70,
+            "post-only": 0.08,
+            "ioc": 0.08,
+            "market": 0.05,
+            "fok": 0.03,
+            "stop-limit": 0.03,
+            "stop-market": 0.03,
+        }
+    )
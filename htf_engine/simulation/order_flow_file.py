@@ -0,0 +1,78 @@
+"""
+Streaming file format for generated order flow.
+
+One tab-separated command per line after a header line; empty fields are
+None. Paths ending in .gz are gzip-compressed. Reading and writing never
+hold more than one command in memory.
+"""
+
+from typing import IO, Iterable, Iterator, Optional, cast
+
+import gzip
+
+from .order_command import OrderCommand
+
+HEADER = "#htf-order-flow v1"
+
+
+def write_order_flow(path: str, commands: Iterable[OrderCommand]) -> int:
+    """Writes commands to path and returns how many were written."""
+    n = 0
+    with _open(path, "w") as f:
+        f.write(HEADER + "\n")
+        for c in commands:
+            f.write(
+                f"{c.seq}\t{c.timestamp!r}\t{c.action}\t{c.user_id}\t{c.instrument}\t"
+                f"{_str(c.order_type)}\t{_str(c.side)}\t{c.qty}\t{_str(c.price)}\t"
+                f"{_str(c.stop_price)}\t{_str(c.ref)}\n"
+            )
+            n += 1
+    return n
+
+
+def read_order_flow(path: str) -> Iterator[OrderCommand]:
+    with _open(path, "r") as f:
+        header = f.readline().rstrip("\n")
+        if header != HEADER:
+            raise ValueError(f"{path} is not an order flow file (header {header!r})")
+
+        for line in f:
+            (
+                seq,
+                timestamp,
+                action,
+                user_id,
+                instrument,
+                order_type,
+                side,
+                qty,
+                price,
+                stop_price,
+                ref,
+            ) = line.rstrip("\n").split("\t")
+
+            yield OrderCommand(
+                int(seq),
+                float(timestamp),
+                action,
+                user_id,
+                instrument,
+                order_type or None,
+                side or None,
+                int(qty),
+                float(price) if price else None,
+                float(stop_price) if stop_price else None,
+                int(ref) if ref else None,
+            )
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return cast(IO[str], gzip.open(path, mode + "t", encoding="utf-8"))
+    return open(path, mode, encoding="utf-8")
+
+
+def _str(value: Optional[object]) -> str:
+    return (
+        "" if value is None else repr(value) if isinstance(value, float) else str(value)
+    )
@@ -0,0 +1,204 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import itertools
+import math
+import random
+
+from .order_command import OrderCommand
+from .order_flow_config import OrderFlowConfig
+
+# (ref, user_id, instrument, side, qty, price) of an order that may still rest
+LiveOrder = Tuple[int, str, str, str, int, float]
+
+ORDER_TYPES = frozenset(
+    {"limit", "market", "ioc", "fok", "post-only", "stop-limit", "stop-market"}
+)
+# Orders later cancelled / modified; stops are left to trigger (or not)
+RESTING_TYPES = frozenset({"limit", "post-only"})
+
+
+class OrderFlowGenerator:
+    """
+    Seeded, lazy generator of realistic order flow.
+
+    Iterating yields OrderCommands one at a time, so a flow of any length
+    is produced in constant memory: the only state is each instrument's
+    mid price and a bounded pool of orders to cancel or modify. The model
+    does not see fills, so some cancels target orders that have already
+    traded, as they do in a real market.
+    """
+
+    config: OrderFlowConfig
+
+    _mids: Dict[str, float]
+    _live: List[LiveOrder]
+
+    def __init__(self, config: Optional[OrderFlowConfig] = None):
+        self.config = config if config is not None else OrderFlowConfig()
+        self._check_config()
+
+        self._rng = random.Random(self.config.seed)
+        self._mids = {inst: self.config.start_price for inst in self.config.instruments}
+        self._live = []
+        self._users = [f"sim{i}" for i in range(self.config.n_users)]
+
+        mix = self.config.order_type_mix
+        self._order_types = list(mix)
+        self._order_type_cum = list(
+            itertools.accumulate(mix[t] for t in self._order_types)
+        )
+
+    def __iter__(self) -> Iterator[OrderCommand]:
+        return self.generate()
+
+    def generate(self, n: Optional[int] = None) -> Iterator[OrderCommand]:
+        """Yields n commands (or an endless stream if n is None)."""
+        cfg = self.config
+        rng = self._rng
+        timestamp = 0.0
+
+        for seq in itertools.count() if n is None else range(n):
+            timestamp += rng.expovariate(cfg.arrival_rate)
+            instrument = rng.choice(cfg.instruments)
+            self._move_mid(instrument)
+
+            u = rng.random()
+            if self._live and u < cfg.cancel_ratio:
+                yield self._cancel(seq, timestamp)
+            elif self._live and u < cfg.cancel_ratio + cfg.modify_ratio:
+                yield self._modify(seq, timestamp)
+            else:
+                yield self._place(seq, timestamp, instrument)
+
+    def _place(self, seq: int, timestamp: float, instrument: str) -> OrderCommand:
+        cfg = self.config
+        rng = self._rng
+
+        order_type = rng.choices(self._order_types, cum_weights=self._order_type_cum)[0]
+        side = "buy" if rng.random() < 0.5 else "sell"
+        user_id = rng.choice(self._users)
+        qty = self._size()
+        mid = self._mids[instrument]
+        sign = 1 if side == "buy" else -1
+
+        price: Optional[float] = None
+        stop_price: Optional[float] = None
+
+        if order_type in ("limit", "post-only"):
+            # Passive: at or behind the touch on the order's own side
+            price = (
+                mid
+                - sign
+                * (cfg.half_spread_ticks + self._ticks_from_touch())
+                * cfg.tick_size
+            )
+
+        elif order_type in ("ioc", "fok"):
+            # Aggressive: crosses the spread by a few ticks
+            price = (
+                mid
+                + sign
+                * (cfg.half_spread_ticks + self._ticks_from_touch())
+                * cfg.tick_size
+            )
+
+        elif order_type in ("stop-limit", "stop-market"):
+            stop_price = mid + sign * (1 + self._ticks_from_touch()) * cfg.tick_size
+            if order_type == "stop-limit":
+                price = stop_price + sign * self._ticks_from_touch() * cfg.tick_size
+
+        command = OrderCommand(
+            seq,
+            timestamp,
+            OrderCommand.PLACE,
+            user_id,
+            instrument,
+            order_type,
+            side,
+            qty,
+            self._round(price),
+            self._round(stop_price),
+        )
+
+        if order_type in RESTING_TYPES:
+            self._remember((seq, user_id, instrument, side, qty, command.price or mid))
+
+        return command
+
+    def _cancel(self, seq: int, timestamp: float) -> OrderCommand:
+        live = self._live
+        index = self._rng.randrange(len(live))
+
+        # Swap-remove keeps removal O(1)
+        ref, user_id, instrument, _, _, _ = live[index]
+        live[index] = live[-1]
+        live.pop()
+
+        return OrderCommand(
+            seq, timestamp, OrderCommand.CANCEL, user_id, instrument, ref=ref
+        )
+
+    def _modify(self, seq: int, timestamp: float) -> OrderCommand:
+        cfg = self.config
+        rng = self._rng
+        live = self._live
+        index = rng.randrange(len(live))
+        ref, user_id, instrument, side, qty, price = live[index]
+
+        new_qty = max(1, qty + rng.choice((-1, 1)) * rng.randint(0, qty))
+        new_price = price + rng.choice((-1, 0, 1)) * cfg.tick_size
+        live[index] = (ref, user_id, instrument, side, new_qty, new_price)
+
+        return OrderCommand(
+            seq,
+            timestamp,
+            OrderCommand.MODIFY,
+            user_id,
+            instrument,
+            qty=new_qty,
+            price=self._round(new_price),
+            ref=ref,
+        )
+
+    def _remember(self, order: LiveOrder) -> None:
+        live = self._live
+        if len(live) < self.config.max_live_orders:
+            live.append(order)
+        else:
+            # Forget a random older order; it stays on the book untouched
+            live[self._rng.randrange(len(live))] = order
+
+    def _move_mid(self, instrument: str) -> None:
+        cfg = self.config
+        move = self._rng.gauss(0.0, cfg.volatility_ticks) * cfg.tick_size
+        self._mids[instrument] = max(cfg.tick_size * 10, self._mids[instrument] + move)
+
+    def _ticks_from_touch(self) -> int:
+        # Geometric on {0, 1, 2, ...} with success probability touch_ticks_p
+        u = 1.0 - self._rng.random()
+        return int(math.log(u) / math.log(1.0 - self.config.touch_ticks_p))
+
+    def _size(self) -> int:
+        cfg = self.config
+        size = int(cfg.min_size * self._rng.paretovariate(cfg.size_alpha))
+        return min(size, cfg.max_size)
+
+    def _round(self, price: Optional[float]) -> Optional[float]:
+        if price is None:
+            return None
+        tick = self.config.tick_size
+        return round(round(price / tick) * tick, 10)
+
+    def _check_config(self) -> None:
+        cfg = self.config
+        unknown = set(cfg.order_type_mix) - ORDER_TYPES
+        if unknown:
+            raise ValueError(
+                f"Unknown order types in order_type_mix: {sorted(unknown)}"
+            )
+        if cfg.cancel_ratio + cfg.modify_ratio >= 1:
+            raise ValueError(
+                "cancel_ratio + modify_ratio must leave room for new orders"
+            )
+        if not 0 < cfg.touch_ticks_p < 1:
+            raise ValueError("touch_ticks_p must be in (0, 1)")
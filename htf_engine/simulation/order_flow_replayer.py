@@ -0,0 +1,137 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional, Union
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.user.user import User
+from .order_command import OrderCommand
+
+
+class OrderFlowReplayer:
+    """
+    Feeds OrderCommands into an Exchange or straight into one OrderBook.
+
+    Against an Exchange, new orders go through User.place_order (so quota
+    and risk checks apply) and unknown users are registered on first use.
+    Against an OrderBook, commands for other instruments are skipped. Engine
+    order ids are tracked per placing command so later cancels and modifies
+    can find them; the oldest are forgotten beyond `max_tracked`.
+    """
+
+    target: Union[Exchange, OrderBook]
+    stats: Counter
+
+    _order_ids: Dict[int, str]  # seq of the placing command -> engine order id
+
+    def __init__(
+        self,
+        target: Union[Exchange, OrderBook],
+        cash: float = 1e12,
+        position_limit: int = 10**12,
+        max_tracked: int = 1_000_000,
+    ):
+        self.target = target
+        self.cash = cash
+        self.position_limit = position_limit
+        self.max_tracked = max_tracked
+        self.stats = Counter()
+
+        self._order_ids = {}
+
+    def run(self, commands: Iterable[OrderCommand], n: Optional[int] = None) -> Counter:
+        """Applies commands (at most n of them) and returns the outcome counters."""
+        for i, command in enumerate(commands):
+            if n is not None and i >= n:
+                break
+            self.apply(command)
+
+        return self.stats
+
+    def apply(self, command: OrderCommand) -> None:
+        if (
+            isinstance(self.target, OrderBook)
+            and command.instrument != self.target.instrument
+        ):
+            self.stats["skipped"] += 1
+            return
+
+        try:
+            if command.action == OrderCommand.PLACE:
+                self._place(command)
+            elif command.action == OrderCommand.CANCEL:
+                self._cancel(command)
+            elif command.action == OrderCommand.MODIFY:
+                self._modify(command)
+            else:
+                raise ValueError(f"Unknown action {command.action!r}")
+
+        except ExchangeError as e:
+            self.stats[f"{command.action}_rejected"] += 1
+            self.stats[e.error_code] += 1
+
+    def _place(self, c: OrderCommand) -> None:
+        assert c.order_type is not None and c.side is not None
+
+        if isinstance(self.target, Exchange):
+            order_id = self._user(c.user_id).place_order(
+                c.instrument, c.order_type, c.side, c.qty, c.price, c.stop_price
+            )
+        else:
+            order_id = self.target.add_order(
+                c.order_type, c.side, c.qty, c.price, c.user_id, c.stop_price
+            )
+
+        self._track(c.seq, order_id)
+        self.stats["placed"] += 1
+
+    def _cancel(self, c: OrderCommand) -> None:
+        order_id = self._order_ids.pop(c.ref, None) if c.ref is not None else None
+
+        if order_id is None:
+            cancelled = False
+        elif isinstance(self.target, Exchange):
+            cancelled = self.target.cancel_order(c.user_id, c.instrument, order_id)
+        else:
+            cancelled = self.target.cancel_order(order_id)
+
+        self.stats["cancelled" if cancelled else "cancel_missed"] += 1
+
+    def _modify(self, c: OrderCommand) -> None:
+        order_id = self._order_ids.get(c.ref) if c.ref is not None else None
+        assert c.price is not None
+
+        if order_id is None:
+            new_order_id = "False"
+        elif isinstance(self.target, Exchange):
+            new_order_id = self.target.modify_order(
+                c.user_id, c.instrument, order_id, c.qty, c.price
+            )
+        else:
+            new_order_id = self.target.modify_order(order_id, c.qty, c.price)
+
+        if new_order_id == "False":
+            self.stats["modify_missed"] += 1
+            return
+
+        # Replacements keep answering to the original placing command
+        if c.ref is not None:
+            self._order_ids[c.ref] = new_order_id
+        self.stats["modified"] += 1
+
+    def _track(self, seq: int, order_id: str) -> None:
+        order_ids = self._order_ids
+        order_ids[seq] = order_id
+
+        if len(order_ids) > self.max_tracked:
+            del order_ids[next(iter(order_ids))]
+
+    def _user(self, user_id: str) -> User:
+        assert isinstance(self.target, Exchange)
+        user = self.target.users.get(user_id)
+
+        if user is None:
+            user = User(user_id, user_id, self.cash, position_limit=self.position_limit)
+            self.target.register_user(user)
+
+        return user
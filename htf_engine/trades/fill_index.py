@@ -0,0 +1,78 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from htf_engine.events.event_type import EventType
+from htf_engine.events.trade_event import TradeEvent
+from .trade import Trade
+
+if TYPE_CHECKING:
+    from htf_engine.order_book import OrderBook
+
+
+Fill = Tuple[Trade, str]  # (trade, instrument)
+
+
+def _fill_time(fill: Fill) -> datetime:
+    return fill[0].timestamp
+
+
+class FillIndex:
+    """
+    Per-user and per-(user, instrument) indices of fills.
+
+    Entries reference the Trade objects already held by each book's TradeLog.
+    Trades are matched one at a time, so each list is in timestamp order and
+    a time-range page costs O(log n + page size).
+    """
+
+    _by_user: Dict[str, List[Fill]]
+    _by_user_inst: Dict[Tuple[str, str], List[Fill]]
+
+    def __init__(self):
+        self._by_user = {}
+        self._by_user_inst = {}
+
+    def attach(self, ob: "OrderBook") -> None:
+        ob.event_bus.subscribe(EventType.TRADE, self._on_trade)
+
+    def _on_trade(self, event: TradeEvent) -> None:
+        self.add(event.trade, event.instrument)
+
+    def add(self, trade: Trade, instrument: str) -> None:
+        fill = (trade, instrument)
+        self._index(trade.buy_user_id, instrument, fill)
+
+        # A self-trade is indexed once
+        if trade.sell_user_id != trade.buy_user_id:
+            self._index(trade.sell_user_id, instrument, fill)
+
+    def _index(self, user_id: str, instrument: str, fill: Fill) -> None:
+        self._by_user.setdefault(user_id, []).append(fill)
+        self._by_user_inst.setdefault((user_id, instrument), []).append(fill)
+
+    def count(self, user_id: str, instrument: Optional[str] = None) -> int:
+        return len(self._fills(user_id, instrument))
+
+    def query(
+        self,
+        user_id: str,
+        instrument: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Fill]:
+        """Fills with start <= timestamp < end, oldest first, paginated."""
+        fills = self._fills(user_id, instrument)
+
+        lo = bisect_left(fills, start, key=_fill_time) if start is not None else 0
+        hi = bisect_left(fills, end, key=_fill_time) if end is not None else len(fills)
+
+        lo = min(lo + offset, hi)
+        return fills[lo : min(lo + limit, hi)]
+
+    def _fills(self, user_id: str, instrument: Optional[str]) -> List[Fill]:
+        if instrument is None:
+            return self._by_user.get(user_id, [])
+        return self._by_user_inst.get((user_id, instrument), [])
@@ -39,6 +39,13 @@ class TradeLog:
         self._trades.append(trade)
         return trade
 
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def trades_since(self, index: int) -> list[Trade]:
+        """Trades recorded after the log had `index` entries."""
+        return self._trades[index:]
+
     def retrieve_log(self) -> tuple[Trade, ...]:
         return tuple(self._trades)  # defensive copy
 
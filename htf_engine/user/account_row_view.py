@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Any, Iterator, MutableMapping
+
+if TYPE_CHECKING:
+    from htf_engine.user.account_table import AccountTable
+
+
+class AccountRowView(MutableMapping[str, Any]):
+    """
+    dict-like view of one user's row of an AccountTable field, keyed by instrument.
+
+    An instrument is present while its cell in `presence_field` is non-zero.
+    With `default_zero`, missing instruments read as 0 (defaultdict(int)
+    semantics, used for outstanding quantities).
+    """
+
+    def __init__(
+        self,
+        table: "AccountTable",
+        row: int,
+        field: str,
+        presence_field: str,
+        default_zero: bool = False,
+    ):
+        self._table = table
+        self._row = row
+        self._field = field
+        self._presence_field = presence_field
+        self._default_zero = default_zero
+
+    def __getitem__(self, instrument: str) -> Any:
+        col = self._table.instrument_index.get(instrument)
+
+        if col is None or not self._table.field(self._presence_field)[self._row, col]:
+            if self._default_zero:
+                return 0
+            raise KeyError(instrument)
+
+        return self._table.field(self._field)[self._row, col].item()
+
+    def __setitem__(self, instrument: str, value: Any) -> None:
+        col = self._table.add_instrument(instrument)
+        self._table.field(self._field)[self._row, col] = value
+
+    def __delitem__(self, instrument: str) -> None:
+        col = self._table.instrument_index.get(instrument)
+
+        if col is None:
+            raise KeyError(instrument)
+
+        # A zero outstanding quantity is "present" for defaultdict callers that
+        # decrement to 0 and then pop.
+        present = self._table.field(self._presence_field)[self._row, col]
+        if not present and not self._default_zero:
+            raise KeyError(instrument)
+
+        self._table.field(self._field)[self._row, col] = 0
+
+    def __contains__(self, instrument: object) -> bool:
+        if not isinstance(instrument, str):
+            return False
+        col = self._table.instrument_index.get(instrument)
+        return col is not None and bool(
+            self._table.field(self._presence_field)[self._row, col]
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        instruments = self._table.instruments
+        present = self._table.field(self._presence_field)[self._row].nonzero()[0]
+        return iter([instruments[col] for col in present])
+
+    def __len__(self) -> int:
+        return len(self._table.field(self._presence_field)[self._row].nonzero()[0])
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
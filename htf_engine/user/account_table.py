@@ -0,0 +1,209 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping
+
+from htf_engine.user.account_row_view import AccountRowView
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+if TYPE_CHECKING:
+    from htf_engine.user.user import User
+
+
+class AccountTable:
+    """
+    Array-backed store of every user's per-instrument account state.
+
+    Positions, average costs and outstanding buys/sells live in
+    users x instruments NumPy matrices. Attached users read and write them
+    through AccountRowView mappings, so single-account updates keep their
+    dict-like API while exchange-wide PnL, exposure, margin and statements
+    are computed with vectorised operations.
+
+    Requires numpy.
+    """
+
+    FIELDS = ("position", "average_cost", "outstanding_buys", "outstanding_sells")
+
+    instruments: List[str]
+    instrument_index: Dict[str, int]
+    user_ids: List[str]
+    user_index: Dict[str, int]
+
+    def __init__(self, instruments: Iterable[str] = (), capacity: int = 1024):
+        if not HAS_NUMPY:
+            raise ImportError("AccountTable requires numpy (pip install numpy)")
+
+        self.instruments = []
+        self.instrument_index = {}
+        self.user_ids = []
+        self.user_index = {}
+
+        self._arrays: Dict[str, Any] = {
+            "position": np.zeros((capacity, 0), dtype=np.int64),
+            "average_cost": np.zeros((capacity, 0), dtype=np.float64),
+            "outstanding_buys": np.zeros((capacity, 0), dtype=np.int64),
+            "outstanding_sells": np.zeros((capacity, 0), dtype=np.int64),
+        }
+
+        for instrument in instruments:
+            self.add_instrument(instrument)
+
+    def field(self, name: str):
+        return self._arrays[name]
+
+    def add_instrument(self, instrument: str) -> int:
+        """Returns the column of instrument, adding one if needed."""
+        col = self.instrument_index.get(instrument)
+        if col is not None:
+            return col
+
+        col = len(self.instruments)
+        self.instruments.append(instrument)
+        self.instrument_index[instrument] = col
+
+        for name, array in self._arrays.items():
+            if col >= array.shape[1]:
+                grown = np.zeros(
+                    (array.shape[0], max(4, 2 * array.shape[1])), dtype=array.dtype
+                )
+                grown[:, : array.shape[1]] = array
+                self._arrays[name] = grown
+
+        return col
+
+    def attach(self, user: "User") -> None:
+        """Moves a user's account state into the table and points the user at it."""
+        if user.user_id in self.user_index:
+            return
+
+        row = len(self.user_ids)
+        self.user_ids.append(user.user_id)
+        self.user_index[user.user_id] = row
+
+        for name, array in self._arrays.items():
+            if row >= array.shape[0]:
+                grown = np.zeros(
+                    (2 * array.shape[0], array.shape[1]), dtype=array.dtype
+                )
+                grown[: array.shape[0]] = array
+                self._arrays[name] = grown
+
+        positions = AccountRowView(self, row, "position", "position")
+        average_cost = AccountRowView(self, row, "average_cost", "position")
+        outstanding_buys = AccountRowView(
+            self, row, "outstanding_buys", "outstanding_buys", default_zero=True
+        )
+        outstanding_sells = AccountRowView(
+            self, row, "outstanding_sells", "outstanding_sells", default_zero=True
+        )
+
+        with user.account_lock:
+            for inst, qty in user.positions.items():
+                positions[inst] = qty
+                average_cost[inst] = user.average_cost[inst]
+            for inst, qty in user.outstanding_buys.items():
+                outstanding_buys[inst] = qty
+            for inst, qty in user.outstanding_sells.items():
+                outstanding_sells[inst] = qty
+
+            user.positions = positions
+            user.average_cost = average_cost
+            user.outstanding_buys = outstanding_buys
+            user.outstanding_sells = outstanding_sells
+
+    def _views(self):
+        n_users = len(self.user_ids)
+        n_inst = len(self.instruments)
+        return (
+            self._arrays["position"][:n_users, :n_inst],
+            self._arrays["average_cost"][:n_users, :n_inst],
+        )
+
+    def _marks(self, marks: Mapping[str, float]):
+        """Mark vector aligned with the columns; NaN where there is no mark."""
+        return np.array(
+            [marks.get(inst, np.nan) for inst in self.instruments], dtype=np.float64
+        )
+
+    def unrealised_pnl_matrix(self, marks: Mapping[str, float]):
+        """users x instruments unrealised PnL (0 where there is no mark)."""
+        position, average_cost = self._views()
+        pnl = position * (self._marks(marks) - average_cost)
+        return np.nan_to_num(pnl, nan=0.0)
+
+    def exposure_matrix(self, marks: Mapping[str, float]):
+        """users x instruments gross exposure (0 where there is no mark)."""
+        position, _ = self._views()
+        return np.nan_to_num(np.abs(position) * self._marks(marks), nan=0.0)
+
+    def unrealised_pnl(self, marks: Mapping[str, float]) -> Dict[str, float]:
+        totals = self.unrealised_pnl_matrix(marks).sum(axis=1)
+        return dict(zip(self.user_ids, totals.tolist()))
+
+    def exposure(self, marks: Mapping[str, float]) -> Dict[str, float]:
+        totals = self.exposure_matrix(marks).sum(axis=1)
+        return dict(zip(self.user_ids, totals.tolist()))
+
+    def margin_requirement(
+        self, marks: Mapping[str, float], margin_rate: float
+    ) -> Dict[str, float]:
+        totals = self.exposure_matrix(marks).sum(axis=1) * margin_rate
+        return dict(zip(self.user_ids, totals.tolist()))
+
+    def net_positions(self) -> Dict[str, int]:
+        """Exchange-wide net position per instrument (should be 0 when all fills settled)."""
+        position, _ = self._views()
+        return dict(zip(self.instruments, position.sum(axis=0).tolist()))
+
+    def end_of_day_statements(
+        self, marks: Mapping[str, float], users: Mapping[str, "User"]
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns:
+        [
+            {
+                "user_id": str,
+                "cash_balance": float,
+                "realised_pnl": float,
+                "unrealised_pnl": float,
+                "exposure": float,
+                "equity": float,
+                "positions": {instrument: {"quantity": int, "average_cost": float}}
+            },
+            ...
+        ]
+        """
+        position, average_cost = self._views()
+        pnl = self.unrealised_pnl_matrix(marks).sum(axis=1).tolist()
+        exposure = self.exposure_matrix(marks).sum(axis=1).tolist()
+
+        rows, cols = position.nonzero()
+        held: List[Dict[str, Dict[str, Any]]] = [{} for _ in self.user_ids]
+        for row, col, qty, avg in zip(
+            rows.tolist(),
+            cols.tolist(),
+            position[rows, cols].tolist(),
+            average_cost[rows, cols].tolist(),
+        ):
+            held[row][self.instruments[col]] = {"quantity": qty, "average_cost": avg}
+
+        statements = []
+        for row, user_id in enumerate(self.user_ids):
+            user = users[user_id]
+            statements.append(
+                {
+                    "user_id": user_id,
+                    "cash_balance": user.cash_balance,
+                    "realised_pnl": user.realised_pnl,
+                    "unrealised_pnl": pnl[row],
+                    "exposure": exposure[row],
+                    "equity": user.cash_balance + pnl[row],
+                    "positions": held[row],
+                }
+            )
+
+        return statements
@@ -1,14 +1,28 @@
 from collections import defaultdict
-from typing import Any, Callable, Dict, Optional
+from contextlib import AbstractContextManager, nullcontext
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
 
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
 from htf_engine.errors.exchange_errors.user_not_found_error import UserNotFoundError
 from htf_engine.errors.exchange_errors.order_exceeds_position_limit_error import (
     OrderExceedsPositionLimitError,
 )
+from htf_engine.errors.exchange_errors.rejected_order_error import RejectedOrderError
 from htf_engine.errors.user_errors.insufficient_balance_for_withdrawal_error import (
     InsufficientBalanceForWithdrawalError,
 )
+from htf_engine.orders.execution_report import ExecutionReport
 from htf_engine.user.user_log import UserLog
+from htf_engine.user.user_log_policy import UserLogPolicy
 from htf_engine.trades.trade import Trade
 from htf_engine.orders.stop_order import StopOrder
 
@@ -19,10 +33,12 @@ class User:
     cash_balance: float
     realised_pnl: float
 
-    positions: Dict[str, int]
-    average_cost: Dict[str, float]
-    outstanding_buys: defaultdict[str, int]
-    outstanding_sells: defaultdict[str, int]
+    # Plain dicts by default; an exchange with an AccountTable swaps these for
+    # views onto its arrays (see AccountTable.attach).
+    positions: MutableMapping[str, int]
+    average_cost: MutableMapping[str, float]
+    outstanding_buys: MutableMapping[str, int]
+    outstanding_sells: MutableMapping[str, int]
 
     user_log: UserLog
 
@@ -31,10 +47,30 @@ class User:
     ]
     cancel_order_callback: Optional[Callable[[str, str, str], bool]]
     modify_order_callback: Optional[Callable[[str, str, str, int, float], str]]
+    submit_order_callback: Optional[
+        Callable[
+            [str, str, str, str, int, Optional[float], Optional[float]],
+            ExecutionReport,
+        ]
+    ]
+    pre_trade_check_callback: Optional[
+        Callable[[str, str, str, str, int, Optional[float]], None]
+    ]
+
+    position_limit: int  # default max |position| per instrument
+    position_limits: Dict[str, int]  # instrument -> override
 
     permission_level: int
+    account_lock: AbstractContextManager
 
-    def __init__(self, user_id: str, username: str, cash_balance: float = 0.0):
+    def __init__(
+        self,
+        user_id: str,
+        username: str,
+        cash_balance: float = 0.0,
+        log_policy: Optional[UserLogPolicy] = None,
+        position_limit: int = 100,
+    ):
         self.user_id = user_id
         self.username = username
         self.cash_balance = cash_balance
@@ -45,16 +81,25 @@ class User:
         self.outstanding_buys = defaultdict(int)  # instrument -> qty
         self.outstanding_sells = defaultdict(int)  # instrument -> qty
 
-        self.user_log = UserLog(user_id, username)
+        self.user_log = UserLog(user_id, username, log_policy)
 
         self.place_order_callback = None
         self.cancel_order_callback = None
         self.modify_order_callback = None
+        self.submit_order_callback = None
+        self.pre_trade_check_callback = None
+
+        self.position_limit = position_limit
+        self.position_limits = {}
 
         self.permission_level = 0
 
+        # Replaced by the exchange's settlement lock when fills are applied off-thread
+        self.account_lock = nullcontext()
+
     def cash_in(self, amount: float) -> None:
-        self._increase_cash_balance(amount)
+        with self.account_lock:
+            self._increase_cash_balance(amount)
         self.user_log.record_cash_in(amount, self.cash_balance)
 
     def register(self, permission_level: int) -> None:
@@ -62,19 +107,31 @@ class User:
         self.permission_level = permission_level
 
     def cash_out(self, amount: float) -> None:
-        if amount > self.cash_balance:
-            raise InsufficientBalanceForWithdrawalError(
-                withdrawal_amt=amount, user_cash_balance=self.cash_balance
-            )
+        with self.account_lock:
+            if amount > self.cash_balance:
+                raise InsufficientBalanceForWithdrawalError(
+                    withdrawal_amt=amount, user_cash_balance=self.cash_balance
+                )
 
-        self._decrease_cash_balance(amount)
+            self._decrease_cash_balance(amount)
         self.user_log.record_cash_out(amount, self.cash_balance)
 
+    def set_position_limit(self, limit: int, instrument: Optional[str] = None) -> None:
+        if instrument is None:
+            self.position_limit = limit
+        else:
+            self.position_limits[instrument] = limit
+
+    def get_position_limit(self, instrument: str) -> int:
+        return self.position_limits.get(instrument, self.position_limit)
+
     def _can_place_order(self, instrument: str, side: str, qty: int) -> bool:
-        quota = self.get_remaining_quota(instrument)
-        return (
-            qty <= quota["buy_quota"] if side == "buy" else qty <= quota["sell_quota"]
-        )
+        limit = self.get_position_limit(instrument)
+        current = self.positions.get(instrument, 0)
+
+        if side == "buy":
+            return qty <= limit - current - self.outstanding_buys.get(instrument, 0)
+        return qty <= limit + current - self.outstanding_sells.get(instrument, 0)
 
     def log_stops_trigger(self, order: StopOrder, instrument_id: str):
         self.user_log.record_stops_trigger(
@@ -99,31 +156,90 @@ class User:
         if self.place_order_callback is None:
             raise UserNotFoundError(self.user_id)
 
-        # --- CHECK USER POSITION LIMITS ---
-        if not self._can_place_order(instrument, side, qty):
-            raise OrderExceedsPositionLimitError(
-                inst=instrument,
-                side=side,
-                qty=qty,
-                quota=self.get_remaining_quota(instrument),
-            )
+        with self.account_lock:
+            # --- CHECK USER POSITION LIMITS ---
+            if not self._can_place_order(instrument, side, qty):
+                raise OrderExceedsPositionLimitError(
+                    inst=instrument,
+                    side=side,
+                    qty=qty,
+                    quota=self.get_remaining_quota(instrument),
+                )
 
-        # --- UPDATE OUTSTANDING BUYS/SELLS ---
-        if side == "buy":
-            self.increase_outstanding_buys(instrument, qty)
-        else:
-            self.increase_outstanding_sells(instrument, qty)
+            # --- EXCHANGE PRE-TRADE RISK ---
+            if self.pre_trade_check_callback is not None:
+                self.pre_trade_check_callback(
+                    self.user_id, instrument, order_type, side, qty, price
+                )
 
-        # Place order
-        order_id = self.place_order_callback(
-            self.user_id, instrument, order_type, side, qty, price, stop_price
-        )
+            # --- UPDATE OUTSTANDING BUYS/SELLS ---
+            if side == "buy":
+                self.increase_outstanding_buys(instrument, qty)
+            else:
+                self.increase_outstanding_sells(instrument, qty)
+
+        # Place order. The exchange settles the reservation for every order
+        # it refuses; anything else escaping means it never got that far.
+        try:
+            order_id = self.place_order_callback(
+                self.user_id, instrument, order_type, side, qty, price, stop_price
+            )
+        except ExchangeError:
+            raise
+        except Exception:
+            self._release_reservation(instrument, side, qty)
+            raise
 
         # Record the order in the log
         self.user_log.record_place_order(instrument, order_type, side, qty, price)
 
         return order_id
 
+    def submit_order(
+        self,
+        instrument: str,
+        order_type: str,
+        side: str,
+        qty: int,
+        price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> ExecutionReport:
+        """Like place_order, but rejections come back in the report instead of raising."""
+        if self.submit_order_callback is None:
+            raise UserNotFoundError(self.user_id)
+
+        with self.account_lock:
+            if not self._can_place_order(instrument, side, qty):
+                return ExecutionReport.rejected(
+                    None, qty, OrderExceedsPositionLimitError.error_code
+                )
+
+            if self.pre_trade_check_callback is not None:
+                try:
+                    self.pre_trade_check_callback(
+                        self.user_id, instrument, order_type, side, qty, price
+                    )
+                except RejectedOrderError as e:
+                    return ExecutionReport.rejected(None, qty, e.error_code)
+
+            if side == "buy":
+                self.increase_outstanding_buys(instrument, qty)
+            else:
+                self.increase_outstanding_sells(instrument, qty)
+
+        try:
+            report = self.submit_order_callback(
+                self.user_id, instrument, order_type, side, qty, price, stop_price
+            )
+        except Exception:
+            self._release_reservation(instrument, side, qty)
+            raise
+
+        if not report.is_rejected:
+            self.user_log.record_place_order(instrument, order_type, side, qty, price)
+
+        return report
+
     def cancel_order(self, order_id: str, instrument: str) -> bool:
         if self.cancel_order_callback is None:
             raise UserNotFoundError(self.user_id)
@@ -155,67 +271,90 @@ class User:
     def update_positions_and_cash_balance(
         self, trade: Trade, instrument: str, exchange_fee: float
     ) -> None:
-        qty = trade.qty
-        price = trade.price
-
-        old_qty = self.positions.get(instrument, 0)
-        old_avg = self.average_cost.get(instrument, 0.0)
+        side = "buy" if trade.buy_user_id == self.user_id else "sell"
+        self.settle_fills(instrument, ((side, trade.price, trade.qty),), exchange_fee)
 
-        # BUY
-        if trade.buy_user_id == self.user_id:
-            self.reduce_outstanding_buys(instrument, qty)
-
-            if old_qty >= 0:
-                # increasing long OR opening long
-                new_qty = old_qty + qty
-                new_avg = (
-                    (old_qty * old_avg + qty * price) / new_qty
-                    if old_qty != 0
-                    else price
-                )
-            else:
-                # covering short
-                realised = min(qty, -old_qty) * (old_avg - price)
-                self.realised_pnl += realised
-                new_qty = old_qty + qty
-                new_avg = old_avg if new_qty < 0 else price
-
-            cash_delta = qty * price
-
-            self._decrease_cash_balance(cash_delta)
-            self._decrease_cash_balance(exchange_fee)
-
-        # SELL
-        elif trade.sell_user_id == self.user_id:
-            self.reduce_outstanding_sells(instrument, qty)
+    def settle_fills(
+        self,
+        instrument: str,
+        fills: Iterable[Tuple[str, float, int]],
+        exchange_fee: float,
+    ) -> None:
+        """
+        Applies a sequence of (side, price, qty) fills in one instrument.
 
-            if old_qty <= 0:
-                # increasing short OR opening short
-                new_qty = old_qty - qty
-                new_avg = (
-                    (abs(old_qty) * old_avg + qty * price) / abs(new_qty)
-                    if old_qty != 0
-                    else price
-                )
+        Fills are walked in order on local variables (so realised PnL and
+        average cost match settling them one by one), then positions,
+        outstanding quantities and cash are written once.
+        """
+        with self.account_lock:
+            qty_held = self.positions.get(instrument, 0)
+            avg = self.average_cost.get(instrument, 0.0)
+
+            realised = 0.0
+            cash_delta = 0.0
+            bought = 0
+            sold = 0
+            n_fills = 0
+
+            for side, price, qty in fills:
+                n_fills += 1
+
+                # BUY
+                if side == "buy":
+                    bought += qty
+                    cash_delta -= qty * price
+
+                    if qty_held >= 0:
+                        # increasing long OR opening long
+                        new_qty = qty_held + qty
+                        avg = (
+                            (qty_held * avg + qty * price) / new_qty
+                            if qty_held != 0
+                            else price
+                        )
+                    else:
+                        # covering short
+                        realised += min(qty, -qty_held) * (avg - price)
+                        new_qty = qty_held + qty
+                        avg = avg if new_qty < 0 else price
+
+                # SELL
+                else:
+                    sold += qty
+                    cash_delta += qty * price
+
+                    if qty_held <= 0:
+                        # increasing short OR opening short
+                        new_qty = qty_held - qty
+                        avg = (
+                            (abs(qty_held) * avg + qty * price) / abs(new_qty)
+                            if qty_held != 0
+                            else price
+                        )
+                    else:
+                        # selling long
+                        realised += min(qty, qty_held) * (price - avg)
+                        new_qty = qty_held - qty
+                        avg = avg if new_qty > 0 else price
+
+                qty_held = new_qty
+
+            if bought:
+                self.reduce_outstanding_buys(instrument, bought)
+            if sold:
+                self.reduce_outstanding_sells(instrument, sold)
+
+            self.realised_pnl += realised
+            self._increase_cash_balance(cash_delta - n_fills * exchange_fee)
+
+            # Cleanup
+            if qty_held == 0:
+                self.positions.pop(instrument, None)
+                self.average_cost.pop(instrument, None)
             else:
-                # selling long
-                realised = min(qty, old_qty) * (price - old_avg)
-                self.realised_pnl += realised
-                new_qty = old_qty - qty
-                new_avg = old_avg if new_qty > 0 else price
-
-            cash_delta = qty * price
-
-            self._increase_cash_balance(cash_delta)
-            self._decrease_cash_balance(exchange_fee)
-
-        # Cleanup
-        if new_qty == 0:
-            self.positions.pop(instrument, None)
-            self.average_cost.pop(instrument, None)
-        else:
-            self.positions[instrument] = new_qty
-            self.average_cost[instrument] = new_avg
+                self.positions[instrument] = qty_held
+                self.average_cost[instrument] = avg
 
     def get_positions(self) -> dict[str, Any]:
         """
@@ -227,10 +366,11 @@ class User:
             }
         }
         """
-        return {
-            inst: {"quantity": qty, "average_cost": self.average_cost[inst]}
-            for inst, qty in self.positions.items()
-        }
+        with self.account_lock:
+            return {
+                inst: {"quantity": qty, "average_cost": self.average_cost[inst]}
+                for inst, qty in self.positions.items()
+            }
 
     def _increase_cash_balance(self, amount: float) -> None:
         self.cash_balance += amount
@@ -255,12 +395,12 @@ class User:
                 "sell_quota": int
             }
         """
-        limit = 100  # TODO: make this configurable if needed
+        with self.account_lock:
+            limit = self.get_position_limit(instrument)
+            current = self.positions.get(instrument, 0)
 
-        current = self.positions.get(instrument, 0)
-
-        outstanding_buy = self.outstanding_buys.get(instrument, 0)
-        outstanding_sell = self.outstanding_sells.get(instrument, 0)
+            outstanding_buy = self.outstanding_buys.get(instrument, 0)
+            outstanding_sell = self.outstanding_sells.get(instrument, 0)
 
         buy_quota = limit - current - outstanding_buy
         sell_quota = limit + current - outstanding_sell
@@ -269,27 +409,37 @@ class User:
         return {"buy_quota": max(0, buy_quota), "sell_quota": max(0, sell_quota)}
 
     def increase_outstanding_buys(self, instrument: str, qty: int) -> None:
-        self.outstanding_buys[instrument] += qty
+        with self.account_lock:
+            self.outstanding_buys[instrument] += qty
 
     def increase_outstanding_sells(self, instrument: str, qty: int) -> None:
-        self.outstanding_sells[instrument] += qty
+        with self.account_lock:
+            self.outstanding_sells[instrument] += qty
 
     def reduce_outstanding_buys(self, instrument: str, qty: int) -> None:
-        self.outstanding_buys[instrument] -= qty
+        with self.account_lock:
+            self.outstanding_buys[instrument] -= qty
 
-        if self.outstanding_buys[instrument] == 0:
-            self.outstanding_buys.pop(instrument)
+            if self.outstanding_buys[instrument] == 0:
+                self.outstanding_buys.pop(instrument)
 
     def reduce_outstanding_sells(self, instrument: str, qty: int) -> None:
-        self.outstanding_sells[instrument] -= qty
+        with self.account_lock:
+            self.outstanding_sells[instrument] -= qty
+
+            if self.outstanding_sells[instrument] == 0:
+                self.outstanding_sells.pop(instrument)
 
-        if self.outstanding_sells[instrument] == 0:
-            self.outstanding_sells.pop(instrument)
+    def _release_reservation(self, instrument: str, side: str, qty: int) -> None:
+        if side == "buy":
+            self.reduce_outstanding_buys(instrument, qty)
+        else:
+            self.reduce_outstanding_sells(instrument, qty)
 
-    def get_outstanding_buys(self) -> dict[str, int]:
+    def get_outstanding_buys(self) -> Mapping[str, int]:
         return self.outstanding_buys
 
-    def get_outstanding_sells(self) -> dict[str, int]:
+    def get_outstanding_sells(self) -> Mapping[str, int]:
         return self.outstanding_sells
 
     def get_permission_level(self) -> int:
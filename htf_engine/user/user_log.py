@@ -1,5 +1,10 @@
+from collections import Counter, deque
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Deque, List, Optional
+
+import gzip
+import os
+import pickle
 
 from htf_engine.user.action_log.user_action import UserAction
 from htf_engine.user.action_log.register_user_action import RegisterUserAction
@@ -9,18 +14,96 @@ from htf_engine.user.action_log.cancel_order_action import CancelOrderAction
 from htf_engine.user.action_log.place_order_action import PlaceOrderAction
 from htf_engine.user.action_log.modify_order_action import ModifyOrderAction
 from htf_engine.user.action_log.record_stop_trigger import RecordStopTrigger
+from htf_engine.user.user_log_policy import UserLogPolicy
 
 
 class UserLog:
-    def __init__(self, user_id: str, username: str):
-        self._actions: List[UserAction] = []
+    def __init__(
+        self, user_id: str, username: str, policy: Optional[UserLogPolicy] = None
+    ):
+        self._actions: Deque[UserAction] = deque()
         self.user_id = user_id
         self.username = username
+        self.policy = policy or UserLogPolicy()
+
+        self._counts: Counter[str] = Counter()
+        self._first_timestamp: Optional[datetime] = None
+        self._last_timestamp: Optional[datetime] = None
+
+        # Actions evicted from memory but not yet written to the spill file
+        self._pending_spill: List[UserAction] = []
+        self._spilled_count = 0
+        self._spill_path = (
+            os.path.join(
+                self.policy.spill_dir,
+                f"{user_id.replace(os.sep, '_')}.actions.gz",
+            )
+            if self.policy.spill_dir is not None
+            else None
+        )
 
     def _get_now(self) -> datetime:
         return datetime.now()
 
+    def _skip_detail(self, action: str) -> bool:
+        """In summary-only mode, count the action and skip building the record."""
+        if not self.policy.summary_only:
+            return False
+
+        now = self._get_now()
+        self._counts[action] += 1
+        if self._first_timestamp is None:
+            self._first_timestamp = now
+        self._last_timestamp = now
+        return True
+
+    def _append(self, action: UserAction) -> None:
+        self._counts[action.action] += 1
+        if self._first_timestamp is None:
+            self._first_timestamp = action.timestamp
+        self._last_timestamp = action.timestamp
+
+        self._actions.append(action)
+
+        max_in_memory = self.policy.max_in_memory
+        if max_in_memory is not None and len(self._actions) > max_in_memory:
+            evicted = self._actions.popleft()
+
+            if self._spill_path is not None:
+                self._pending_spill.append(evicted)
+                if len(self._pending_spill) >= self.policy.spill_batch_size:
+                    self.flush()
+
+    def flush(self) -> None:
+        """Writes evicted actions still held in memory to the spill file."""
+        if self._spill_path is None or not self._pending_spill:
+            return
+
+        # The spill file is owned by this log, so the first write truncates it
+        with gzip.open(self._spill_path, "ab" if self._spilled_count else "wb") as f:
+            pickle.dump(self._pending_spill, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._spilled_count += len(self._pending_spill)
+        self._pending_spill = []
+
+    def _read_spilled(self) -> List[UserAction]:
+        actions: List[UserAction] = []
+        if self._spill_path is None or not self._spilled_count:
+            return actions
+
+        with gzip.open(self._spill_path, "rb") as f:
+            while True:
+                try:
+                    actions.extend(pickle.load(f))
+                except EOFError:
+                    break
+
+        return actions
+
     def record_register_user(self, user_balance: float) -> None:
+        if self._skip_detail("REGISTER"):
+            return
+
         action = RegisterUserAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -29,7 +112,7 @@ class UserLog:
             user_balance=user_balance,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_stops_trigger(
         self,
@@ -41,6 +124,9 @@ class UserLog:
         stop_price: float,
         price: Optional[float],
     ) -> None:
+        if self._skip_detail("STOP TRIGGER"):
+            return
+
         action = RecordStopTrigger(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -55,7 +141,7 @@ class UserLog:
             price=price,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_place_order(
         self,
@@ -65,6 +151,9 @@ class UserLog:
         quantity: int,
         price: Optional[float],
     ) -> None:
+        if self._skip_detail("PLACE ORDER"):
+            return
+
         action = PlaceOrderAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -77,9 +166,12 @@ class UserLog:
             price=price,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_cash_in(self, amount: float, new_balance: float) -> None:
+        if self._skip_detail("CASH IN"):
+            return
+
         action = CashInAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -89,9 +181,12 @@ class UserLog:
             curr_balance=new_balance,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_cash_out(self, amount: float, new_balance: float) -> None:
+        if self._skip_detail("CASH OUT"):
+            return
+
         action = CashOutAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -101,9 +196,12 @@ class UserLog:
             curr_balance=new_balance,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_cancel_order(self, order_id: str, instrument_id: str) -> None:
+        if self._skip_detail("CANCEL ORDER"):
+            return
+
         action = CancelOrderAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -113,11 +211,14 @@ class UserLog:
             instrument_id=instrument_id,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def record_modify_order(
         self, order_id: str, instrument_id: str, new_qty: int, new_price: float
     ) -> None:
+        if self._skip_detail("MODIFY ORDER"):
+            return
+
         action = ModifyOrderAction(
             timestamp=self._get_now(),
             user_id=self.user_id,
@@ -129,14 +230,44 @@ class UserLog:
             new_price=new_price,
         )
 
-        self._actions.append(action)
+        self._append(action)
 
     def retrieve_log(self) -> tuple[UserAction, ...]:
-        return tuple(self._actions)
+        """Returns all retained actions, oldest first, across disk and memory."""
+        return (
+            *self._read_spilled(),
+            *self._pending_spill,
+            *self._actions,
+        )
 
     def retrieve_simple_log(self) -> tuple[str, ...]:
-        return tuple(map(str, self._actions))
+        return tuple(map(str, self.retrieve_log()))
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Returns:
+        {
+            "user_id": str,
+            "username": str,
+            "total_actions": int,
+            "actions": {action: count},
+            "in_memory": int,
+            "spilled": int,
+            "first_timestamp": datetime | None,
+            "last_timestamp": datetime | None
+        }
+        """
+        return {
+            "user_id": self.user_id,
+            "username": self.username,
+            "total_actions": sum(self._counts.values()),
+            "actions": dict(self._counts),
+            "in_memory": len(self._actions),
+            "spilled": self._spilled_count + len(self._pending_spill),
+            "first_timestamp": self._first_timestamp,
+            "last_timestamp": self._last_timestamp,
+        }
 
     def __str__(self) -> str:
         """Prints user actions"""
-        return "\n".join(str(action) for action in self._actions)
+        return "\n".join(str(action) for action in self.retrieve_log())
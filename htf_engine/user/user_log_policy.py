@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class UserLogPolicy:
+    """
+    Retention policy for a user's action log.
+
+    - max_in_memory: keep at most this many actions in memory (None = unbounded)
+    - spill_dir: directory where actions evicted from memory are appended,
+      gzip-compressed, to "<user_id>.actions.gz". Without it, evicted actions
+      are dropped.
+    - spill_batch_size: number of evicted actions written per compressed chunk
+    - summary_only: keep per-action counts only, never the actions themselves
+    """
+
+    max_in_memory: Optional[int] = None
+    spill_dir: Optional[str] = None
+    spill_batch_size: int = 1000
+    summary_only: bool = False
@@ -0,0 +1,94 @@
+import random
+import pytest
+
+pytest.importorskip("numpy")
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError  # noqa: E402
+from htf_engine.exchange import Exchange  # noqa: E402
+from htf_engine.order_book import OrderBook  # noqa: E402
+from htf_engine.user.account_table import AccountTable  # noqa: E402
+from htf_engine.user.user import User  # noqa: E402
+
+
+def _run_flow(exchange: Exchange, seed: int) -> None:
+    rng = random.Random(seed)
+    for inst in ["Stock A", "Stock B"]:
+        exchange.add_order_book(inst, OrderBook(inst))
+
+    users = [User(f"u{i}", f"User {i}", 1_000_000) for i in range(5)]
+    for u in users:
+        exchange.register_user(u)
+
+    for _ in range(300):
+        u = rng.choice(users)
+        try:
+            u.place_order(
+                rng.choice(["Stock A", "Stock B"]),
+                "limit",
+                rng.choice(["buy", "sell"]),
+                rng.randint(1, 10),
+                rng.randint(95, 105),
+            )
+        except ExchangeError:
+            pass
+
+
+class TestAccountTable:
+    def test_attach_moves_existing_state_into_views(self):
+        table = AccountTable(["A"], capacity=1)
+        u = User("u1", "User 1", 1000)
+        u.positions["A"] = 5
+        u.average_cost["A"] = 10.0
+        u.outstanding_buys["B"] = 3
+
+        table.attach(u)
+
+        assert dict(u.positions) == {"A": 5}
+        assert dict(u.average_cost) == {"A": 10.0}
+        assert dict(u.outstanding_buys) == {"B": 3}
+        assert u.outstanding_sells["A"] == 0
+        assert "A" not in u.outstanding_sells
+        assert table.instruments == ["A", "B"]
+
+        u.reduce_outstanding_buys("B", 3)
+        assert dict(u.outstanding_buys) == {}
+
+        u.positions.pop("A")
+        u.average_cost.pop("A", None)
+        assert u.get_positions() == {}
+
+    def test_rows_and_columns_grow(self):
+        table = AccountTable(capacity=1)
+        users = [User(f"u{i}", f"User {i}", 0) for i in range(5)]
+        for i, u in enumerate(users):
+            table.attach(u)
+            u.positions[f"I{i}"] = i + 1
+            u.average_cost[f"I{i}"] = 1.0
+
+        assert [dict(u.positions) for u in users] == [
+            {f"I{i}": i + 1} for i in range(5)
+        ]
+
+        marks = {f"I{i}": 2.0 for i in range(5)}
+        assert table.unrealised_pnl(marks) == {f"u{i}": i + 1 for i in range(5)}
+        assert table.exposure({"I4": 3.0})["u4"] == 15
+
+
+def test_exchange_with_table_matches_dict_accounts():
+    plain = Exchange(fee=1)
+    tabled = Exchange(fee=1, account_table=True)
+    _run_flow(plain, seed=3)
+    _run_flow(tabled, seed=3)
+
+    for sa, sb in zip(
+        tabled.get_end_of_day_statements(),
+        plain.get_end_of_day_statements(),
+        strict=True,
+    ):
+        assert sa["user_id"] == sb["user_id"]
+        assert sa["positions"] == sb["positions"]
+        for key in ["cash_balance", "realised_pnl", "unrealised_pnl", "exposure"]:
+            assert sa[key] == pytest.approx(sb[key])
+
+    assert tabled.account_table is not None
+    assert all(v == 0 for v in tabled.account_table.net_positions().values())
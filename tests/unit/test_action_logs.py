@@ -1,3 +1,8 @@
+from htf_engine.user.user import User
+from htf_engine.user.user_log import UserLog
+from htf_engine.user.user_log_policy import UserLogPolicy
+
+
 def test_record_register_user(exchange, u1):
     exchange.register_user(u1)
     assert len(u1.user_log._actions) == 1
@@ -76,3 +81,45 @@ def test_record_stop_trigger(exchange, u1, u2, u3):
     assert u1.user_log._actions[2].quantity == 10
     assert u1.user_log._actions[2].stop_price == 10
     assert u1.user_log._actions[2].price == 10
+
+
+def test_bounded_log_drops_oldest_without_spill():
+    log = UserLog("mm", "Market Maker", UserLogPolicy(max_in_memory=3))
+    for i in range(10):
+        log.record_cash_in(i, i)
+
+    assert len(log._actions) == 3
+    assert [getattr(a, "amount_added") for a in log.retrieve_log()] == [7, 8, 9]
+    assert log.summary()["total_actions"] == 10
+
+
+def test_bounded_log_spills_to_disk(tmp_path):
+    policy = UserLogPolicy(max_in_memory=5, spill_dir=str(tmp_path), spill_batch_size=4)
+    log = UserLog("mm", "Market Maker", policy)
+    for i in range(20):
+        log.record_cash_in(i, i)
+
+    assert len(log._actions) == 5
+    assert (tmp_path / "mm.actions.gz").exists()
+
+    # retrieve_log stitches the spill file, the unflushed batch and memory together
+    assert [getattr(a, "amount_added") for a in log.retrieve_log()] == list(range(20))
+
+    log.flush()
+    assert [getattr(a, "amount_added") for a in log.retrieve_log()] == list(range(20))
+    assert log.summary()["spilled"] == 15
+    assert log.summary()["in_memory"] == 5
+
+
+def test_summary_only_log(exchange):
+    u = User("hft", "HFT", 5000, log_policy=UserLogPolicy(summary_only=True))
+    exchange.register_user(u)
+    oid = u.place_order("Stock A", "limit", "buy", 10, 10)
+    u.cancel_order(oid, "Stock A")
+
+    assert u.user_log.retrieve_log() == ()
+
+    summary = u.user_log.summary()
+    assert summary["total_actions"] == 3
+    assert summary["actions"] == {"REGISTER": 1, "PLACE ORDER": 1, "CANCEL ORDER": 1}
+    assert summary["last_timestamp"] is not None
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from htf_engine.errors.exchange_errors.bar_interval_not_configured_error import (
+    BarIntervalNotConfiguredError,
+)
+from htf_engine.market_data.bar_aggregator import BarAggregator
+
+
+T0 = datetime(2025, 1, 1, 9, 30, tzinfo=timezone.utc)
+
+
+class TestBarAggregator:
+    def test_single_bar_ohlcv_and_vwap(self):
+        agg = BarAggregator(intervals=(60,))
+        agg.record(100, 10, T0)
+        agg.record(105, 5, T0 + timedelta(seconds=10))
+        agg.record(95, 5, T0 + timedelta(seconds=20))
+        agg.record(101, 20, T0 + timedelta(seconds=59))
+
+        bar = agg.get_current_bar(60)
+        assert bar is not None
+        assert bar.start == T0
+        assert (bar.open, bar.high, bar.low, bar.close) == (100, 105, 95, 101)
+        assert bar.volume == 40
+        assert bar.trade_count == 4
+        assert bar.turnover == 100 * 10 + 105 * 5 + 95 * 5 + 101 * 20
+        assert bar.vwap == bar.turnover / 40
+
+    def test_rollover_and_multiple_intervals(self):
+        agg = BarAggregator(intervals=(60, 300))
+        agg.record(100, 1, T0)
+        agg.record(110, 1, T0 + timedelta(seconds=61))
+        agg.record(120, 1, T0 + timedelta(seconds=125))
+
+        one_min = agg.get_bars(60)
+        assert [b.open for b in one_min] == [100, 110, 120]
+        assert [b.start for b in one_min] == [
+            T0,
+            T0 + timedelta(minutes=1),
+            T0 + timedelta(minutes=2),
+        ]
+
+        five_min = agg.get_bars(300)
+        assert len(five_min) == 1
+        assert five_min[0].high == 120
+        assert five_min[0].low == 100
+        assert five_min[0].volume == 3
+
+        assert [b.open for b in agg.get_bars(60, limit=2)] == [110, 120]
+        assert agg.get_bars(60, limit=0) == ()
+
+    def test_completed_bars_are_bounded(self):
+        agg = BarAggregator(intervals=(1,), max_bars=3)
+        for i in range(10):
+            agg.record(100 + i, 1, T0 + timedelta(seconds=i))
+
+        # 3 completed bars + the bar in progress
+        assert [b.close for b in agg.get_bars(1)] == [106, 107, 108, 109]
+
+    def test_current_bar_is_a_copy(self):
+        agg = BarAggregator()
+        agg.record(100, 1, T0)
+        bar = agg.get_current_bar(60)
+        assert bar is not None
+        bar.close = 0
+        assert agg.get_bars(60)[-1].close == 100
+
+    def test_unknown_interval(self):
+        agg = BarAggregator(intervals=(60,))
+        with pytest.raises(BarIntervalNotConfiguredError):
+            agg.get_bars(5)
+
+
+def test_exchange_get_bars(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+
+    u1.place_order("Stock A", "limit", "buy", 10, 10)
+    u2.place_order("Stock A", "limit", "sell", 4, 10)
+    u2.place_order("Stock A", "limit", "sell", 6, 10)
+
+    data = exchange.get_bars(u1.user_id, "Stock A")
+    assert data["instrument"] == "Stock A"
+    assert len(data["bars"]) == 1
+
+    bar = data["bars"][0]
+    assert bar["open"] == bar["close"] == 10
+    assert bar["volume"] == 10
+    assert bar["trade_count"] == 2
+    assert bar["vwap"] == 10
+
+    assert exchange.get_bars(u1.user_id, "Stock B")["bars"] == []
@@ -1,3 +1,7 @@
+from htf_engine.events.event_type import EventType
+from htf_engine.order_book import OrderBook
+
+
 def _total_resting(levels) -> int:
     """Total number of resting orders across all price levels."""
     return sum(len(q) for q in levels.values())
@@ -110,3 +114,77 @@ class TestOrderCancellation:
         assert _total_resting(ob.bids) == 0
         assert _total_resting(ob.asks) == 1
         assert ob.best_ask() == 105
+
+
+class TestTombstoneCompaction:
+    def test_cancel_storm_triggers_compaction(self):
+        ob = OrderBook("X", compaction_ratio=1.0, compaction_min_dead=10)
+        for _ in range(5):
+            ob.add_order("limit", "buy", 1, 100, "mm")
+        doomed = [ob.add_order("limit", "buy", 1, 90 + i % 5, "mm") for i in range(20)]
+        ob.add_order("limit", "sell", 1, 110, "mm")
+
+        for oid in doomed[:9]:
+            ob.cancel_order(oid)
+        assert ob.compactions == 0 and ob.dead_orders["buy"] == 9
+
+        ob.cancel_order(doomed[9])  # 10 dead vs 15 live bids: still lazy
+        assert ob.compactions == 0
+
+        for oid in doomed[10:13]:
+            ob.cancel_order(oid)
+        # 13 dead >= 12 live, so the whole bid side was swept
+        assert ob.compactions == 1
+        assert ob.dead_orders["buy"] == 0
+        assert not ob.cancelled_orders
+        assert len(ob.best_bids) == ob.resting_orders["buy"] == 12
+        assert sum(len(q) for q in ob.bids.values()) == 12
+        assert all(oid not in ob.order_map for oid in doomed[:13])
+        assert ob.best_bid() == 100
+        assert len(ob.best_asks) == 1
+
+    def test_compaction_keeps_price_time_priority(self):
+        ob = OrderBook("X", enable_stp=False)
+        ids = [ob.add_order("limit", "sell", 1, 100 + i % 3, "s") for i in range(30)]
+        for oid in ids[::2]:
+            ob.cancel_order(oid)
+        stop_id = ob.add_order("stop-market", "buy", 1, None, "b", 200)
+        ob.cancel_order(stop_id)
+
+        assert ob.compact("sell") == 15
+        assert ob.cancelled_orders == {stop_id}  # stops are not touched
+        assert ob.dead_orders["sell"] == 0
+
+        expected = sorted(ids[1::2], key=lambda oid: (100 + ids.index(oid) % 3))
+        filled = []
+        for _ in range(15):
+            ob.add_order("market", "buy", 1, None, "b")
+            filled.append(ob.trade_log.retrieve_log()[-1].sell_order_id)
+        assert filled == expected
+        assert not ob.asks and not ob.best_asks
+
+    def test_cancels_during_a_match_defer_compaction(self):
+        ob = OrderBook("X", compaction_ratio=0.0, compaction_min_dead=1)
+        a = ob.add_order("limit", "sell", 2, 10, "s")
+        c = ob.add_order("limit", "sell", 1, 11, "s")
+
+        # A subscriber pulls the resting order being matched, which would
+        # otherwise sweep away the level the matcher is about to pop from
+        def on_trade(event):
+            ob.cancel_order(a)
+            ob.cancel_order(c)
+            assert ob.compactions == 0
+
+        ob.event_bus.subscribe(EventType.TRADE, on_trade)
+        ob.add_order("limit", "buy", 2, 10, "b")
+
+        assert len(ob.trade_log.retrieve_log()) == 1
+        assert ob.compactions == 1  # ran once the match finished
+        assert ob.best_ask() is None
+        assert c not in ob.order_map
+
+    def test_empty_sweeps_are_not_counted(self):
+        ob = OrderBook("X")
+        ob.add_order("limit", "buy", 1, 100, "mm")
+        assert ob.compact("buy") == 0
+        assert ob.compactions == 0
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from htf_engine.client.async_exchange_client import AsyncExchangeClient
+from htf_engine.client.exchange_client import ExchangeClient
+from htf_engine.errors.exchange_errors.request_rejected_error import (
+    RequestRejectedError,
+)
+from htf_engine.exchange import Exchange
+from htf_engine.gateway.messages import FillReport
+from htf_engine.gateway.order_gateway import OrderGateway
+from htf_engine.order_book import OrderBook
+from htf_engine.user.user import User
+
+
+def make_exchange():
+    exchange = Exchange()
+    exchange.add_order_book("A", OrderBook("A", enable_stp=False))
+    exchange.register_user(User("u1", "User 1", 100_000, position_limit=1000))
+    exchange.register_user(User("u2", "User 2", 100_000, position_limit=1000))
+    return exchange
+
+
+def test_async_client_pipelines_over_pool():
+    async def scenario():
+        exchange = make_exchange()
+        fills: list[FillReport] = []
+
+        async with OrderGateway(exchange) as gateway:
+            maker = AsyncExchangeClient(
+                "127.0.0.1", gateway.port, "u1", pool_size=3, fill_handler=fills.append
+            )
+            taker = AsyncExchangeClient("127.0.0.1", gateway.port, "u2", pool_size=1)
+            await maker.connect()
+            await taker.connect()
+
+            order_ids = await asyncio.gather(
+                *(
+                    maker.place_order("A", "limit", "sell", 1, 100 + i)
+                    for i in range(30)
+                )
+            )
+            assert len(set(order_ids)) == 30
+            assert [
+                exchange.order_books["A"].order_map[o].price for o in order_ids
+            ] == [100 + i for i in range(30)]
+
+            ack = await taker.submit_order("A", "market", "buy", 2)
+            assert (ack.status, ack.filled_qty) == ("filled", 2)
+
+            with pytest.raises(RequestRejectedError) as e:
+                await taker.place_order("A", "limit", "buy", 10_000, 1)
+            assert e.value.reject_code == "ORDER_EXCEEDS_POSITION_LIMIT"
+
+            new_id = await maker.modify_order("A", order_ids[5], 1, 99.5)
+            assert await maker.cancel_order(new_id, "A")
+            assert not await maker.cancel_order(new_id, "A")
+
+            await maker.close()
+            await taker.close()
+
+        assert [(f.price, f.remaining_qty) for f in fills] == [(100, 0), (101, 0)]
+
+    asyncio.run(scenario())
+
+
+def test_sync_client_against_gateway_thread():
+    exchange = make_exchange()
+    loop = asyncio.new_event_loop()
+    gateway = OrderGateway(exchange)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(gateway.start(), loop).result(5)
+
+    try:
+        with ExchangeClient("127.0.0.1", gateway.port, "u1", timeout=5) as client:
+            futures = [
+                client.place_order_async("A", "limit", "buy", 1, 90 + i)
+                for i in range(10)
+            ]
+            order_ids = [f.result(5) for f in futures]
+            assert len(set(order_ids)) == 10
+
+            assert client.cancel_order(order_ids[0], "A")
+            assert client.submit_order("A", "limit", "buy", 1, 0.5).status == "resting"
+
+        assert exchange.users["u1"].get_outstanding_buys()["A"] == 10
+    finally:
+        asyncio.run_coroutine_threadsafe(gateway.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
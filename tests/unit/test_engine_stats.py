@@ -0,0 +1,148 @@
+import json
+import threading
+
+import pytest
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
+from htf_engine.errors.exchange_errors.price_outside_band_error import (
+    PriceOutsideBandError,
+)
+from htf_engine.errors.exchange_errors.rate_limit_exceeded_error import (
+    RateLimitExceededError,
+)
+from htf_engine.metrics.engine_stats import EngineStats
+from htf_engine.metrics.stats_dumper import StatsDumper
+from htf_engine.order_book import OrderBook
+from htf_engine.risk.rate_limit import RateLimit
+from htf_engine.risk.risk_limits import RiskLimits
+
+
+class TestEngineStats:
+    def test_counters_track_book_structure(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+
+        b1 = u1.place_order("Stock A", "limit", "buy", 5, 99)
+        u1.place_order("Stock A", "limit", "buy", 5, 98)
+        u2.place_order("Stock A", "limit", "sell", 5, 101)
+        u2.place_order("Stock A", "stop-limit", "sell", 5, 90, 95)
+        u1.cancel_order(b1, "Stock A")
+
+        book = exchange.stats()["books"]["Stock A"]
+        assert book["resting_bids"] == 1 and book["resting_asks"] == 1
+        assert book["bid_heap_size"] == 2 and book["stale_heap_entries"] == 1
+        assert book["cancelled_orders"] == 1
+        assert book["stop_orders"] == 1
+        assert book["cancels"] == {"user": 1}
+
+        # Filling the ask removes it from the resting count straight away
+        u1.place_order("Stock A", "limit", "buy", 5, 101)
+        book = exchange.stats()["books"]["Stock A"]
+        assert book["resting_asks"] == 0
+        assert (book["trades"], book["volume"]) == (1, 5)
+
+    def test_rejects_counted_by_reason(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(RiskLimits(price_band=0.1), inst="Stock A")
+        exchange.set_rate_limit("cancel", RateLimit(rate=0.001, burst=1))
+
+        u1.place_order("Stock A", "limit", "sell", 1, 100)
+        u2.place_order("Stock A", "limit", "buy", 1, 100)
+        with pytest.raises(PriceOutsideBandError):
+            u1.place_order("Stock A", "limit", "sell", 1, 111)
+
+        u1.place_order("Stock A", "limit", "sell", 1, 105)
+        with pytest.raises(ExchangeError):
+            u2.place_order("Stock A", "post-only", "buy", 1, 105)
+
+        order_id = u1.place_order("Stock B", "limit", "sell", 1, 50)
+        u1.cancel_order(order_id, "Stock B")
+        with pytest.raises(RateLimitExceededError):
+            u1.cancel_order(order_id, "Stock B")
+
+        stats = exchange.stats()
+        assert stats["books"]["Stock A"]["rejects"] == {
+            "PRICE_OUTSIDE_BAND": 1,
+            "POST_ONLY_VIOLATION": 1,
+        }
+        assert stats["books"]["Stock B"]["rejects"] == {"RATE_LIMIT_EXCEEDED": 1}
+        assert stats["rejects"]["RATE_LIMIT_EXCEEDED"] == 1
+        assert stats["users"] == 2
+
+    def test_trades_per_second_window(self):
+        now = [1000.0]
+        stats = EngineStats(window=10, clock=lambda: now[0])
+        ob = OrderBook("X")
+        stats.attach(ob)
+
+        for _ in range(20):
+            ob.add_order("limit", "sell", 1, 10, user_id="s")
+            ob.add_order("limit", "buy", 1, 10, user_id="b")
+        assert stats.trades_per_second("X") == 2.0
+
+        now[0] += 5
+        ob.add_order("limit", "sell", 10, 10, user_id="s")
+        ob.add_order("market", "buy", 10, user_id="b")
+        assert stats.trades_per_second("X") == 2.1
+
+        now[0] += 6
+        assert stats.trades_per_second("X") == pytest.approx(0.1)
+        # Reading never expires buckets; only the next trade does
+        assert len(stats._trade_buckets["X"]) == 2
+
+        now[0] += 10
+        assert stats.book_stats(ob)["trades_per_second"] == 0.0
+        assert stats.book_stats(ob)["trades"] == 21
+
+
+def test_periodic_dump_appends_json_lines(exchange, u1, tmp_path):
+    exchange.register_user(u1)
+    u1.place_order("Stock A", "limit", "buy", 1, 10)
+
+    path = tmp_path / "stats.jsonl"
+    exchange.start_stats_dump(str(path), interval=0.01)
+    exchange.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines
+    assert lines[-1]["books"]["Stock A"]["resting_bids"] == 1
+    assert exchange.stats_dumper is None
+
+
+def test_dump_while_trading(exchange, u1, u2, tmp_path, capsys):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+    path = tmp_path / "stats.jsonl"
+
+    with exchange.start_stats_dump(str(path), interval=0.0001) as dumper:
+        # Entering the already started dumper must not start a second thread
+        assert [t.name for t in threading.enumerate()].count("stats-dumper") == 1
+        assert dumper is exchange.stats_dumper
+        for i in range(200):
+            seller, buyer = (u1, u2) if i % 2 else (u2, u1)
+            seller.place_order("Stock A", "limit", "sell", 1, 10)
+            buyer.place_order("Stock A", "limit", "buy", 1, 10)
+            order_id = u1.place_order("Stock B", "limit", "sell", 1, 50)
+            u1.cancel_order(order_id, "Stock B")
+
+    assert "failed" not in capsys.readouterr().out
+    last = json.loads(path.read_text().splitlines()[-1])
+    assert last["books"]["Stock A"]["trades"] == 200
+    assert last["books"]["Stock B"]["cancels"] == {"user": 200}
+
+
+def test_dumper_start_is_idempotent(tmp_path):
+    dumper = StatsDumper(dict, str(tmp_path / "stats.jsonl"), interval=10)
+    dumper.start()
+    thread = dumper._thread
+    dumper.start()
+    assert dumper._thread is thread
+
+    dumper.stop()
+    assert thread is not None and not thread.is_alive()
+
+    # Can be restarted after a stop
+    with dumper:
+        assert dumper._thread is not None and dumper._thread.is_alive()
+    assert len((tmp_path / "stats.jsonl").read_text().splitlines()) == 2
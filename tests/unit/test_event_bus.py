@@ -0,0 +1,118 @@
+import pytest
+
+from htf_engine.errors.exchange_errors.post_only_violation_error import (
+    PostOnlyViolationError,
+)
+from htf_engine.events.event_bus import EventBus
+from htf_engine.events.event_type import EventType
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.order_book import OrderBook
+
+
+def _record_all(bus: EventBus) -> list:
+    events: list = []
+    for event_type in EventType:
+        bus.subscribe(event_type, events.append)
+    return events
+
+
+class TestEventBus:
+    def test_dispatch_is_per_event_type(self):
+        bus = EventBus()
+        trades: list = []
+        cancels: list = []
+        bus.subscribe(EventType.TRADE, trades.append)
+        bus.subscribe(EventType.ORDER_CANCELLED, cancels.append)
+
+        assert bus.has_subscribers(EventType.TRADE)
+        assert not bus.has_subscribers(EventType.BOOK_CHANGED)
+
+        ob = OrderBook("NVDA", enable_stp=False)
+        ob.event_bus = bus
+        ob.add_order("limit", "buy", 5, 100)
+        ob.add_order("limit", "sell", 2, 100)
+
+        assert len(trades) == 1
+        assert cancels == []
+
+    def test_many_subscribers_and_unsubscribe(self):
+        bus = EventBus()
+        first: list = []
+        second: list = []
+        bus.subscribe(EventType.TRADE, first.append)
+        bus.subscribe(EventType.TRADE, second.append)
+
+        ob = OrderBook("NVDA", enable_stp=False)
+        ob.event_bus = bus
+        ob.add_order("limit", "buy", 5, 100)
+        ob.add_order("limit", "sell", 2, 100)
+        assert len(first) == len(second) == 1
+
+        assert bus.unsubscribe(EventType.TRADE, second.append)
+        assert not bus.unsubscribe(EventType.TRADE, second.append)
+        ob.add_order("limit", "sell", 2, 100)
+        assert len(first) == 2
+        assert len(second) == 1
+
+
+class TestOrderBookEvents:
+    def test_trade_events_carry_remaining_qty(self):
+        ob = OrderBook("NVDA", enable_stp=False)
+        events = _record_all(ob.event_bus)
+
+        buy_id = ob.add_order("limit", "buy", 5, 100)
+        ob.add_order("limit", "sell", 2, 100)
+
+        types = [e.event_type for e in events]
+        assert types == [
+            EventType.ORDER_ACCEPTED,
+            EventType.BOOK_CHANGED,  # buy rests
+            EventType.ORDER_ACCEPTED,
+            EventType.TRADE,
+            EventType.BOOK_CHANGED,  # resting buy partially filled
+        ]
+
+        trade_event = events[3]
+        assert trade_event.trade.buy_order_id == buy_id
+        assert trade_event.buy_remaining == 3
+        assert trade_event.sell_remaining == 0
+
+    def test_cancel_and_unfilled_remainder(self):
+        ob = OrderBook("NVDA", enable_stp=False)
+        events = _record_all(ob.event_bus)
+
+        oid = ob.add_order("limit", "buy", 5, 100)
+        assert ob.cancel_order(oid)
+        assert not ob.cancel_order(oid)  # already cancelled
+
+        ob.add_order("limit", "sell", 3, 101)
+        ob.add_order("ioc", "buy", 5, 101)
+
+        cancels = [e for e in events if e.event_type is EventType.ORDER_CANCELLED]
+        assert [(c.reason, c.qty) for c in cancels] == [
+            (OrderCancelledEvent.REASON_USER, 5),
+            (OrderCancelledEvent.REASON_UNFILLED, 2),
+        ]
+
+    def test_rejection_event(self):
+        ob = OrderBook("NVDA", enable_stp=False)
+        events = _record_all(ob.event_bus)
+
+        ob.add_order("limit", "sell", 3, 101)
+        with pytest.raises(PostOnlyViolationError):
+            ob.add_order("post-only", "buy", 1, 101)
+
+        rejected = [e for e in events if e.event_type is EventType.ORDER_REJECTED]
+        assert len(rejected) == 1
+        assert rejected[0].reason == PostOnlyViolationError.error_code
+
+    def test_stop_triggered_event(self):
+        ob = OrderBook("NVDA", enable_stp=False)
+        events = _record_all(ob.event_bus)
+
+        stop_id = ob.add_order("stop-market", "buy", 1, stop_price=100)
+        ob.add_order("limit", "sell", 5, 100)
+        ob.add_order("limit", "buy", 1, 100)
+
+        triggered = [e for e in events if e.event_type is EventType.STOP_TRIGGERED]
+        assert [e.order.order_id for e in triggered] == [stop_id]
@@ -4,6 +4,7 @@ import pytest
 from htf_engine.errors.exchange_errors.permission_denied_error import (
     PermissionDeniedError,
 )
+from htf_engine.events.event_type import EventType
 
 
 class TestExchange:
@@ -29,8 +30,8 @@ class TestExchange:
         assert asks[20] == 0
         assert last_price is None
         assert last_quantity is None
-        assert ob_A.on_trade_callback is not None
-        assert ob_A.cleanup_discarded_order_callback is not None
+        assert ob_A.event_bus.has_subscribers(EventType.TRADE)
+        assert ob_A.event_bus.has_subscribers(EventType.ORDER_REJECTED)
 
         assert "Stock B" in exchange.order_books
         ob_B = exchange.order_books["Stock B"]
@@ -41,8 +42,8 @@ class TestExchange:
         assert asks[20] == 0
         assert last_price is None
         assert last_quantity is None
-        assert ob_B.on_trade_callback is not None
-        assert ob_B.cleanup_discarded_order_callback is not None
+        assert ob_B.event_bus.has_subscribers(EventType.TRADE)
+        assert ob_B.event_bus.has_subscribers(EventType.ORDER_REJECTED)
 
         assert "Stock C" in exchange.order_books
         ob_C = exchange.order_books["Stock C"]
@@ -53,8 +54,8 @@ class TestExchange:
         assert asks[20] == 0
         assert last_price is None
         assert last_quantity is None
-        assert ob_C.on_trade_callback is not None
-        assert ob_C.cleanup_discarded_order_callback is not None
+        assert ob_C.event_bus.has_subscribers(EventType.TRADE)
+        assert ob_C.event_bus.has_subscribers(EventType.ORDER_REJECTED)
 
         # Register 3 users
         exchange.register_user(u1)
@@ -0,0 +1,144 @@
+import pytest
+
+from htf_engine.errors.exchange_errors.fok_insufficient_liquidity_error import (
+    FOKInsufficientLiquidityError,
+)
+from htf_engine.errors.exchange_errors.instrument_not_found_error import (
+    InstrumentNotFoundError,
+)
+from htf_engine.errors.exchange_errors.invalid_order_price_error import (
+    InvalidOrderPriceError,
+)
+from htf_engine.errors.exchange_errors.invalid_stop_price_error import (
+    InvalidStopPriceError,
+)
+from htf_engine.errors.exchange_errors.order_exceeds_position_limit_error import (
+    OrderExceedsPositionLimitError,
+)
+from htf_engine.errors.exchange_errors.post_only_violation_error import (
+    PostOnlyViolationError,
+)
+from htf_engine.errors.exchange_errors.self_trade_prevention_error import (
+    SelfTradePreventionError,
+)
+from htf_engine.order_book import OrderBook
+from htf_engine.orders.execution_report import ExecutionReport
+
+
+class TestSubmitOrder:
+    def test_fills_are_reported(self):
+        ob = OrderBook("X", enable_stp=False)
+        ob.add_order("limit", "sell", 5, 100, user_id="a")
+        ob.add_order("limit", "sell", 5, 102, user_id="b")
+
+        report = ob.submit_order("limit", "buy", 12, 102, user_id="c")
+
+        assert report.status == ExecutionReport.PARTIALLY_FILLED
+        assert report.filled_qty == 10
+        assert report.remaining_qty == 2
+        assert report.avg_price == 101
+        assert [(t.price, t.qty) for t in report.fills] == [(100, 5), (102, 5)]
+        assert report.order_id in ob.order_map
+
+        assert ob.submit_order("market", "sell", 2, user_id="a").status == (
+            ExecutionReport.FILLED
+        )
+        assert ob.submit_order("ioc", "sell", 1, 90, user_id="a").status == (
+            ExecutionReport.CANCELLED
+        )
+        assert ob.submit_order("limit", "sell", 1, 110, user_id="a").status == (
+            ExecutionReport.RESTING
+        )
+        assert ob.submit_order(
+            "stop-market", "sell", 1, stop_price=90, user_id="a"
+        ).status == (ExecutionReport.PENDING)
+
+    def test_rejects_do_not_raise(self):
+        ob = OrderBook("X")
+        ob.add_order("limit", "sell", 5, 100, user_id="a")
+        ob.add_order("limit", "buy", 5, 90, user_id="a")
+        ob.add_order("limit", "buy", 1, 100, user_id="b")  # last price 100
+
+        cases: list[tuple[tuple, dict, str]] = [
+            (("fok", "buy", 10, 100), {}, FOKInsufficientLiquidityError.error_code),
+            (("post-only", "buy", 1, 100), {}, PostOnlyViolationError.error_code),
+            (
+                ("limit", "buy", 1, 100),
+                {"user_id": "a"},
+                SelfTradePreventionError.error_code,
+            ),
+            (
+                ("stop-limit", "buy", 1, 99),
+                {"stop_price": 95},
+                InvalidStopPriceError.error_code,
+            ),
+        ]
+        for args, kwargs, code in cases:
+            report = ob.submit_order(*args, **kwargs)
+            assert report.is_rejected
+            assert report.reject_code == code
+            assert report.filled_qty == 0 and report.fills == ()
+            assert report.order_id not in ob.order_map
+
+        assert ob.submit_order("limit", "buy", 0, 100).reject_code == (
+            "INVALID_ORDER_QUANTITY"
+        )
+        for args, kwargs in [
+            (("limit", "buy", 1, None), {}),
+            (("market", "buy", 1, 10), {}),
+            (("stop-market", "buy", 1, None), {}),
+            (("stop-limit", "buy", 1, 120), {}),
+        ]:
+            report = ob.submit_order(*args, **kwargs)
+            assert report.reject_code == InvalidOrderPriceError.error_code
+            assert report.order_id is None
+
+        # The raising API is unchanged
+        with pytest.raises(FOKInsufficientLiquidityError):
+            ob.add_order("fok", "buy", 10, 100)
+
+
+def test_user_submit_order_releases_rejected_reservation(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+
+    u2.place_order("Stock A", "limit", "sell", 3, 10)
+    report = u1.submit_order("Stock A", "fok", "buy", 5, 10)
+    assert report.reject_code == FOKInsufficientLiquidityError.error_code
+    assert u1.outstanding_buys["Stock A"] == 0
+
+    report = u1.submit_order("Stock A", "limit", "buy", 101, 10)
+    assert report.reject_code == OrderExceedsPositionLimitError.error_code
+
+    report = u1.submit_order("Stock A", "limit", "buy", 5, 10)
+    assert report.filled_qty == 3 and report.avg_price == 10
+    assert u1.positions["Stock A"] == 3
+    assert u1.outstanding_buys["Stock A"] == 2
+
+    report = u1.submit_order("Stock Z", "limit", "buy", 1, 10)
+    assert report.to_dict()["reject_code"] == "INSTRUMENT_NOT_FOUND"
+    assert "Stock Z" not in u1.outstanding_buys
+
+
+def test_malformed_orders_release_reservation(exchange, u1):
+    exchange.register_user(u1)
+
+    report = u1.submit_order("Stock A", "limit", "buy", 5)
+    assert report.reject_code == InvalidOrderPriceError.error_code
+    assert u1.outstanding_buys.get("Stock A", 0) == 0
+
+    with pytest.raises(InvalidOrderPriceError):
+        u1.place_order("Stock A", "market", "sell", 5, 10)
+    with pytest.raises(InstrumentNotFoundError):
+        u1.place_order("Stock Z", "limit", "sell", 5, 10)
+    assert u1.outstanding_sells.get("Stock A", 0) == 0
+    assert u1.outstanding_sells.get("Stock Z", 0) == 0
+
+    # A failure outside the exchange's own error handling is released too
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    u1.place_order_callback = broken
+    with pytest.raises(RuntimeError):
+        u1.place_order("Stock A", "limit", "buy", 5, 10)
+    assert u1.outstanding_buys.get("Stock A", 0) == 0
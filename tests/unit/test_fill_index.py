@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+from htf_engine.trades.fill_index import FillIndex
+from htf_engine.trades.trade import Trade
+
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _trade(i: int, buyer: str, seller: str) -> Trade:
+    return Trade(
+        timestamp=T0 + timedelta(seconds=i),
+        price=100 + i,
+        qty=1,
+        buy_user_id=buyer,
+        sell_user_id=seller,
+        buy_order_id=f"b{i}",
+        sell_order_id=f"s{i}",
+        aggressor="buy",
+    )
+
+
+class TestFillIndex:
+    def test_time_range_pagination(self):
+        index = FillIndex()
+        for i in range(10):
+            index.add(_trade(i, "a", "b" if i % 2 else "c"), "X" if i < 5 else "Y")
+
+        fills = index.query(
+            "a", start=T0 + timedelta(seconds=2), end=T0 + timedelta(seconds=8)
+        )
+        assert [t.price for t, _ in fills] == [102, 103, 104, 105, 106, 107]
+
+        page = index.query("a", start=T0 + timedelta(seconds=2), limit=3, offset=3)
+        assert [t.price for t, _ in page] == [105, 106, 107]
+
+        assert [t.price for t, _ in index.query("a", "Y", limit=2)] == [105, 106]
+        assert [t.price for t, _ in index.query("b")] == [101, 103, 105, 107, 109]
+        assert index.count("c", "X") == 3
+        assert index.query("nobody") == []
+
+    def test_self_trade_indexed_once(self):
+        index = FillIndex()
+        index.add(_trade(0, "a", "a"), "X")
+        assert index.count("a") == 1
+
+
+def test_exchange_user_fills(exchange, u1, u2, u3):
+    for u in (u1, u2, u3):
+        exchange.register_user(u)
+
+    u2.place_order("Stock A", "limit", "sell", 5, 10)
+    u3.place_order("Stock B", "limit", "sell", 5, 20)
+    u1.place_order("Stock A", "limit", "buy", 2, 10)
+    u1.place_order("Stock B", "market", "buy", 3)
+
+    fills = exchange.get_user_fills(u1.user_id)
+    assert [(f["instrument"], f["qty"], f["liquidity"]) for f in fills] == [
+        ("Stock A", 2, "taker"),
+        ("Stock B", 3, "taker"),
+    ]
+
+    fills = exchange.get_user_fills(u2.user_id, "Stock A")
+    assert fills[0]["side"] == "sell" and fills[0]["liquidity"] == "maker"
+    assert exchange.get_user_fills(u2.user_id, "Stock B") == []
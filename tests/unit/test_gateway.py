@@ -0,0 +1,177 @@
+import asyncio
+import threading
+
+from htf_engine.exchange import Exchange
+from htf_engine.gateway.codec import FrameDecoder, Message, encode
+from htf_engine.gateway.messages import (
+    CancelOrderRequest,
+    FillReport,
+    ModifyOrderRequest,
+    NewOrderRequest,
+    OrderAck,
+)
+from htf_engine.gateway.order_gateway import OrderGateway
+from htf_engine.order_book import OrderBook
+from htf_engine.sequencer.sequencer import Sequencer
+from htf_engine.user.user import User
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.decoder = FrameDecoder()
+        self.received: list = []
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    def send(self, *msgs):
+        self.writer.write(b"".join(encode(m) for m in msgs))
+
+    async def receive(self, n):
+        while len(self.received) < n:
+            data = await asyncio.wait_for(self.reader.read(65536), 5)
+            assert data, "gateway closed the connection"
+            self.received += self.decoder.feed(data)
+        out, self.received = self.received[:n], self.received[n:]
+        return out
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def make_exchange():
+    exchange = Exchange()
+    exchange.add_order_book("A", OrderBook("A", enable_stp=False))
+    exchange.register_user(User("u1", "User 1", 10_000))
+    exchange.register_user(User("u2", "User 2", 10_000))
+    return exchange
+
+
+def test_codec_round_trip_across_split_frames():
+    msgs: list[Message] = [
+        NewOrderRequest(1, "u1", "A", "stop-limit", "sell", 5, 99.5, 100.0),
+        NewOrderRequest(2, "u1", "A", "market", "buy", 3),
+        CancelOrderRequest(3, "u1", "A", "oid-1"),
+        ModifyOrderRequest(4, "u1", "A", "oid-2", 7, 101.25),
+        OrderAck(5, "rejected", None, 0, 3, "ORDER_NOT_FOUND"),
+        OrderAck(6, "partially_filled", "oid-3", 2, 1),
+        FillReport(7, "oid-3", 100.5, 2, 1),
+    ]
+    stream = b"".join(encode(m) for m in msgs)
+
+    decoder = FrameDecoder()
+    decoded = []
+    for i in range(0, len(stream), 7):
+        decoded += decoder.feed(stream[i : i + 7])
+
+    assert decoded == msgs
+
+
+def test_pipelined_orders_acks_and_fills():
+    async def scenario():
+        exchange = make_exchange()
+        async with OrderGateway(exchange) as gateway:
+            maker = await Client.connect(gateway.port)
+            taker = await Client.connect(gateway.port)
+
+            # Three requests pipelined in one write
+            maker.send(
+                NewOrderRequest(1, "u1", "A", "limit", "sell", 5, 100),
+                NewOrderRequest(2, "u1", "A", "limit", "sell", 5, 101),
+                NewOrderRequest(3, "nobody", "A", "limit", "sell", 1, 101),
+            )
+            ack1, ack2, ack3 = await maker.receive(3)
+            assert (ack1.client_order_id, ack1.status) == (1, "resting")
+            assert ack2.client_order_id == 2
+            assert (ack3.status, ack3.reject_code) == ("rejected", "USER_NOT_FOUND")
+
+            taker.send(NewOrderRequest(10, "u2", "A", "market", "buy", 7))
+            ack, fill_a, fill_b = await taker.receive(3)
+            assert (ack.status, ack.filled_qty) == ("filled", 7)
+            assert (fill_a.price, fill_a.qty, fill_a.remaining_qty) == (100, 5, 2)
+            assert (fill_b.price, fill_b.qty, fill_b.remaining_qty) == (101, 2, 0)
+
+            maker_fills = await maker.receive(2)
+            assert [
+                (f.client_order_id, f.qty, f.remaining_qty) for f in maker_fills
+            ] == [
+                (1, 5, 0),
+                (2, 2, 3),
+            ]
+
+            maker.send(
+                ModifyOrderRequest(4, "u1", "A", ack2.order_id, 2, 101),
+                CancelOrderRequest(5, "u2", "A", ack2.order_id),  # not u2's order
+            )
+            modified, foreign = await maker.receive(2)
+            assert (modified.status, modified.remaining_qty) == ("modified", 2)
+            assert foreign.reject_code == "ORDER_NOT_FOUND"
+
+            maker.send(CancelOrderRequest(6, "u1", "A", modified.order_id))
+            (cancelled,) = await maker.receive(1)
+            assert cancelled.status == "cancelled"
+            assert exchange.users["u1"].get_outstanding_sells().get("A", 0) == 0
+
+            await maker.close()
+            await taker.close()
+
+    asyncio.run(scenario())
+
+
+def test_triggered_stop_fills_are_reported():
+    async def scenario():
+        exchange = make_exchange()
+        async with OrderGateway(exchange) as gateway:
+            client = await Client.connect(gateway.port)
+
+            client.send(
+                NewOrderRequest(1, "u1", "A", "stop-market", "buy", 2, None, 100)
+            )
+            (ack,) = await client.receive(1)
+            assert ack.status == "pending"
+
+            # A trade at 100 (between u2 and u2) releases the stop into the asks
+            exchange.users["u2"].place_order("A", "limit", "sell", 2, 101)
+            exchange.users["u2"].place_order("A", "limit", "sell", 1, 100)
+            exchange.users["u2"].place_order("A", "limit", "buy", 1, 100)
+
+            (fill,) = await client.receive(1)
+            assert (fill.client_order_id, fill.price, fill.qty) == (1, 101, 2)
+            assert fill.remaining_qty == 0
+            assert fill.order_id != ack.order_id
+            assert not gateway._orders
+
+            await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_backpressure_holds_requests_while_engine_queue_is_full():
+    async def scenario():
+        exchange = make_exchange()
+        sequencer = Sequencer(exchange, capacity=1)
+        release = threading.Event()
+        sequencer.submit(release.wait)  # occupies the engine thread
+        sequencer.submit(lambda: None)  # fills the queue
+
+        try:
+            async with OrderGateway(exchange, sequencer=sequencer) as gateway:
+                client = await Client.connect(gateway.port)
+                client.send(NewOrderRequest(1, "u1", "A", "limit", "buy", 1, 99))
+
+                await asyncio.sleep(0.05)
+                assert client.received == []
+
+                release.set()
+                (ack,) = await client.receive(1)
+                assert ack.status == "resting"
+                await client.close()
+        finally:
+            release.set()
+            sequencer.close()
+
+    asyncio.run(scenario())
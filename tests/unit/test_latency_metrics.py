@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from htf_engine.errors.exchange_errors.instrument_not_found_error import (
+    InstrumentNotFoundError,
+)
+from htf_engine.metrics.latency_histogram import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(1)
+        values = [int(rng.lognormvariate(9, 1.5)) for _ in range(50_000)]
+        h = LatencyHistogram()
+        for v in values:
+            h.record(v)
+
+        values.sort()
+        for p in (50, 90, 99, 99.9):
+            exact = values[int(p / 100 * len(values)) - 1]
+            assert h.percentile(p) == pytest.approx(exact, rel=0.035)
+
+        assert (h.count, h.min, h.max) == (len(values), values[0], values[-1])
+        assert h.percentile(100) == values[-1]
+
+    def test_small_values_are_exact_and_merge_adds(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for v in range(10):
+            a.record(v)
+        for v in range(10, 20):
+            b.record(v)
+
+        a.merge(b)
+        assert a.count == 20 and a.total == sum(range(20))
+        assert (a.min, a.max, a.percentile(50)) == (0, 19, 9)
+
+        a.reset()
+        assert a.count == 0 and a.percentile(50) is None
+        assert a.to_dict()["p99_us"] is None
+
+
+def test_disabled_by_default_and_toggleable(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+
+    u1.place_order("Stock A", "limit", "sell", 5, 100)
+    assert exchange.get_latency_metrics() == {}
+
+    exchange.enable_latency_metrics()
+    u2.place_order("Stock A", "market", "buy", 2)
+    u2.place_order("Stock B", "limit", "buy", 1, 50)
+    exchange.get_L1_data(u1.user_id, "Stock A")
+
+    metrics = exchange.get_latency_metrics()
+    assert metrics["add_order"]["Stock A"]["count"] == 1
+    assert metrics["add_order"]["*"]["count"] == 2
+    assert metrics["execute_match"]["Stock A"]["count"] == 1
+    assert metrics["process_trade"]["Stock A"]["count"] == 1
+    assert metrics["settle_trades"]["Stock A"]["count"] == 1
+    assert metrics["get_L1_data"]["Stock A"]["count"] == 1
+    assert metrics["check_stop_orders"]["Stock A"]["p50_us"] > 0
+
+    only_b = exchange.get_latency_metrics("add_order", "Stock B")
+    assert list(only_b) == ["add_order"]
+    assert list(only_b["add_order"]) == ["Stock B", "*"]
+
+    exchange.enable_latency_metrics(False)
+    u2.place_order("Stock A", "market", "buy", 1)
+    assert exchange.get_latency_metrics()["add_order"]["*"]["count"] == 2
+
+    exchange.reset_latency_metrics()
+    assert exchange.get_latency_metrics() == {}
+
+    with pytest.raises(InstrumentNotFoundError):
+        exchange.get_latency_metrics(inst="Stock Z")
@@ -0,0 +1,141 @@
+import pytest
+
+from htf_engine.errors.exchange_errors.invalid_leverage_error import (
+    InvalidLeverageError,
+)
+from htf_engine.risk.liquidation_engine import LiquidationEngine
+
+
+class TestLiquidationEngine:
+    def test_only_crossed_positions_trigger(self):
+        engine = LiquidationEngine(maintenance_margin=0.0)
+        engine.update_mark("A", 100)
+
+        for i in range(1, 11):
+            engine.set_leverage(f"long{i}", i + 1)
+            engine.set_leverage(f"short{i}", i + 1)
+            engine.update_position(f"long{i}", "A", 1, 100)
+            engine.update_position(f"short{i}", "A", -1, 100)
+
+        # long at leverage L liquidates at 100 * (1 - 1/L)
+        assert engine.get_liquidation_price("long1", "A") == 50
+        assert engine.get_liquidation_price("short1", "A") == 150
+
+        engine.update_mark("A", 95)
+        assert not engine.triggered
+
+        engine.update_mark("A", 90.5)
+        assert list(engine.triggered) == [("long10", "A")]
+
+        engine.triggered.clear()
+        engine.update_mark("A", 76)
+        assert list(engine.triggered) == [(f"long{i}", "A") for i in range(9, 3, -1)]
+
+        engine.triggered.clear()
+        engine.update_mark("A", 125)
+        assert set(engine.triggered) == {(f"short{i}", "A") for i in range(3, 11)}
+        assert engine.get_liquidation_price("short3", "A") is None
+        assert engine.get_liquidation_price("short2", "A") == pytest.approx(400 / 3)
+
+    def test_repositioned_entries_are_superseded(self):
+        engine = LiquidationEngine(maintenance_margin=0.0)
+        engine.set_leverage("u1", 2)
+        engine.set_leverage("u2", 2)
+        engine.update_position("u1", "A", 10, 100)  # liq 50
+        engine.update_position("u1", "A", 10, 60)  # liq 30
+        engine.update_position("u2", "A", 5, 100)
+
+        engine.update_mark("A", 45)
+        assert list(engine.triggered) == [("u2", "A")]
+
+        engine.update_position("u1", "A", 0, 0.0)
+        engine.update_mark("A", 10)
+        assert list(engine.triggered) == [("u2", "A")]
+
+    def test_unleveraged_positions_are_not_indexed(self):
+        engine = LiquidationEngine()
+        engine.update_position("u1", "A", 10, 100)
+        engine.set_leverage("u1", 1)
+        engine.update_position("u1", "A", 10, 100)  # long at 1x never liquidates
+
+        engine.update_mark("A", 1)
+        assert not engine.triggered
+
+        with pytest.raises(InvalidLeverageError):
+            engine.set_leverage("u1", 0.5)
+
+
+def test_exchange_liquidates_crossed_account(exchange, u1, u2, u3):
+    for u in (u1, u2, u3):
+        u.cash_in(100_000)
+        exchange.register_user(u)
+
+    u2.place_order("Stock A", "limit", "sell", 10, 100)
+    u1.place_order("Stock A", "limit", "buy", 10, 100)
+
+    exchange.set_leverage(u1.user_id, 5, "Stock A")
+    liq_price = exchange.get_liquidation_price(u1.user_id, "Stock A")
+    assert liq_price == pytest.approx(100 * 0.8 / 0.95)
+
+    u3.place_order("Stock A", "limit", "buy", 20, 80)
+
+    # A trade above the liquidation price leaves the account alone
+    u2.place_order("Stock A", "limit", "sell", 1, 85)
+    u3.place_order("Stock A", "limit", "buy", 1, 85)
+    assert u1.positions["Stock A"] == 10
+
+    # Trading through it closes the position against the resting bid
+    u2.place_order("Stock A", "limit", "sell", 1, 84)
+    u3.place_order("Stock A", "limit", "buy", 1, 84)
+    assert "Stock A" not in u1.positions
+    assert u1.outstanding_sells["Stock A"] == 0
+    assert u3.positions["Stock A"] == 12
+    assert exchange.get_liquidation_price(u1.user_id, "Stock A") is None
+
+
+def test_failed_close_out_never_raises_into_aggressor(exchange, u1, u2, u3):
+    for u in (u1, u2, u3):
+        u.cash_in(100_000)
+        exchange.register_user(u)
+
+    u2.place_order("Stock A", "limit", "sell", 10, 100)
+    u1.place_order("Stock A", "limit", "buy", 10, 100)
+    exchange.set_leverage(u1.user_id, 10, "Stock A")  # liquidates below ~94.7
+
+    u3.place_order("Stock A", "limit", "buy", 1, 93)
+
+    # With no bid left the close-out is cancelled unfilled, so it stays queued
+    u2.place_order("Stock A", "limit", "sell", 1, 93)
+    assert u1.positions["Stock A"] == 10
+    assert list(exchange.liquidation_engine.triggered) == [(u1.user_id, "Stock A")]
+    assert u1.outstanding_sells["Stock A"] == 0
+
+    # Once there is liquidity the next inbound order retries it
+    u3.place_order("Stock A", "limit", "buy", 20, 90)
+    assert "Stock A" not in u1.positions
+    assert not exchange.liquidation_engine.triggered
+    assert u1.outstanding_sells["Stock A"] == 0
+
+
+def test_close_out_pulls_own_bids_and_retries(exchange, u1, u2, u3):
+    for u in (u1, u2, u3):
+        u.cash_in(100_000)
+        exchange.register_user(u)
+
+    u2.place_order("Stock A", "limit", "sell", 10, 100)
+    u1.place_order("Stock A", "limit", "buy", 10, 100)
+    exchange.set_leverage(u1.user_id, 10, "Stock A")  # liquidates below ~94.7
+
+    u1.place_order("Stock A", "limit", "buy", 5, 92)  # the account's own bid
+    u3.place_order("Stock A", "limit", "buy", 1, 93)
+    u3.place_order("Stock A", "limit", "buy", 20, 91)
+
+    # The close-out first hits STP on u1's 92 bid, which is pulled, and the
+    # retry sells into u3's 91 bid
+    u2.place_order("Stock A", "limit", "sell", 1, 93)
+    assert "Stock A" not in u1.positions
+    assert not exchange.liquidation_engine.triggered
+    assert u3.positions["Stock A"] == 11
+    assert exchange.order_books["Stock A"].best_bid() == 91
+    assert u1.outstanding_buys["Stock A"] == 0
+    assert u1.outstanding_sells["Stock A"] == 0
@@ -0,0 +1,119 @@
+import random
+import pytest
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
+from htf_engine.risk.mark_to_market import MarkToMarket
+from htf_engine.user.user import User
+
+
+class TestMarkToMarket:
+    def test_price_move_revalues_holders_only(self):
+        mtm = MarkToMarket()
+        mtm.update_mark("A", 10)
+        mtm.update_position("u1", "A", 5, 8)
+        mtm.update_position("u2", "A", -5, 12)
+        mtm.update_position("u3", "B", 3, 100)
+
+        assert mtm.get_unrealised_pnl("u1") == 10
+        assert mtm.get_unrealised_pnl("u2") == 10
+        assert mtm.get_exposure("u1") == 50
+        assert mtm.get_unrealised_pnl("u3") == 0  # B has no mark yet
+
+        mtm.update_mark("A", 11)
+        assert mtm.get_unrealised_pnl("u1") == 15
+        assert mtm.get_unrealised_pnl("u2") == 5
+        assert mtm.get_exposure("u2") == 55
+
+        mtm.update_mark("B", 90)
+        assert mtm.get_unrealised_pnl("u3") == -30
+        assert mtm.get_exposure("u3") == 270
+
+        assert dict(mtm.get_holders("A")) == {"u1": (5, 8), "u2": (-5, 12)}
+        assert mtm.top_exposures(1) == [("u3", 270)]
+
+    def test_top_exposures_in_instrument_follow_marks(self):
+        mtm = MarkToMarket()
+        assert mtm.top_exposures(2, "A") == []
+
+        mtm.update_position("u1", "A", 5, 8)
+        mtm.update_position("u2", "A", -7, 12)
+        mtm.update_position("u3", "A", 2, 9)
+        mtm.update_position("u4", "B", 100, 1)
+        assert mtm.top_exposures(2, "A") == []  # no mark yet
+
+        mtm.update_mark("A", 10)
+        assert mtm.top_exposures(2, "A") == [("u2", 70), ("u1", 50)]
+
+        mtm.update_position("u2", "A", 7, 11)  # flipped, same size
+        mtm.update_position("u3", "A", 9, 9)
+        mtm.update_mark("A", 20)
+        assert mtm.top_exposures(2, "A") == [("u3", 180), ("u2", 140)]
+
+        mtm.update_position("u3", "A", 0, 0.0)
+        assert mtm.top_exposures(5, "A") == [("u2", 140), ("u1", 100)]
+
+    def test_closing_position_removes_holder(self):
+        mtm = MarkToMarket()
+        mtm.update_mark("A", 10)
+        mtm.update_position("u1", "A", 5, 8)
+        mtm.update_position("u1", "A", 0, 0.0)
+
+        assert dict(mtm.get_holders("A")) == {}
+        assert dict(mtm.all_unrealised_pnl()) == {}
+        assert mtm.get_unrealised_pnl("u1") == 0
+        assert mtm.get_exposure("u1") == 0
+
+
+def test_exchange_incremental_matches_full_revaluation(exchange):
+    rng = random.Random(7)
+    users = [User(f"u{i}", f"User {i}", 1_000_000) for i in range(6)]
+    for u in users:
+        exchange.register_user(u)
+
+    instruments = ["Stock A", "Stock B"]
+    for _ in range(400):
+        u = rng.choice(users)
+        try:
+            u.place_order(
+                rng.choice(instruments),
+                "limit",
+                rng.choice(["buy", "sell"]),
+                rng.randint(1, 10),
+                rng.randint(95, 105) + rng.choice([0, 0.25, 0.5]),
+            )
+        except ExchangeError:
+            pass
+
+    for u in users:
+        expected_pnl = sum(
+            exchange.get_user_unrealised_pnl_for_inst(u.user_id, inst)
+            for inst in u.positions
+        )
+        expected_exposure = sum(
+            exchange.get_user_exposure_for_inst(u.user_id, inst) for inst in u.positions
+        )
+        assert exchange.get_user_unrealised_pnl(u.user_id) == pytest.approx(
+            expected_pnl
+        )
+        assert exchange.get_user_exposure(u.user_id) == pytest.approx(expected_exposure)
+
+    holders = exchange.get_holders("Stock A")
+    assert set(holders) == {u.user_id for u in users if "Stock A" in u.positions}
+
+    top = exchange.get_top_exposures(3)
+    assert [e for _, e in top] == sorted(
+        (exchange.get_user_exposure(u.user_id) for u in users), reverse=True
+    )[:3]
+
+    for inst in instruments:
+        top = exchange.get_top_exposures(3, inst)
+        assert [e for _, e in top] == pytest.approx(
+            sorted(
+                (
+                    exchange.get_user_exposure_for_inst(u.user_id, inst)
+                    for u in users
+                    if inst in u.positions
+                ),
+                reverse=True,
+            )[:3]
+        )
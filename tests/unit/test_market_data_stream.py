@@ -0,0 +1,78 @@
+import http.client
+import json
+
+from htf_engine.market_data.sse_server import SSEServer
+
+
+def parse(message):
+    event, data = message.decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_updates_carry_level_deltas_and_trades(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+    u1.place_order("Stock A", "limit", "buy", 5, 99)
+
+    publisher = exchange.enable_market_data_stream()
+    sub = publisher.subscribe("Stock A")
+
+    event, snapshot = parse(sub.get(0))
+    assert event == "snapshot"
+    assert snapshot["bids"] == [[99, 5]] and snapshot["seq"] == 0
+
+    u1.place_order("Stock A", "limit", "buy", 2, 99)
+    u2.place_order("Stock A", "limit", "sell", 4, 101)
+    u2.place_order("Stock B", "limit", "sell", 1, 50)  # other instrument
+    u2.place_order("Stock A", "market", "sell", 6)
+
+    updates = [parse(sub.get(0)) for _ in range(3)]
+    assert sub.get(0) is None
+    assert [u["seq"] for _, u in updates] == [1, 2, 3]
+    assert updates[0][1]["bids"] == [[99, 7]]
+    assert updates[1][1]["asks"] == [[101, 4]]
+
+    _, fill = updates[2]
+    assert fill["bids"] == [[99, 1]]
+    assert [(t["price"], t["qty"]) for t in fill["trades"]] == [(99, 5), (99, 1)]
+    assert (fill["best_bid"], fill["best_ask"]) == (99, 101)
+
+    # A late subscriber starts from the publisher's aggregated book
+    _, late = parse(publisher.subscribe("Stock A").get(0))
+    assert late["bids"] == [[99, 1]] and late["asks"] == [[101, 4]]
+    assert (late["seq"], late["last_price"], late["last_qty"]) == (3, 99, 1)
+
+
+def test_update_is_encoded_once_and_slow_consumers_dropped(exchange, u1):
+    exchange.register_user(u1)
+    publisher = exchange.enable_market_data_stream(max_pending=2)
+    fast = [publisher.subscribe("Stock A") for _ in range(3)]
+    slow = publisher.subscribe()  # also receives 3 snapshots
+
+    u1.place_order("Stock A", "limit", "buy", 1, 10)
+
+    updates = [s.get(0) for s in fast for _ in range(2)][1::2]
+    assert updates[0] is updates[1] is updates[2]
+
+    assert slow.closed and slow not in publisher.subscribers
+
+
+def test_sse_server_streams_to_http_client(exchange, u1):
+    exchange.register_user(u1)
+    publisher = exchange.enable_market_data_stream()
+
+    with SSEServer(publisher) as server:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        conn.request("GET", "/stream?instrument=Stock%20C")
+        response = conn.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+
+        def next_event():
+            lines = [response.readline(), response.readline(), response.readline()]
+            return parse(b"".join(lines))
+
+        assert next_event()[0] == "snapshot"
+        u1.place_order("Stock C", "limit", "sell", 3, 20)
+        assert next_event()[1]["asks"] == [[20, 3]]
+
+        conn.close()
@@ -0,0 +1,94 @@
+from collections import Counter
+from itertools import islice
+
+import pytest
+
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.simulation.order_command import OrderCommand
+from htf_engine.simulation.order_flow_config import OrderFlowConfig
+from htf_engine.simulation.order_flow_file import read_order_flow, write_order_flow
+from htf_engine.simulation.order_flow_generator import OrderFlowGenerator
+from htf_engine.simulation.order_flow_replayer import OrderFlowReplayer
+
+
+def test_same_seed_gives_same_flow():
+    a = list(OrderFlowGenerator(OrderFlowConfig(seed=7)).generate(2000))
+    b = list(OrderFlowGenerator(OrderFlowConfig(seed=7)).generate(2000))
+    c = list(OrderFlowGenerator(OrderFlowConfig(seed=8)).generate(2000))
+
+    assert a == b
+    assert a != c
+
+
+def test_flow_shape():
+    config = OrderFlowConfig(seed=1, arrival_rate=1000, tick_size=0.05)
+    commands = list(OrderFlowGenerator(config).generate(20_000))
+
+    actions = Counter(c.action for c in commands)
+    assert actions[OrderCommand.CANCEL] > 0.3 * len(commands)
+    assert actions[OrderCommand.MODIFY] > 0
+
+    places = [c for c in commands if c.action == OrderCommand.PLACE]
+    assert {c.order_type for c in places} == set(config.order_type_mix)
+    assert {c.instrument for c in places} == set(config.instruments)
+
+    # Power-law sizes: mostly small, with a long tail
+    sizes = sorted(c.qty for c in places)
+    assert sizes[len(sizes) // 2] <= 2 and sizes[-1] >= 100
+
+    # Prices on the tick grid, clustered near the touch
+    for c in places:
+        for price in (c.price, c.stop_price):
+            if price is not None:
+                assert price / 0.05 == pytest.approx(round(price / 0.05))
+
+    # Poisson arrivals: mean gap close to 1 / rate
+    assert commands[-1].timestamp / len(commands) == pytest.approx(1e-3, rel=0.05)
+
+    # Cancels and modifies only target earlier resting orders
+    placed = {c.seq: c for c in places}
+    for c in commands:
+        if c.action != OrderCommand.PLACE:
+            assert c.ref is not None and c.ref < c.seq
+            assert placed[c.ref].order_type in ("limit", "post-only")
+            assert placed[c.ref].user_id == c.user_id
+
+
+def test_generator_state_stays_bounded():
+    config = OrderFlowConfig(
+        seed=3, cancel_ratio=0.05, modify_ratio=0, max_live_orders=50
+    )
+    generator = OrderFlowGenerator(config)
+
+    for _ in islice(generator.generate(), 20_000):
+        pass
+
+    assert len(generator._live) == 50
+
+
+@pytest.mark.parametrize("name", ["flow.tsv", "flow.tsv.gz"])
+def test_file_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    commands = list(OrderFlowGenerator(OrderFlowConfig(seed=4)).generate(500))
+
+    assert write_order_flow(path, iter(commands)) == 500
+    assert list(read_order_flow(path)) == commands
+
+
+def test_replay_into_exchange_and_order_book():
+    config = OrderFlowConfig(seed=5, instruments=("A", "B"))
+
+    exchange = Exchange()
+    exchange.add_order_book("A", OrderBook("A"))
+    exchange.add_order_book("B", OrderBook("B"))
+    stats = OrderFlowReplayer(exchange).run(OrderFlowGenerator(config), 3000)
+
+    assert stats["placed"] > 1000 and stats["cancelled"] > 500
+    assert len(exchange.users) == config.n_users
+    for user in exchange.users.values():
+        assert all(v >= 0 for v in user.get_outstanding_buys().values())
+
+    ob = OrderBook("A")
+    stats = OrderFlowReplayer(ob).run(OrderFlowGenerator(config), 3000)
+    assert stats["skipped"] > 0 and stats["placed"] > 0
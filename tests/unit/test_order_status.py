@@ -0,0 +1,113 @@
+import pytest
+
+from htf_engine.errors.exchange_errors.fok_insufficient_liquidity_error import (
+    FOKInsufficientLiquidityError,
+)
+from htf_engine.errors.exchange_errors.order_not_found_error import (
+    OrderNotFoundError,
+)
+from htf_engine.events.order_cancelled_event import OrderCancelledEvent
+from htf_engine.order_book import OrderBook
+from htf_engine.orders.order_status import OrderStatus
+from htf_engine.orders.order_status_table import OrderStatusTable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _book(table: OrderStatusTable) -> OrderBook:
+    ob = OrderBook("X", enable_stp=False)
+    table.attach(ob)
+    return ob
+
+
+def _status(table: OrderStatusTable, order_id: str) -> OrderStatus:
+    status = table.get(order_id)
+    assert status is not None
+    return status
+
+
+class TestOrderStatusTable:
+    def test_lifecycle(self):
+        table = OrderStatusTable()
+        ob = _book(table)
+
+        resting = ob.add_order("limit", "sell", 10, 100, user_id="a")
+        assert _status(table, resting).state == OrderStatus.NEW
+
+        taker = ob.add_order("limit", "buy", 4, 100, user_id="b")
+        status = _status(table, resting)
+        assert status.state == OrderStatus.PARTIALLY_FILLED
+        assert (status.filled_qty, status.leaves_qty) == (4, 6)
+        assert _status(table, taker).state == OrderStatus.FILLED
+        assert _status(table, taker).avg_price == 100
+
+        ob.add_order("limit", "buy", 6, 101, user_id="b")
+        status = _status(table, resting)
+        assert status.state == OrderStatus.FILLED
+        assert status.original_qty == 10
+
+        ob.add_order("limit", "sell", 1, 105, user_id="a")
+        ioc = ob.add_order("ioc", "buy", 3, 105, user_id="b")
+        status = _status(table, ioc)
+        assert status.state == OrderStatus.CANCELLED
+        assert status.reason == OrderCancelledEvent.REASON_UNFILLED
+        assert (status.filled_qty, status.leaves_qty) == (1, 0)
+
+        with pytest.raises(FOKInsufficientLiquidityError):
+            ob.add_order("fok", "buy", 3, 105, user_id="b")
+        rejected = [s for s in table._terminal.values() if s.order_type == "fok"]
+        assert rejected[0].reason == FOKInsufficientLiquidityError.error_code
+
+        stop = ob.add_order("stop-market", "buy", 1, stop_price=106, user_id="b")
+        ob.add_order("limit", "sell", 1, 106, user_id="a")
+        ob.add_order("limit", "buy", 1, 106, user_id="c")
+        assert _status(table, stop).state == OrderStatus.TRIGGERED
+        child = _status(table, stop).child_order_id
+        assert child is not None and table.get(child) is not None
+
+    def test_terminal_eviction_by_count_and_age(self):
+        clock = FakeClock()
+        table = OrderStatusTable(max_terminal=3, terminal_ttl=10, clock=clock)
+        ob = _book(table)
+
+        ids = [ob.add_order("limit", "sell", 1, 100, user_id="a") for _ in range(5)]
+        live = ob.add_order("limit", "sell", 1, 200, user_id="a")
+        for order_id in ids:
+            ob.cancel_order(order_id)
+
+        assert [table.get(i) is not None for i in ids] == [
+            False,
+            False,
+            True,
+            True,
+            True,
+        ]
+
+        clock.now = 5
+        table.get(ids[2])  # reading refreshes LRU order, not age
+        clock.now = 11
+        assert table.get(ids[3]) is None
+        assert _status(table, live).state == OrderStatus.NEW  # live orders never expire
+
+
+def test_exchange_order_status_is_per_user(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+
+    oid = u1.place_order("Stock A", "limit", "buy", 5, 10)
+    u1.modify_order("Stock A", oid, 3, 10)
+    u2.place_order("Stock A", "market", "sell", 3)
+
+    status = exchange.get_order_status(u1.user_id, oid)
+    assert status["state"] == OrderStatus.FILLED
+    assert status["filled_qty"] == 3
+    assert status["leaves_qty"] == 0
+
+    with pytest.raises(OrderNotFoundError):
+        exchange.get_order_status(u2.user_id, oid)
@@ -0,0 +1,98 @@
+import random
+from typing import Optional
+from collections import deque
+
+from htf_engine.errors.exchange_errors.exchange_error import ExchangeError
+from htf_engine.order_book import OrderBook
+from htf_engine.orders.price_ladder import PriceLadder
+
+
+class TestPriceLadder:
+    def test_behaves_like_a_dict_across_recentres(self):
+        rng = random.Random(3)
+        ladder = PriceLadder(0.25, window=16)
+        expected: dict = {}
+
+        for step in range(3000):
+            price = rng.randint(0, 200) * 0.25
+            if rng.random() < 0.05:
+                price += 0.1  # off tick: may collide with an on-tick level
+            op = rng.random()
+            if op < 0.5:
+                level: deque = deque()
+                ladder[price] = level
+                expected[price] = level
+            elif op < 0.8 and price in expected:
+                del ladder[price]
+                del expected[price]
+            elif op < 0.9:
+                ladder.maybe_recenter(price)
+            else:
+                assert (price in ladder) == (price in expected)
+                assert ladder.get(price) is expected.get(price)
+
+            if step % 100 == 0:
+                assert list(ladder) == sorted(expected)
+                assert list(ladder.iter_prices(descending=True)) == sorted(
+                    expected, reverse=True
+                )
+                assert len(ladder) == len(expected)
+
+        for price, level in expected.items():
+            assert ladder[price] is level
+
+    def test_missing_level_is_created_like_defaultdict(self):
+        ladder = PriceLadder(1.0, window=8)
+        assert 100 not in ladder and ladder.get(100) is None
+
+        near = ladder[100]
+        far = ladder[1000]  # outside the window: sparse
+        assert list(ladder.items()) == [(100, near), (1000, far)]
+        assert ladder[100] is near
+
+        ladder.recenter(1000)
+        assert ladder[1000] is far and ladder[100] is near
+        assert list(ladder) == [100, 1000]
+
+
+def test_ladder_book_matches_plain_book():
+    rng = random.Random(11)
+    plain = OrderBook("X")
+    laddered = OrderBook("X", tick_size=0.5, ladder_window=32)
+    ids: dict[str, str] = {}
+
+    for i in range(1500):
+        side = rng.choice(["buy", "sell"])
+        user = f"u{rng.randint(1, 4)}"
+        price = 100 + rng.randint(-40, 40) * 0.5 + (i // 300) * 10
+        order_type = rng.choice(["limit", "limit", "limit", "ioc", "fok"])
+        qty = rng.randint(1, 20)
+
+        if rng.random() < 0.25 and ids:
+            plain_id = rng.choice(list(ids))
+            plain.cancel_order(plain_id)
+            laddered.cancel_order(ids.pop(plain_id))
+            continue
+
+        results: list[Optional[str]] = []
+        for ob in (plain, laddered):
+            try:
+                results.append(ob.add_order(order_type, side, qty, price, user))
+            except ExchangeError:
+                results.append(None)
+
+        if results[0] is not None and results[1] is not None:
+            ids[results[0]] = results[1]
+
+    def levels(ob):
+        # Order ids differ between books, so compare (price, [qty, ...]) only
+        snap = ob.snapshot()
+        return [
+            [(price, [o[3] for o in orders]) for price, orders in snap[side]]
+            for side in ("bids", "asks")
+        ] + [snap["best_bid"], snap["best_ask"], snap["last_price"]]
+
+    assert levels(plain) == levels(laddered)
+    assert [(t.price, t.qty) for t in plain.trade_log.retrieve_log()] == [
+        (t.price, t.qty) for t in laddered.trade_log.retrieve_log()
+    ]
@@ -0,0 +1,90 @@
+import pytest
+
+from htf_engine.errors.exchange_errors.rate_limit_exceeded_error import (
+    RateLimitExceededError,
+)
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.risk.rate_limit import RateLimit
+from htf_engine.risk.rate_limiter import RateLimiter
+from htf_engine.user.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"place": RateLimit(rate=2, burst=3)}, clock=clock)
+
+        assert [limiter.allow("u1", "place") for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert limiter.allow("u2", "place")  # buckets are per user
+        assert limiter.allow("u1", "cancel")  # and per message type
+
+        clock.now = 0.5  # one token back
+        assert limiter.allow("u1", "place")
+        assert not limiter.allow("u1", "place")
+
+        clock.now = 100  # refill is capped at the burst size
+        assert sum(limiter.allow("u1", "place") for _ in range(10)) == 3
+
+        assert limiter.get_counters() == {
+            "accepted": {"place": 8, "modify": 0, "cancel": 1},
+            "rejected": {"place": 9, "modify": 0, "cancel": 0},
+            "rejected_by_user": {"u1": 9},
+        }
+
+    def test_per_user_override(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"place": RateLimit(rate=1, burst=1)}, clock=clock)
+        limiter.set_limit("place", RateLimit(rate=1, burst=5), user_id="mm")
+
+        assert sum(limiter.allow("mm", "place") for _ in range(10)) == 5
+        assert sum(limiter.allow("u1", "place") for _ in range(10)) == 1
+
+        limiter.set_limit("place", None)
+        assert all(limiter.allow("u1", "place") for _ in range(10))
+
+        with pytest.raises(ValueError):
+            limiter.set_limit("replace", RateLimit(1, 1))
+
+
+def test_exchange_throttles_before_book_work(u1, u2):
+    # No refill, so the test does not depend on the wall clock
+    exchange = Exchange(rate_limits={"place": RateLimit(rate=0, burst=2)})
+    exchange.add_order_book("Stock A", OrderBook("Stock A"))
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+
+    u1.place_order("Stock A", "limit", "buy", 1, 10)
+    u1.place_order("Stock A", "limit", "buy", 1, 10)
+    with pytest.raises(RateLimitExceededError):
+        u1.place_order("Stock A", "limit", "buy", 1, 10)
+
+    # Rejected order never reached the book and its reservation was released
+    assert u1.outstanding_buys["Stock A"] == 2
+    assert sum(o.qty for o in exchange.order_books["Stock A"].bids[10]) == 2
+
+    u2.place_order("Stock A", "limit", "buy", 1, 10)
+    assert exchange.get_rate_limit_counters()["rejected_by_user"] == {u1.user_id: 1}
+
+
+def test_no_limits_by_default(exchange):
+    u = User("bot", "Bot", 10_000)
+    exchange.register_user(u)
+    for _ in range(50):
+        u.place_order("Stock A", "limit", "buy", 1, 1)
+        u.cancel_order(u.place_order("Stock A", "limit", "sell", 1, 100), "Stock A")
+
+    assert exchange.get_rate_limit_counters()["rejected"]["place"] == 0
@@ -0,0 +1,151 @@
+import pytest
+
+from htf_engine.exchange import Exchange
+from htf_engine.errors.exchange_errors.insufficient_buying_power_error import (
+    InsufficientBuyingPowerError,
+)
+from htf_engine.errors.exchange_errors.order_exceeds_notional_limit_error import (
+    OrderExceedsNotionalLimitError,
+)
+from htf_engine.errors.exchange_errors.order_exceeds_position_limit_error import (
+    OrderExceedsPositionLimitError,
+)
+from htf_engine.errors.exchange_errors.price_outside_band_error import (
+    PriceOutsideBandError,
+)
+from htf_engine.errors.exchange_errors.too_many_open_orders_error import (
+    TooManyOpenOrdersError,
+)
+from htf_engine.order_book import OrderBook
+from htf_engine.risk.risk_limits import RiskLimits
+
+
+class TestPreTradeRisk:
+    def test_position_limit_is_configurable(self, exchange, u1):
+        exchange.register_user(u1)
+        exchange.set_position_limit(u1.user_id, 5, "Stock A")
+
+        with pytest.raises(OrderExceedsPositionLimitError):
+            u1.place_order("Stock A", "limit", "buy", 6, 10)
+
+        u1.place_order("Stock B", "limit", "buy", 50, 1)
+        assert exchange.get_user_remaining_quota_for_inst(u1.user_id, "Stock A") == {
+            "buy_quota": 5,
+            "sell_quota": 5,
+        }
+
+    def test_open_order_count_follows_book(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(RiskLimits(max_open_orders=2), user_id=u1.user_id)
+
+        u1.place_order("Stock A", "limit", "sell", 1, 10)
+        oid = u1.place_order("Stock A", "limit", "sell", 1, 11)
+        with pytest.raises(TooManyOpenOrdersError):
+            u1.place_order("Stock A", "limit", "sell", 1, 12)
+        assert u1.outstanding_sells["Stock A"] == 2  # rejected order not reserved
+
+        # A fill and a cancel each free a slot
+        u2.place_order("Stock A", "market", "buy", 1)
+        u1.cancel_order(oid, "Stock A")
+        assert exchange.risk_engine.open_order_count.get(u1.user_id, 0) == 0
+
+        u1.place_order("Stock A", "limit", "sell", 1, 12)
+        u1.place_order("Stock A", "limit", "sell", 1, 13)
+
+    def test_price_band_and_notional(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(
+            RiskLimits(price_band=0.1, max_order_notional=500), inst="Stock A"
+        )
+
+        # No reference price yet, so only the notional limit applies
+        with pytest.raises(OrderExceedsNotionalLimitError):
+            u1.place_order("Stock A", "limit", "sell", 51, 10)
+
+        u1.place_order("Stock A", "limit", "sell", 1, 100)
+        u2.place_order("Stock A", "limit", "buy", 1, 100)
+
+        with pytest.raises(PriceOutsideBandError):
+            u1.place_order("Stock A", "limit", "sell", 1, 111)
+        u1.place_order("Stock A", "limit", "sell", 1, 109)
+
+    def test_buying_power_reserved_by_resting_buys(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(RiskLimits(check_buying_power=True))
+
+        u1.place_order("Stock A", "limit", "buy", 30, 100)  # reserves 3000
+        with pytest.raises(InsufficientBuyingPowerError):
+            u1.place_order("Stock B", "limit", "buy", 30, 100)
+
+        oid = u1.place_order("Stock B", "limit", "buy", 20, 100)
+        u1.modify_order("Stock B", oid, 10, 100)
+        assert exchange.risk_engine.reserved_cash[u1.user_id] == 4000
+
+        # Partial fill moves reservation into spent cash
+        u2.place_order("Stock A", "limit", "sell", 10, 100)
+        assert exchange.risk_engine.reserved_cash[u1.user_id] == 3000
+        assert u1.cash_balance == 4000 - exchange.fee
+
+        u1.cancel_order(oid, "Stock B")
+        assert exchange.risk_engine.reserved_cash[u1.user_id] == 2000
+
+    def test_modify_is_checked_like_a_new_order(self, exchange, u1, u2):
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(
+            RiskLimits(price_band=0.1, max_open_orders=1, check_buying_power=True),
+            user_id=u1.user_id,
+        )
+        u1.place_order("Stock A", "limit", "sell", 1, 100)
+        u2.place_order("Stock A", "limit", "buy", 1, 100)
+
+        oid = u1.place_order("Stock A", "limit", "buy", 40, 95)
+        with pytest.raises(PriceOutsideBandError):
+            u1.modify_order("Stock A", oid, 40, 80)
+        with pytest.raises(InsufficientBuyingPowerError):
+            u1.modify_order("Stock A", oid, 60, 95)
+        assert exchange.order_books["Stock A"].order_map[oid].qty == 40
+        assert u1.outstanding_buys["Stock A"] == 40
+
+        # The replaced order's slot and reservation don't count against it
+        u1.modify_order("Stock A", oid, 50, 98)
+        assert exchange.risk_engine.reserved_cash[u1.user_id] == 50 * 98
+
+    def test_instrument_open_order_cap_counts_that_instrument(self, exchange, u1):
+        exchange.register_user(u1)
+        exchange.set_risk_limits(RiskLimits(max_open_orders=1), inst="Stock A")
+
+        u1.place_order("Stock B", "limit", "sell", 1, 10)
+        u1.place_order("Stock B", "limit", "sell", 1, 11)
+        u1.place_order("Stock A", "limit", "sell", 1, 10)
+        with pytest.raises(TooManyOpenOrdersError):
+            u1.place_order("Stock A", "limit", "sell", 1, 11)
+
+        # A user-wide cap still counts every instrument
+        exchange.set_risk_limits(RiskLimits(max_open_orders=3), user_id=u1.user_id)
+        with pytest.raises(TooManyOpenOrdersError):
+            u1.place_order("Stock C", "limit", "sell", 1, 10)
+
+    def test_unsettled_buys_still_use_buying_power(self, u1, u2):
+        exchange = Exchange(fee=10, async_settlement=True)
+        exchange.add_order_book("Stock A", OrderBook("Stock A"))
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        exchange.set_risk_limits(RiskLimits(check_buying_power=True))
+        assert exchange.settlement_queue is not None
+
+        # Hold the account lock so the fill cannot settle yet
+        with exchange.settlement_queue.lock:
+            u2.place_order("Stock A", "limit", "sell", 40, 100)
+            u1.place_order("Stock A", "limit", "buy", 40, 100)
+            assert u1.cash_balance == 5000
+            with pytest.raises(InsufficientBuyingPowerError):
+                u1.place_order("Stock A", "limit", "buy", 20, 100)
+
+        exchange.flush_settlement()
+        assert exchange.risk_engine.unsettled_cash(u1.user_id) == 0
+        u1.place_order("Stock A", "limit", "buy", 9, 100)
+        exchange.close()
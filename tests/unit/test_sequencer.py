@@ -0,0 +1,143 @@
+import threading
+import pytest
+
+from htf_engine.errors.exchange_errors.fok_insufficient_liquidity_error import (
+    FOKInsufficientLiquidityError,
+)
+from htf_engine.errors.exchange_errors.order_exceeds_position_limit_error import (
+    OrderExceedsPositionLimitError,
+)
+from htf_engine.errors.exchange_errors.sequencer_closed_error import (
+    SequencerClosedError,
+)
+from htf_engine.errors.exchange_errors.sequencer_full_error import SequencerFullError
+from htf_engine.errors.exchange_errors.user_not_found_error import UserNotFoundError
+from htf_engine.sequencer.sequencer import Sequencer
+from htf_engine.user.user import User
+
+
+class TestSequencer:
+    def test_commands_run_in_sequence_order(self, exchange):
+        executed: list = []
+        submitted: list = []
+
+        with Sequencer(exchange, max_batch=7) as sequencer:
+
+            def produce(producer: int):
+                for i in range(200):
+                    token = (producer, i)
+                    submitted.append((sequencer.submit(executed.append, token), token))
+
+            producers = [threading.Thread(target=produce, args=(p,)) for p in range(4)]
+            for t in producers:
+                t.start()
+            for t in producers:
+                t.join()
+
+        assert sorted(f.seq for f, _ in submitted) == list(range(1, 801))
+        assert executed == [
+            token for _, token in sorted(submitted, key=lambda x: x[0].seq)
+        ]
+
+    def test_multi_producer_orders(self, exchange):
+        users = [User(f"u{i}", f"User {i}", 1_000_000) for i in range(4)]
+        for u in users:
+            exchange.register_user(u)
+
+        futures: list = []
+
+        with Sequencer(exchange) as sequencer:
+
+            def produce(user: User, side: str):
+                for _ in range(50):
+                    futures.append(
+                        sequencer.place_order(
+                            user.user_id, "Stock A", "limit", side, 1, 10
+                        )
+                    )
+
+            producers = [
+                threading.Thread(target=produce, args=(u, "buy" if i % 2 else "sell"))
+                for i, u in enumerate(users)
+            ]
+            for t in producers:
+                t.start()
+            for t in producers:
+                t.join()
+
+            for f in futures:
+                f.result(timeout=5)
+
+            fok = sequencer.place_order(u.user_id, "Stock A", "fok", "buy", 5, 10)
+            with pytest.raises(FOKInsufficientLiquidityError):
+                fok.result(timeout=5)
+
+        # Every buy crossed a sell: books are empty and positions net to zero
+        ob = exchange.order_books["Stock A"]
+        assert not ob.bids and not ob.asks
+        assert sum(u.positions.get("Stock A", 0) for u in users) == 0
+        assert len(ob.trade_log.retrieve_log()) == 100
+
+    def test_shortcuts_apply_user_checks(self, exchange, u1):
+        exchange.register_user(u1)
+        u1.position_limit = 10
+
+        with Sequencer(exchange) as sequencer:
+            fok = sequencer.place_order(u1.user_id, "Stock A", "fok", "buy", 5, 10)
+            with pytest.raises(FOKInsufficientLiquidityError):
+                fok.result(timeout=5)
+            assert u1.outstanding_buys.get("Stock A", 0) == 0
+
+            too_big = sequencer.place_order(
+                u1.user_id, "Stock A", "limit", "buy", 50, 10
+            )
+            with pytest.raises(OrderExceedsPositionLimitError):
+                too_big.result(timeout=5)
+
+            report = sequencer.submit_order(
+                u1.user_id, "Stock A", "limit", "buy", 50, 10
+            ).result(timeout=5)
+            assert report.is_rejected
+            assert not exchange.order_books["Stock A"].order_map
+
+            order_id = sequencer.place_order(
+                u1.user_id, "Stock A", "limit", "buy", 5, 10
+            ).result(timeout=5)
+            assert sequencer.modify_order(
+                u1.user_id, "Stock A", order_id, 3, 10
+            ).result(timeout=5)
+            assert sequencer.cancel_order(u1.user_id, "Stock A", order_id).result(
+                timeout=5
+            )
+            assert u1.outstanding_buys.get("Stock A", 0) == 0
+
+            with pytest.raises(UserNotFoundError):
+                sequencer.place_order("ghost", "Stock A", "limit", "buy", 1, 10).result(
+                    timeout=5
+                )
+
+    def test_backpressure_and_close(self, exchange):
+        started = threading.Event()
+        gate = threading.Event()
+        sequencer = Sequencer(exchange, capacity=2)
+
+        def block_engine():
+            started.set()
+            gate.wait()
+
+        sequencer.submit(block_engine)  # occupies the engine thread
+        assert started.wait(timeout=5)
+        sequencer.submit(lambda: None)
+        sequencer.submit(lambda: None)
+
+        with pytest.raises(SequencerFullError):
+            sequencer.submit(lambda: None, block=False)
+        with pytest.raises(SequencerFullError):
+            sequencer.submit(lambda: None, timeout=0.01)
+
+        gate.set()
+        sequencer.close()
+        assert sequencer.pending() == 0
+
+        with pytest.raises(SequencerClosedError):
+            sequencer.submit(lambda: None)
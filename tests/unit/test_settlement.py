@@ -0,0 +1,125 @@
+from htf_engine.exchange import Exchange
+from htf_engine.order_book import OrderBook
+from htf_engine.user.user import User
+
+
+def _async_exchange():
+    e = Exchange(fee=10, async_settlement=True)
+    e.add_order_book("Stock A", OrderBook("Stock A"))
+    return e
+
+
+class TestAsyncSettlement:
+    def test_fills_are_settled_by_worker(self, u1, u2):
+        exchange = _async_exchange()
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+
+        u1.place_order("Stock A", "limit", "buy", 50, 10)
+        u2.place_order("Stock A", "limit", "sell", 20, 10)
+        u2.place_order("Stock A", "limit", "sell", 30, 10)
+        exchange.flush_settlement()
+
+        assert u1.positions == {"Stock A": 50}
+        assert u2.positions == {"Stock A": -50}
+        assert u1.get_cash_balance() == 5000 - 500 - 2 * 10
+        assert u2.get_cash_balance() == 5000 + 500 - 2 * 10
+        assert exchange.balance == 4 * 10
+        assert u1.get_outstanding_buys() == {}
+        assert exchange.settlement_queue is not None
+        assert exchange.settlement_queue.last_applied_seq == 2
+
+        exchange.close()
+
+    def test_quota_stays_reserved_until_settled(self, u1, u2):
+        exchange = _async_exchange()
+        exchange.register_user(u1)
+        exchange.register_user(u2)
+        assert exchange.settlement_queue is not None
+
+        # Holding the lock stalls the worker, so the fill stays queued
+        with exchange.settlement_queue.lock:
+            u1.place_order("Stock A", "limit", "buy", 60, 10)
+            u2.place_order("Stock A", "limit", "sell", 60, 10)
+
+            assert u1.positions == {}
+            assert u1.get_remaining_quota("Stock A") == {
+                "buy_quota": 40,
+                "sell_quota": 100,
+            }
+
+        exchange.flush_settlement()
+
+        assert u1.positions == {"Stock A": 60}
+        assert u1.get_remaining_quota("Stock A") == {
+            "buy_quota": 40,
+            "sell_quota": 160,
+        }
+
+        exchange.close()
+
+
+class TestBatchedSettlement:
+    def test_sweep_settles_aggressor_once(self, exchange, u1, u2, u3, monkeypatch):
+        for u in (u1, u2, u3):
+            exchange.register_user(u)
+
+        u2.place_order("Stock A", "limit", "sell", 10, 10)
+        u3.place_order("Stock A", "limit", "sell", 10, 11)
+        u2.place_order("Stock A", "limit", "sell", 10, 12)
+
+        settle_calls = []
+        fee_calls = []
+        original_settle = User.settle_fills
+        original_earn = Exchange._earn_fee
+
+        def spy_settle(self, instrument, fills, fee):
+            settle_calls.append((self.user_id, list(fills)))
+            original_settle(self, instrument, fills, fee)
+
+        def spy_earn(self, n_fees=1):
+            fee_calls.append(n_fees)
+            original_earn(self, n_fees)
+
+        monkeypatch.setattr(User, "settle_fills", spy_settle)
+        monkeypatch.setattr(Exchange, "_earn_fee", spy_earn)
+
+        u1.place_order("Stock A", "market", "buy", 30)
+
+        assert settle_calls == [
+            (u1.user_id, [("buy", 10, 10), ("buy", 11, 10), ("buy", 12, 10)]),
+            (u2.user_id, [("sell", 10, 10), ("sell", 12, 10)]),
+            (u3.user_id, [("sell", 11, 10)]),
+        ]
+        assert fee_calls == [6]
+        assert exchange.balance == 6 * 10
+
+        assert u1.positions == {"Stock A": 30}
+        assert u1.average_cost == {"Stock A": 11}
+        assert u1.get_cash_balance() == 5000 - 330 - 3 * 10
+        assert u1.get_outstanding_buys() == {}
+        assert u2.positions == {"Stock A": -20}
+        assert u2.get_outstanding_sells() == {}
+
+    def test_batch_matches_fill_by_fill_settlement(self, exchange, u1, u2, u3):
+        for u in (u1, u2, u3):
+            exchange.register_user(u)
+
+        # u1 starts short, then a single sweep covers the short and flips long
+        u2.place_order("Stock A", "limit", "buy", 10, 50)
+        u1.place_order("Stock A", "limit", "sell", 10, 50)
+
+        u2.place_order("Stock A", "limit", "sell", 5, 40)
+        u3.place_order("Stock A", "limit", "sell", 10, 45)
+        u1.place_order("Stock A", "limit", "buy", 15, 45)
+
+        replay = User(u1.user_id, "Replay", 5000)
+        for trade in exchange.order_books["Stock A"].trade_log.retrieve_log():
+            if u1.user_id in (trade.buy_user_id, trade.sell_user_id):
+                replay.update_positions_and_cash_balance(trade, "Stock A", 10)
+
+        assert u1.positions == {"Stock A": 5}
+        assert u1.positions == replay.positions
+        assert u1.average_cost == replay.average_cost
+        assert u1.get_realised_pnl() == replay.get_realised_pnl() == 75
+        assert u1.get_cash_balance() == replay.get_cash_balance()
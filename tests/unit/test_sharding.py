@@ -0,0 +1,164 @@
+import pickle
+import threading
+
+import pytest
+
+from htf_engine.errors.exchange_errors.fok_insufficient_liquidity_error import (
+    FOKInsufficientLiquidityError,
+)
+from htf_engine.errors.exchange_errors.insufficient_buying_power_error import (
+    InsufficientBuyingPowerError,
+)
+from htf_engine.errors.exchange_errors.instrument_not_found_error import (
+    InstrumentNotFoundError,
+)
+from htf_engine.errors.exchange_errors.self_trade_prevention_error import (
+    SelfTradePreventionError,
+)
+from htf_engine.errors.exchange_errors.shard_unavailable_error import (
+    ShardUnavailableError,
+)
+from htf_engine.errors.exchange_errors.too_many_open_orders_error import (
+    TooManyOpenOrdersError,
+)
+from htf_engine.risk.risk_limits import RiskLimits
+from htf_engine.sharding.shard_worker import ShardWorker
+from htf_engine.sharding.sharded_exchange import ShardedExchange
+from htf_engine.user.user import User
+
+
+def test_exchange_errors_survive_pickling():
+    error = SelfTradePreventionError("oid", "uid")
+    restored = pickle.loads(pickle.dumps(error))
+    assert type(restored) is SelfTradePreventionError
+    assert str(restored) == str(error)
+    assert restored.order_id == "oid"
+
+
+def test_shard_worker_reports_side_effects():
+    worker = ShardWorker(enable_stp=False)
+    worker.handle(("add", "A"))
+    worker.handle(("place", "A", "limit", "sell", 2, 10.0, "s", None))
+    worker.handle(("place", "A", "stop-market", "buy", 1, None, "t", 9.0))
+
+    reply = worker.handle(("place", "A", "ioc", "buy", 5, 10.0, "b", None))
+    assert [(t.buy_user_id, t.qty) for t in reply.trades] == [("b", 2)]
+    # The trade also triggered t's stop, whose market order found no liquidity
+    assert [o.user_id for o in reply.stops_triggered] == ["t"]
+    assert reply.released == [("t", "buy", 1), ("b", "buy", 3)]
+    assert reply.last_price == 10.0
+
+    reply = worker.handle(("place", "A", "fok", "buy", 5, 10.0, "b", None))
+    assert isinstance(reply.error, FOKInsufficientLiquidityError)
+    assert reply.released == [("b", "buy", 5)]
+
+
+@pytest.fixture
+def sharded():
+    with ShardedExchange(n_shards=2, fee=1) as ex:
+        for inst in ["Stock A", "Stock B", "Stock C"]:
+            ex.add_order_book(inst)
+        yield ex
+
+
+def test_sharded_trading_keeps_accounts_consistent(sharded, u1, u2):
+    assert {s.shard_id for s in sharded.shard_of.values()} == {0, 1}
+    sharded.register_user(u1)
+    sharded.register_user(u2)
+
+    u1.place_order("Stock A", "limit", "sell", 10, 100)
+    u1.place_order("Stock B", "limit", "sell", 10, 50)
+    u2.place_order("Stock A", "limit", "buy", 4, 100)
+    u2.place_order("Stock B", "market", "buy", 10)
+
+    assert u2.positions == {"Stock A": 4, "Stock B": 10}
+    assert u1.outstanding_sells["Stock A"] == 6
+    assert u2.cash_balance == 5000 - 400 - 500 - 2
+    assert sharded.get_last_price("Stock B") == 50
+    assert sharded.balance == 4
+
+    with pytest.raises(FOKInsufficientLiquidityError):
+        u2.place_order("Stock A", "fok", "buy", 20, 100)
+    assert u2.outstanding_buys["Stock A"] == 0
+
+    oid = u2.place_order("Stock C", "limit", "buy", 5, 1)
+    assert u2.modify_order("Stock C", oid, 2, 1)
+    assert u2.outstanding_buys["Stock C"] == 2
+    assert u2.cancel_order(oid, "Stock C")
+    assert u2.outstanding_buys["Stock C"] == 0
+
+    with pytest.raises(InstrumentNotFoundError):
+        sharded.place_order(u1.user_id, "Stock Z", "market", "buy", 1)
+
+
+def test_parallel_producers_across_shards(sharded):
+    users = [User(f"u{i}", f"User {i}", 1_000_000) for i in range(4)]
+    for u in users:
+        sharded.register_user(u)
+
+    def produce(user: User, inst: str, side: str):
+        for _ in range(25):
+            user.place_order(inst, "limit", side, 1, 10)
+
+    threads = [
+        threading.Thread(target=produce, args=(users[0], "Stock A", "sell")),
+        threading.Thread(target=produce, args=(users[1], "Stock A", "buy")),
+        threading.Thread(target=produce, args=(users[2], "Stock B", "sell")),
+        threading.Thread(target=produce, args=(users[3], "Stock B", "buy")),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert [
+        u.positions.get(inst, 0)
+        for u, inst in zip(users, ["Stock A"] * 2 + ["Stock B"] * 2)
+    ] == [-25, 25, -25, 25]
+    assert all(not u.outstanding_buys and not u.outstanding_sells for u in users)
+
+
+def test_dead_shard_fails_pending_and_new_commands(sharded, u1):
+    sharded.register_user(u1)
+    shard = sharded.shard_of["Stock A"]
+
+    shard.process.terminate()
+    shard.process.join()
+    shard._reader.join(timeout=5)
+    assert not shard._reader.is_alive()
+
+    with pytest.raises(ShardUnavailableError):
+        u1.place_order("Stock A", "limit", "buy", 5, 10)
+    assert u1.outstanding_buys.get("Stock A", 0) == 0
+    assert not shard._pending
+
+    with pytest.raises(ShardUnavailableError):
+        shard.send(("cancel", "Stock A", "oid"))
+
+    # Other shards keep trading
+    other = next(s for s in sharded.shards if s is not shard)
+    inst = next(i for i, s in sharded.shard_of.items() if s is other)
+    assert u1.place_order(inst, "limit", "buy", 1, 10)
+
+
+def test_router_applies_risk_limits_across_shards(sharded, u1, u2):
+    sharded.register_user(u1)
+    sharded.register_user(u2)
+    sharded.set_risk_limits(RiskLimits(max_open_orders=1, check_buying_power=True))
+    assert sharded.shard_of["Stock A"] is not sharded.shard_of["Stock B"]
+
+    oid = u1.place_order("Stock A", "limit", "buy", 40, 100)  # reserves 4000
+    with pytest.raises(TooManyOpenOrdersError):
+        u1.place_order("Stock B", "limit", "sell", 1, 10)
+
+    u1.cancel_order(oid, "Stock A")
+    u1.place_order("Stock B", "limit", "buy", 40, 100)
+    with pytest.raises(InsufficientBuyingPowerError):
+        u2.place_order("Stock A", "limit", "buy", 60, 100)
+    assert u2.outstanding_buys.get("Stock A", 0) == 0
+
+    # Fills reported by the shard free the slot and move the reservation
+    u2.place_order("Stock B", "limit", "sell", 40, 100)
+    assert sharded.risk_engine.open_order_count == {}
+    assert sharded.risk_engine.reserved_cash == {}
+    assert sharded.risk_engine.unsettled_cash(u1.user_id) == 0
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+from htf_engine.market_data.top_of_book_reader import TopOfBookReader
+
+
+def test_board_tracks_l1_after_each_order(exchange, u1, u2):
+    exchange.register_user(u1)
+    exchange.register_user(u2)
+    name = exchange.enable_top_of_book_board()
+    reader = TopOfBookReader(name)
+
+    try:
+        assert reader.instruments() == ["Stock A", "Stock B", "Stock C"]
+        quote = reader.read("Stock A")
+        assert quote is not None
+        assert quote["best_bid"] is None and quote["last_price"] is None
+
+        u1.place_order("Stock A", "limit", "buy", 5, 100)
+        u1.place_order("Stock A", "limit", "buy", 3, 100)
+        u2.place_order("Stock A", "limit", "sell", 4, 102)
+
+        quote = reader.read("Stock A")
+        assert quote is not None
+        assert (quote["best_bid"], quote["best_bid_qty"]) == (100, 8)
+        assert (quote["best_ask"], quote["best_ask_qty"]) == (102, 4)
+        assert quote["version"] % 2 == 0
+
+        u2.place_order("Stock A", "market", "sell", 6)
+
+        quote = reader.read("Stock A")
+        assert quote is not None
+        assert (quote["best_bid"], quote["best_bid_qty"]) == (100, 2)
+        assert (quote["last_price"], quote["last_qty"]) == (100, 1)
+
+        order_id = u2.place_order("Stock B", "limit", "sell", 1, 50)
+        u2.cancel_order(order_id, "Stock B")
+
+        quote = reader.read("Stock B")
+        assert quote is not None and quote["best_ask"] is None
+        assert reader.read("Stock Z") is None
+    finally:
+        reader.close()
+        exchange.close()
+
+
+def test_books_added_later_get_a_slot(exchange):
+    from htf_engine.order_book import OrderBook
+
+    name = exchange.enable_top_of_book_board(capacity=4)
+    exchange.add_order_book("Stock D", OrderBook("Stock D"))
+    reader = TopOfBookReader(name)
+
+    try:
+        assert set(reader.snapshot()) == {"Stock A", "Stock B", "Stock C", "Stock D"}
+    finally:
+        reader.close()
+        exchange.close()
+
+
+def test_reader_in_another_process(exchange, u1):
+    exchange.register_user(u1)
+    name = exchange.enable_top_of_book_board()
+    u1.place_order("Stock C", "limit", "buy", 7, 99.5)
+
+    code = (
+        "from htf_engine.market_data.top_of_book_reader import TopOfBookReader\n"
+        f"r = TopOfBookReader({name!r})\n"
+        "q = r.read('Stock C')\n"
+        "print(q['best_bid'], q['best_bid_qty'])\n"
+        "r.close()\n"
+    )
+
+    try:
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.split() == ["99.5", "7"]
+    finally:
+        exchange.close()